@@ -1,9 +1,14 @@
 """Authentication routes for login and registration."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.database import get_db_session
+from ..core.security import create_access_token
 from ..schemas.auth import LoginResponse, RegisterRequest
+from ..services import user_store
+from ..services.user_store import EmailTakenError
 
 router = APIRouter()
 
@@ -11,20 +16,46 @@ router = APIRouter()
 @router.post("/login", response_model=LoginResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AsyncSession = Depends(get_db_session),
 ) -> LoginResponse:
-    """Authenticate the user and issue a JWT (stub implementation)."""
+    """Check the credentials and issue a JWT for the user."""
+    user = await user_store.authenticate(
+        session,
+        form_data.username,
+        form_data.password,
+    )
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return LoginResponse(
-        access_token="mock-token",
+        access_token=create_access_token(user.id),
         token_type="bearer",
-        user_email=form_data.username,
+        user_email=user.email,
     )
 
 
 @router.post("/register", response_model=LoginResponse)
-async def register(payload: RegisterRequest) -> LoginResponse:
-    """Register a new user and return a JWT (stub implementation)."""
+async def register(
+    payload: RegisterRequest,
+    session: AsyncSession = Depends(get_db_session),
+) -> LoginResponse:
+    """Create the user and return a JWT for the new account."""
+    try:
+        user = await user_store.create_user(
+            session,
+            payload.email,
+            payload.password,
+        )
+    except EmailTakenError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        ) from exc
     return LoginResponse(
-        access_token="mock-token",
+        access_token=create_access_token(user.id),
         token_type="bearer",
-        user_email=payload.email,
+        user_email=user.email,
     )
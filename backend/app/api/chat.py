@@ -1,9 +1,17 @@
 """Chat-related endpoints for generating workflows via AI."""
 
+import json
 import logging
-from fastapi import APIRouter
+from collections.abc import AsyncIterator
 
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+
+from ..core.serialization import model_response
+from ..schemas.job import GenerationJob, GenerationJobRequest
 from ..schemas.workflow import ChatRequest, WorkflowBlueprint
+from ..services.job_queue import get_job_queue
+from ..services.prompt_budget import track_prompt_usage
 from ..services.workflow_executor import WorkflowExecutor
 
 router = APIRouter()
@@ -12,15 +20,19 @@ logger = logging.getLogger(__name__)
 
 
 @router.post("/generate-workflow", response_model=WorkflowBlueprint)
-async def generate_workflow(payload: ChatRequest) -> WorkflowBlueprint:
+async def generate_workflow(payload: ChatRequest) -> Response:
     """Generate a workflow blueprint via the AI service."""
     try:
         logger.info(
             "Generating workflow with %d messages", len(payload.messages)
         )
-        result = await executor.generate_workflow(payload)
+        with track_prompt_usage() as usage:
+            result = await executor.generate_workflow(payload)
         logger.info("Successfully generated workflow: %s", result.title)
-        return result
+        # Already validated; serialize once instead of re-validating.
+        response = model_response(result)
+        response.headers.update(usage.as_headers())
+        return response
     except Exception as e:
         logger.error(
             "Workflow generation failed: %s: %s",
@@ -28,3 +40,69 @@ async def generate_workflow(payload: ChatRequest) -> WorkflowBlueprint:
             str(e),
         )
         raise
+
+
+@router.post(
+    "/generate-workflow/jobs",
+    response_model=GenerationJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_generation_job(payload: GenerationJobRequest) -> Response:
+    """Queue a generation for a worker and return its job id at once.
+
+    Poll ``GET /chat/generate-workflow/jobs/{job_id}`` for the result, or
+    pass ``callbackUrl`` to have the finished job POSTed back.
+    """
+    request = ChatRequest(messages=payload.messages)
+    callback_url = payload.callback_url
+    job = await get_job_queue().submit(
+        request,
+        str(callback_url) if callback_url else None,
+    )
+    return model_response(job, status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/generate-workflow/jobs/{job_id}", response_model=GenerationJob)
+async def get_generation_job(job_id: str) -> Response:
+    """Return the state of a generation job and its blueprint once done."""
+    job = await get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return model_response(job)
+
+
+@router.post("/generate-workflow/stream")
+async def stream_workflow(payload: ChatRequest) -> StreamingResponse:
+    """Stream blueprint nodes and edges as Server-Sent Events.
+
+    Emits ``node`` and ``edge`` events while the model is generating and a
+    final ``blueprint`` event with the validated document. Failures are
+    reported as an ``error`` event because the response has already
+    started.
+    """
+    logger.info(
+        "Streaming workflow with %d messages", len(payload.messages)
+    )
+    return StreamingResponse(
+        _sse_events(payload),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(payload: ChatRequest) -> AsyncIterator[str]:
+    try:
+        async for event, model in executor.stream_workflow(payload):
+            data = model.model_dump_json(by_alias=True)
+            yield f"event: {event}\ndata: {data}\n\n"
+    except Exception as e:
+        logger.error(
+            "Workflow streaming failed: %s: %s",
+            type(e).__name__,
+            str(e),
+        )
+        data = json.dumps({"detail": str(e)})
+        yield f"event: error\ndata: {data}\n\n"
@@ -0,0 +1,41 @@
+"""Endpoints for reporting workflow execution records."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ..config import settings
+from ..core.security import get_current_user_id
+from ..schemas.execution import ExecutionBatchResponse, ExecutionRecord
+from ..services.execution_ingest import (
+    IngestBacklogError,
+    get_execution_ingestor,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=ExecutionBatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_user_id)],
+)
+async def ingest_executions(
+    payload: list[ExecutionRecord],
+) -> ExecutionBatchResponse:
+    """Queue execution records for bulk insertion.
+
+    Records are written asynchronously; a 503 means the buffer is full
+    because the database is lagging and the caller should retry.
+    """
+    try:
+        await get_execution_ingestor().submit(
+            payload,
+            timeout=settings.execution_ingest_submit_timeout_seconds,
+        )
+    except IngestBacklogError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
+    return ExecutionBatchResponse(accepted=len(payload))
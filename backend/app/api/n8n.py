@@ -1,15 +1,45 @@
 """Endpoints for interacting with the n8n orchestration layer."""
 
-from fastapi import APIRouter, HTTPException, status
+from collections.abc import AsyncIterator, Callable
 
+import anyio
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from ..core import metrics
+from ..core.serialization import FastJSONResponse, FastJSONRoute, dumps
+from ..schemas.n8n import N8NWorkflowUpdateRequest
 from ..schemas.workflow import WorkflowBlueprint
+from ..services.batch_converter import convert_ndjson
+from ..services.blueprint_validator import (
+    BlueprintValidationError,
+    Diagnostic,
+    has_errors,
+    validate_blueprint,
+    validate_blueprints,
+)
+from ..services.bulk_deploy import get_bulk_deployer
 from ..services.n8n_client import N8NClient, N8NClientError
 from ..services.n8n_converter import to_n8n_payload
+from ..services.n8n_import import import_ndjson
+from ..services.n8n_mirror import get_n8n_mirror
+from ..services.workflow_graph import WorkflowGraph
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 client = N8NClient()
 
 
+def _invalid_blueprint(diagnostics: list[Diagnostic]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail={
+            "message": "Blueprint failed validation.",
+            "diagnostics": [d.as_dict() for d in diagnostics],
+        },
+    )
+
+
 @router.get("/status")
 async def n8n_status() -> dict[str, object]:
     """Proxy the n8n health endpoint and return the upstream response."""
@@ -22,14 +52,102 @@ async def n8n_status() -> dict[str, object]:
         ) from exc
 
 
+@router.get("/mirror/workflows", response_model=dict[str, object])
+async def list_mirrored_workflows(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> dict[str, object]:
+    """List n8n workflows from the local mirror, newest update first."""
+    mirror = get_n8n_mirror()
+    return {
+        "workflows": await mirror.list(limit, offset),
+        "mirror": await mirror.status(),
+    }
+
+
+@router.get(
+    "/mirror/workflows/{workflow_id}",
+    response_model=dict[str, object],
+)
+async def get_mirrored_workflow(workflow_id: str) -> dict[str, object]:
+    """Return one n8n workflow document from the local mirror."""
+    workflow = await get_n8n_mirror().get(workflow_id)
+    if workflow is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow not mirrored",
+        )
+    return workflow
+
+
+@router.post("/mirror/sync", response_model=dict[str, object])
+async def sync_mirror() -> dict[str, object]:
+    """Sync the mirror with n8n now instead of waiting for the refresher."""
+    try:
+        result = await get_n8n_mirror().sync()
+    except N8NClientError as exc:  # pragma: no cover - network failure branch
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(exc),
+        ) from exc
+    return {
+        "pages": result.pages,
+        "seen": result.seen,
+        "written": result.written,
+        "removed": result.removed,
+        "seconds": result.seconds,
+    }
+
+
 @router.post("/workflows", response_model=dict[str, object])
-async def deploy_workflow(payload: WorkflowBlueprint) -> dict[str, object]:
+async def deploy_workflow(payload: WorkflowBlueprint) -> Response:
     """Create a workflow in n8n using the converted blueprint payload."""
     try:
         response = await client.deploy_workflow(payload)
-        return {
-            "workflow": response,
-        }
+        # n8n's reply is plain JSON; skip the response-model pass.
+        return FastJSONResponse({"workflow": response})
+    except BlueprintValidationError as exc:
+        raise _invalid_blueprint(exc.diagnostics) from exc
+    except N8NClientError as exc:  # pragma: no cover - network failure branch
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(exc),
+        ) from exc
+
+
+@router.post("/workflows/bulk")
+async def deploy_workflows_bulk(
+    payload: list[WorkflowBlueprint],
+) -> StreamingResponse:
+    """Create many workflows in n8n and stream NDJSON progress events.
+
+    Each line carries the input ``index`` and a ``status``; a workflow
+    whose content was deployed before reports ``existing`` instead of
+    being created again.
+    """
+    async def events() -> AsyncIterator[bytes]:
+        async for event in get_bulk_deployer().deploy(payload):
+            yield dumps(event) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.put("/workflows/{workflow_id}", response_model=dict[str, object])
+async def update_workflow(
+    workflow_id: str,
+    payload: N8NWorkflowUpdateRequest,
+) -> Response:
+    """Update an existing n8n workflow in place from an edited blueprint."""
+    try:
+        response = await client.update_workflow(
+            workflow_id,
+            payload.blueprint,
+            previous_blueprint=payload.previous_blueprint,
+            previous_payload=payload.previous_workflow,
+        )
+        return FastJSONResponse({"workflow": response})
+    except BlueprintValidationError as exc:
+        raise _invalid_blueprint(exc.diagnostics) from exc
     except N8NClientError as exc:  # pragma: no cover - network failure branch
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -38,7 +156,107 @@ async def deploy_workflow(payload: WorkflowBlueprint) -> dict[str, object]:
 
 
 @router.post("/convert", response_model=dict[str, object])
-async def convert_workflow(payload: WorkflowBlueprint) -> dict[str, object]:
-    """Return the n8n-compatible workflow document without deploying it."""
-    converted = to_n8n_payload(payload)
-    return {"workflow": converted}
+async def convert_workflow(payload: WorkflowBlueprint) -> Response:
+    """Return the n8n-compatible workflow document without deploying it.
+
+    Warnings from validation are returned next to the workflow under
+    ``diagnostics``; any error rejects the blueprint with 422.
+    """
+    graph = WorkflowGraph.from_blueprint(payload)
+    diagnostics = validate_blueprint(payload, graph=graph)
+    if has_errors(diagnostics):
+        raise _invalid_blueprint(diagnostics)
+    with metrics.CONVERT.time():
+        converted = to_n8n_payload(payload, graph)
+    document: dict[str, object] = {"workflow": converted}
+    if diagnostics:
+        document["diagnostics"] = [d.as_dict() for d in diagnostics]
+    # Already plain JSON types; skip the encoder and response-model passes.
+    return FastJSONResponse(document)
+
+
+@router.post("/validate", response_model=dict[str, object])
+async def validate_workflows(
+    payload: list[WorkflowBlueprint],
+) -> dict[str, object]:
+    """Validate a list of blueprints and report diagnostics for each."""
+    return {
+        "results": [
+            {
+                "valid": not has_errors(diagnostics),
+                "diagnostics": [d.as_dict() for d in diagnostics],
+            }
+            for diagnostics in validate_blueprints(payload)
+        ]
+    }
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """Streaming response that may keep reading the request body.
+
+    ``StreamingResponse`` consumes ``receive`` to watch for disconnects,
+    which would swallow body chunks still being read by the iterator.
+    ``convert`` gets the body as a stream instead: while it is being
+    read, disconnects surface through ``request.stream()``; once it has
+    been read in full, ``receive`` is watched as usual.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        convert: Callable[[AsyncIterator[bytes]], AsyncIterator[bytes]],
+        media_type: str,
+    ) -> None:
+        self._body_read = anyio.Event()
+        super().__init__(convert(self._body(request)), media_type=media_type)
+
+    async def _body(self, request: Request) -> AsyncIterator[bytes]:
+        async for chunk in request.stream():
+            yield chunk
+        self._body_read.set()
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        async with anyio.create_task_group() as task_group:
+
+            async def watch_disconnect() -> None:
+                await self._body_read.wait()
+                await self.listen_for_disconnect(receive)
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(watch_disconnect)
+            await self.stream_response(send)
+            task_group.cancel_scope.cancel()
+
+
+@router.post("/convert/batch")
+async def convert_workflow_batch(request: Request) -> StreamingResponse:
+    """Convert NDJSON blueprints and stream NDJSON n8n documents back.
+
+    Each output line carries the input ``index`` and either a
+    ``workflow`` or an ``error`` for that item, in input order.
+    """
+    return _DuplexStreamingResponse(
+        request,
+        convert_ndjson,
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/import")
+async def import_workflows(request: Request) -> StreamingResponse:
+    """Convert an n8n export back into blueprints, streamed as NDJSON.
+
+    The body may be one workflow, an array of workflows or NDJSON. Each
+    output line carries the workflow's ``index`` and either a
+    ``blueprint`` or an ``error``.
+    """
+    return _DuplexStreamingResponse(
+        request,
+        import_ndjson,
+        media_type="application/x-ndjson",
+    )
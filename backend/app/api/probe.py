@@ -36,7 +36,7 @@ async def probe_deepseek() -> dict[str, Any]:
         import importlib
 
         openai_module = importlib.import_module("openai")
-        client_factory = getattr(openai_module, "OpenAI")
+        client_factory = getattr(openai_module, "AsyncOpenAI")
         client = client_factory(
             api_key=settings.deepseek_api_key,
             base_url="https://api.deepseek.com",
@@ -44,7 +44,7 @@ async def probe_deepseek() -> dict[str, Any]:
         )
 
         start = time.perf_counter()
-        _ = client.chat.completions.create(
+        _ = await client.chat.completions.create(
             model=settings.deepseek_model,
             messages=[{"role": "user", "content": "ping"}],
             max_tokens=1,
@@ -1,19 +1,114 @@
 """CRUD endpoints for managing workflow blueprints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..schemas.workflow import WorkflowBlueprint
+from ..core.database import get_db_session
+from ..core.security import get_current_user_id
+from ..core.serialization import FastJSONRoute, model_response
+from ..schemas.workflow import WorkflowBlueprint, WorkflowPage
+from ..services import workflow_store
+from ..services.workflow_store import InvalidCursorError
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
-@router.get("/", response_model=list[WorkflowBlueprint])
-async def list_workflows() -> list[WorkflowBlueprint]:
-    """Return stored workflows (placeholder until persistence is wired)."""
-    return []
+def _not_found(workflow_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Workflow {workflow_id} not found",
+    )
 
 
-@router.post("/", response_model=WorkflowBlueprint)
-async def create_workflow(payload: WorkflowBlueprint) -> WorkflowBlueprint:
-    """Store a workflow blueprint (placeholder passthrough)."""
-    return payload
+@router.get("/", response_model=WorkflowPage)
+async def list_workflows(
+    limit: int = Query(
+        workflow_store.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=workflow_store.MAX_PAGE_SIZE,
+    ),
+    cursor: str | None = None,
+    owner_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_db_session),
+) -> WorkflowPage:
+    """Return the caller's workflows newest first, one page at a time."""
+    try:
+        return await workflow_store.list_workflows(
+            session,
+            owner_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.post(
+    "/",
+    response_model=WorkflowBlueprint,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_workflow(
+    payload: WorkflowBlueprint,
+    owner_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Store a workflow blueprint and return it with its stored id."""
+    stored = await workflow_store.create_workflow(session, owner_id, payload)
+    # Already validated; serialize once instead of re-validating.
+    return model_response(stored, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/{workflow_id}", response_model=WorkflowBlueprint)
+async def get_workflow(
+    workflow_id: str,
+    owner_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Return one stored blueprint owned by the caller."""
+    blueprint = await workflow_store.get_workflow(
+        session,
+        owner_id,
+        workflow_id,
+    )
+    if blueprint is None:
+        raise _not_found(workflow_id)
+    return model_response(blueprint)
+
+
+@router.put("/{workflow_id}", response_model=WorkflowBlueprint)
+async def update_workflow(
+    workflow_id: str,
+    payload: WorkflowBlueprint,
+    owner_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Replace a stored blueprint owned by the caller."""
+    blueprint = await workflow_store.update_workflow(
+        session,
+        owner_id,
+        workflow_id,
+        payload,
+    )
+    if blueprint is None:
+        raise _not_found(workflow_id)
+    return model_response(blueprint)
+
+
+@router.delete("/{workflow_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_workflow(
+    workflow_id: str,
+    owner_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Delete a stored blueprint owned by the caller."""
+    if not await workflow_store.delete_workflow(
+        session,
+        owner_id,
+        workflow_id,
+    ):
+        raise _not_found(workflow_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -12,12 +12,71 @@ class Settings(BaseSettings):
         "postgresql://automation_user:"
         "SecurePass123!@localhost:5432/automation_db"
     )
+    # Async engine pool; sized per worker process
+    database_pool_size: int = 10
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 5.0
+    database_pool_recycle_seconds: int = 1800
+    database_statement_timeout_ms: int = 5000
+    # Execution ingestion buffer; flushes on size or interval
+    execution_ingest_batch_size: int = 1000
+    execution_ingest_flush_interval_seconds: float = 1.0
+    execution_ingest_max_queue: int = 20000
+    execution_ingest_submit_timeout_seconds: float = 5.0
+    execution_retention_days: int = 30
     redis_url: str = "redis://localhost:6379/0"
+    blueprint_cache_enabled: bool = True
+    blueprint_cache_ttl_seconds: int = 24 * 60 * 60
+    blueprint_cache_max_entries: int = 5000
     gemini_api_key: str = ""
     gemini_model: str = "gemini-2.0-flash-exp"
     deepseek_api_key: str = ""
     deepseek_model: str = "deepseek-chat"
-    ai_provider: str = "gemini"  # Options: "gemini" or "deepseek"
+    # Upper bound on concurrent DeepSeek completions per worker process
+    deepseek_max_concurrency: int = 4
+    # Hedging: fire a backup request once the primary is slower than the
+    # learned percentile, for at most budget_percent of requests
+    deepseek_hedge_enabled: bool = False
+    deepseek_hedge_percentile: float = 0.95
+    deepseek_hedge_budget_percent: float = 5.0
+    deepseek_hedge_min_delay_seconds: float = 5.0
+    deepseek_hedge_initial_delay_seconds: float = 60.0
+    # Prompt budget: older chat turns are summarized in fixed chunks once
+    # the estimated prompt exceeds prompt_max_tokens
+    prompt_max_tokens: int = 24000
+    prompt_keep_recent_turns: int = 6
+    prompt_compaction_chunk_turns: int = 8
+    prompt_summary_chars_per_turn: int = 240
+    # Async generation jobs: a claimed job is redelivered when its worker
+    # stops renewing the lease for visibility_timeout seconds
+    job_visibility_timeout_seconds: float = 60.0
+    job_max_attempts: int = 3
+    job_result_ttl_seconds: int = 86400
+    job_worker_concurrency: int = 4
+    # A failed job is retried after retry_backoff * 2 ** (attempts - 1)
+    # seconds, jittered down to half and capped at retry_max_backoff
+    job_retry_backoff_seconds: float = 5.0
+    job_retry_max_backoff_seconds: float = 300.0
+    job_callback_timeout_seconds: float = 10.0
+    # Callback hosts exempt from the public-address check, for trusted
+    # internal receivers; every other host must resolve to public IPs
+    job_callback_allowed_hosts: list[str] = Field(default_factory=list)
+    # Preferred LLM provider ("gemini" or "deepseek"); every other
+    # provider with an API key is kept as a failover target
+    ai_provider: str = "gemini"
+    gemini_max_concurrency: int = 4
+    # LLM routing: requests go to the provider with the lowest EWMA
+    # latency adjusted for its EWMA error rate. A provider's circuit opens
+    # after breaker_failures failures in a row or once its error rate
+    # reaches breaker_error_rate, and lets one probe through after the
+    # cooldown. A provider slower than failover_timeout is abandoned for
+    # the next one (0 waits indefinitely)
+    llm_ewma_alpha: float = 0.2
+    llm_breaker_failures: int = 3
+    llm_breaker_error_rate: float = 0.5
+    llm_breaker_min_samples: int = 10
+    llm_breaker_cooldown_seconds: float = 30.0
+    llm_failover_timeout_seconds: float = 150.0
     secret_key: str = "change-me"
     allowed_origins: Union[list[str], str, None] = Field(
         default_factory=lambda: ["http://localhost:3000"]
@@ -26,6 +85,30 @@ class Settings(BaseSettings):
     n8n_api_key: str = ""
     n8n_basic_auth_user: str = ""
     n8n_basic_auth_password: str = ""
+    # Shared connection pool used for every n8n API call
+    n8n_max_connections: int = 20
+    n8n_max_keepalive_connections: int = 10
+    n8n_keepalive_expiry_seconds: float = 30.0
+    n8n_http2: bool = False
+    # Bulk deploys: concurrent creates, retries on 429/5xx with jittered
+    # exponential backoff, and how long a content hash maps to its workflow
+    n8n_bulk_deploy_concurrency: int = 8
+    n8n_deploy_max_attempts: int = 5
+    n8n_deploy_backoff_seconds: float = 0.5
+    n8n_deploy_max_backoff_seconds: float = 30.0
+    n8n_deploy_idempotency_ttl_seconds: int = 30 * 24 * 60 * 60
+    n8n_deploy_lock_seconds: int = 120
+    # Local mirror of n8n workflows; when enabled a background task
+    # re-syncs often enough that reads are never older than the bound
+    n8n_mirror_enabled: bool = False
+    n8n_mirror_max_staleness_seconds: float = 120.0
+    n8n_mirror_page_size: int = 250
+    # Worker pool for /n8n/convert/batch; 0 uses one worker per CPU.
+    # Longer lines are reported as errors instead of being buffered
+    convert_batch_workers: int = 0
+    convert_batch_chunk_size: int = 16
+    convert_batch_max_in_flight: int = 0
+    convert_batch_max_line_bytes: int = 4 * 1024 * 1024
     environment: str = "development"
     debug: bool = False
 
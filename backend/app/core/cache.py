@@ -1,6 +1,7 @@
 """Redis cache utilities for creating shared connections."""
 
 import redis
+import redis.asyncio
 
 from ..config import settings
 
@@ -8,3 +9,8 @@ from ..config import settings
 def get_redis_client() -> redis.Redis:
     """Instantiate a Redis client using the configured connection string."""
     return redis.Redis.from_url(settings.redis_url)
+
+
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """Instantiate an asyncio Redis client for long-lived consumers."""
+    return redis.asyncio.Redis.from_url(settings.redis_url)
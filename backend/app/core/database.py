@@ -1,9 +1,51 @@
 """Database session management utilities."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from collections.abc import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from ..config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+def _async_database_url(url: str) -> str:
+    """Point plain ``postgresql://`` URLs at psycopg's async driver."""
+    parsed = make_url(url)
+    if parsed.drivername in {"postgresql", "postgres"}:
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed.render_as_string(hide_password=False)
+
+
+engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout_seconds,
+    pool_recycle=settings.database_pool_recycle_seconds,
+    pool_pre_ping=True,
+    connect_args={
+        "options": (
+            f"-c statement_timeout={settings.database_statement_timeout_ms}"
+        ),
+    },
+)
+SessionLocal = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Yield a session bound to the pooled async engine."""
+    async with SessionLocal() as session:
+        yield session
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections; called from the app lifespan."""
+    await engine.dispose()
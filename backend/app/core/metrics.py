@@ -0,0 +1,123 @@
+"""Prometheus metrics for generation stages and upstream calls."""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Spans sub-millisecond parsing up to multi-minute LLM calls.
+_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 180.0,
+)
+
+STAGE_SECONDS = Histogram(
+    "flowforge_stage_duration_seconds",
+    "Time spent in each workflow generation and deploy stage.",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+UPSTREAM_SECONDS = Histogram(
+    "flowforge_upstream_request_duration_seconds",
+    "Latency of single requests to upstream services.",
+    ["service", "operation", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+UPSTREAM_RETRIES = Counter(
+    "flowforge_upstream_retries_total",
+    "Upstream calls retried after a failed attempt.",
+    ["service"],
+)
+PARSE_FAILURES = Counter(
+    "flowforge_blueprint_parse_failures_total",
+    "Model responses that could not be turned into a blueprint.",
+    ["reason"],
+)
+TRUNCATIONS = Counter(
+    "flowforge_llm_truncations_total",
+    "Truncated LLM responses by outcome (continued, salvaged, failed).",
+    ["outcome"],
+)
+HEDGES = Counter(
+    "flowforge_llm_hedges_total",
+    "Hedged LLM requests by outcome (launched, won, budget_denied).",
+    ["outcome"],
+)
+LLM_ROUTING = Counter(
+    "flowforge_llm_routing_total",
+    "LLM provider routing events (failover, circuit_open, circuit_closed).",
+    ["provider", "event"],
+)
+PROMPT_TOKENS = Counter(
+    "flowforge_llm_prompt_tokens_total",
+    "LLM prompt tokens (estimated locally, billed, served from cache).",
+    ["kind"],
+)
+COMPACTED_TURNS = Counter(
+    "flowforge_llm_compacted_turns_total",
+    "Chat turns folded into summaries to fit the prompt budget.",
+)
+JOBS = Counter(
+    "flowforge_generation_jobs_total",
+    "Async generation jobs by outcome (submitted, succeeded, retried, dead).",
+    ["outcome"],
+)
+BULK_DEPLOYS = Counter(
+    "flowforge_n8n_bulk_deploys_total",
+    "Workflows in bulk deploys by outcome (created, existing, failed,"
+    " unknown, invalid).",
+    ["outcome"],
+)
+MIRROR_SYNCED = Counter(
+    "flowforge_n8n_mirror_workflows_total",
+    "Workflows touched by mirror syncs (written, removed, unchanged).",
+    ["outcome"],
+)
+IN_FLIGHT = Gauge(
+    "flowforge_generations_in_flight",
+    "Workflow generations currently being served.",
+    ["mode"],
+    multiprocess_mode="livesum",
+)
+
+# Label children are bound once so hot paths skip the label lookup.
+PROMPT_ASSEMBLY = STAGE_SECONDS.labels("prompt_assembly")
+DEEPSEEK_CALL = STAGE_SECONDS.labels("deepseek_call")
+GEMINI_CALL = STAGE_SECONDS.labels("gemini_call")
+CLEAN_JSON = STAGE_SECONDS.labels("clean_json")
+EXTRACT_JSON = STAGE_SECONDS.labels("extract_json")
+PARSE_JSON = STAGE_SECONDS.labels("parse_json")
+REPAIR_JSON = STAGE_SECONDS.labels("repair_json")
+VALIDATE = STAGE_SECONDS.labels("validate")
+CONVERT = STAGE_SECONDS.labels("convert")
+N8N_DEPLOY = STAGE_SECONDS.labels("n8n_deploy")
+MIRROR_SYNC = STAGE_SECONDS.labels("n8n_mirror_sync")
+DEEPSEEK_RETRIES = UPSTREAM_RETRIES.labels("deepseek")
+GEMINI_RETRIES = UPSTREAM_RETRIES.labels("gemini")
+N8N_RETRIES = UPSTREAM_RETRIES.labels("n8n")
+PROMPT_TOKENS_ESTIMATED = PROMPT_TOKENS.labels("estimated")
+PROMPT_TOKENS_BILLED = PROMPT_TOKENS.labels("billed")
+PROMPT_TOKENS_CACHE_HIT = PROMPT_TOKENS.labels("cache_hit")
+GENERATE_IN_FLIGHT = IN_FLIGHT.labels("generate")
+STREAM_IN_FLIGHT = IN_FLIGHT.labels("stream")
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set (several uvicorn workers),
+    samples from every worker are aggregated.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,12 +1,70 @@
-"""Utilities for issuing JWT access tokens."""
+"""Password hashing and issuing and verifying JWT access tokens."""
 
+import hashlib
+import hmac
+import secrets
 from importlib import import_module
 from datetime import datetime, timedelta
 
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+
 from ..config import settings
 
 jwt = import_module("jwt")
 
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+# scrypt cost parameters; stored with each hash so they can be raised.
+_SCRYPT_N = 2**14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+
+# Checked when no user matches, so a miss costs the same scrypt run.
+UNKNOWN_USER_HASH = (
+    f"scrypt${_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}"
+    f"${secrets.token_hex(16)}${'0' * 128}"
+)
+
+
+def hash_password(password: str) -> str:
+    """Return a salted scrypt hash of ``password`` with its parameters.
+
+    Each call takes tens of milliseconds and about 16 MB; call it from
+    a worker thread in async code.
+    """
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=_SCRYPT_N,
+        r=_SCRYPT_R,
+        p=_SCRYPT_P,
+    )
+    return (
+        f"scrypt${_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}"
+        f"${salt.hex()}${digest.hex()}"
+    )
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Check ``password`` against a hash from :func:`hash_password`."""
+    try:
+        scheme, n, r, p, salt, digest = hashed.split("$")
+        if scheme != "scrypt":
+            return False
+        expected = bytes.fromhex(digest)
+        candidate = hashlib.scrypt(
+            password.encode(),
+            salt=bytes.fromhex(salt),
+            n=int(n),
+            r=int(r),
+            p=int(p),
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate, expected)
+
 
 def create_access_token(subject: str, expires_minutes: int = 30) -> str:
     """Create a signed JWT access token."""
@@ -14,3 +72,23 @@ def create_access_token(subject: str, expires_minutes: int = 30) -> str:
     token_payload = {"sub": subject, "exp": expiry}
     token = jwt.encode(token_payload, settings.secret_key, algorithm="HS256")
     return token
+
+
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
+    """Return the user id (``sub``) carried by a valid bearer token."""
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    except jwt.PyJWTError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from exc
+    subject = payload.get("sub")
+    if not subject:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has no subject",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return str(subject)
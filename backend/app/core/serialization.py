@@ -0,0 +1,129 @@
+"""JSON encoding helpers backed by orjson with a stdlib fallback."""
+
+import json
+import math
+import re
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+try:  # pragma: no cover - optional dependency for the fast path
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Plain dicts may carry non-string keys that the stdlib would coerce.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+# orjson reads integers outside the 64-bit range as floats; any such
+# integer has at least 19 digits.
+_WIDE_INT = re.compile(r"\d{19}")
+_WIDE_INT_BYTES = re.compile(rb"\d{19}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes.
+
+    Values orjson refuses (integers beyond 64 bits, for example) or
+    writes differently (NaN and infinities become ``null``) fall back to
+    the stdlib encoder so behaviour matches plain ``json.dumps``.
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+        else:
+            if b"null" not in encoded or not _has_non_finite(obj):
+                return encoded
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """Decode JSON text; errors are ``json.JSONDecodeError`` either way.
+
+    Integers wider than 64 bits and the NaN and Infinity literals are
+    decoded by the stdlib, as orjson would turn the first into floats
+    and reject the others.
+    """
+    if orjson is not None:
+        wide = _WIDE_INT if isinstance(data, str) else _WIDE_INT_BYTES
+        if wide.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(data)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with :func:`dumps`.
+
+    Return it directly with an already-plain ``dict`` to skip FastAPI's
+    ``jsonable_encoder`` and response-model passes entirely.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a validated model once, in pydantic-core, by alias."""
+    return Response(
+        content=model.model_dump_json(by_alias=True),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+class FastJSONRequest(Request):
+    """Request whose JSON body is decoded with :func:`loads`."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = loads(await self.body())
+        return self._json
+
+
+class FastJSONRoute(APIRoute):
+    """Route that decodes JSON request bodies with orjson.
+
+    FastAPI still validates the decoded body against the endpoint's
+    parameter types with its per-route ``TypeAdapter``, so OpenAPI and
+    422 responses are unchanged; only the stdlib decode is replaced.
+    Use it with ``APIRouter(route_class=FastJSONRoute)``.
+    """
+
+    def get_route_handler(
+        self,
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(
+                FastJSONRequest(request.scope, request.receive)
+            )
+
+        return route_handler
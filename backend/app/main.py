@@ -1,12 +1,52 @@
 """Application entrypoint configuring the FastAPI service and routes."""
 
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .api import auth, workflows, chat, n8n, probe
+from .api import auth, workflows, chat, executions, n8n, probe
+from .core.database import dispose_engine
+from .core.metrics import render_metrics
+from .core.serialization import FastJSONResponse
+from .services.execution_ingest import (
+    close_execution_ingestor,
+    get_execution_ingestor,
+)
+from .services.batch_converter import shutdown_process_pool
+from .services.bulk_deploy import close_bulk_deployer
+from .services.job_queue import close_job_queue
+from .services.n8n_client import close_http_client, get_http_client
+from .services.n8n_mirror import close_n8n_mirror, get_n8n_mirror
+
 
-app = FastAPI(title="FlowForge Automation API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Own process-wide resources for the lifetime of the app."""
+    get_http_client()
+    get_execution_ingestor().start()
+    if settings.n8n_mirror_enabled:
+        get_n8n_mirror().start()
+    try:
+        yield
+    finally:
+        await close_execution_ingestor()
+        await close_job_queue()
+        await close_bulk_deployer()
+        await close_n8n_mirror()
+        await close_http_client()
+        shutdown_process_pool()
+        await dispose_engine()
+
+
+app = FastAPI(
+    title="FlowForge Automation API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +59,11 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(workflows.router, prefix="/workflows", tags=["workflows"])
 app.include_router(chat.router, prefix="/chat", tags=["chat"])
+app.include_router(
+    executions.router,
+    prefix="/executions",
+    tags=["executions"],
+)
 app.include_router(n8n.router, prefix="/n8n", tags=["n8n"])
 app.include_router(probe.router, prefix="/probe", tags=["probe"])
 
@@ -27,3 +72,10 @@ app.include_router(probe.router, prefix="/probe", tags=["probe"])
 def health() -> dict[str, str]:
     """Lightweight readiness probe for uptime checks."""
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Expose Prometheus metrics for scraping."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
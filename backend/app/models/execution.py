@@ -1,20 +1,28 @@
 """SQLAlchemy model tracking workflow execution runs."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, text
+from sqlalchemy import Column, DateTime, String, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 from .base import Base
 
 
 class Execution(Base):
-    """Historical run entry storing status and optional metrics."""
+    """Historical run entry storing status and optional metrics.
+
+    The table is range-partitioned by day on ``created_at`` (see
+    ``docker/init-db.sql``), so the partition key is part of the primary
+    key. ``workflow_id`` holds the n8n workflow id and is not a foreign
+    key, which keeps bulk loads cheap.
+    """
     __tablename__ = "executions"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id = Column(String, primary_key=True)
-    workflow_id = Column(String, ForeignKey("workflows.id"), nullable=False)
+    workflow_id = Column(String, nullable=False, index=True)
     status = Column(String, nullable=False)
     metrics = Column(JSONB, nullable=True)
     created_at = Column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=text("CURRENT_TIMESTAMP"),
     )
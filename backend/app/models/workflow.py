@@ -1,6 +1,14 @@
 """SQLAlchemy model for workflow blueprints owned by users."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 
 from .base import Base
@@ -17,5 +25,16 @@ class Workflow(Base):
     blueprint = Column(JSONB, nullable=False)
     created_at = Column(
         DateTime(timezone=True),
+        nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
     )
+
+    __table_args__ = (
+        # Keyset pagination walks (owner_id, created_at, id) backwards.
+        Index(
+            "ix_workflows_owner_created_id",
+            "owner_id",
+            "created_at",
+            "id",
+        ),
+    )
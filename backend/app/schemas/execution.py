@@ -0,0 +1,39 @@
+"""Pydantic schemas for n8n execution records."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# How far ahead of the server clock a producer's createdAt may be.
+MAX_CLOCK_SKEW = timedelta(days=1)
+
+
+class ExecutionRecord(BaseModel):
+    """Single workflow run reported by n8n or the executor.
+
+    ``createdAt`` is required: with ``id`` it is the primary key, so it
+    must come from the producer for a redelivered run to match its row.
+    It may not lie more than ``MAX_CLOCK_SKEW`` in the future, which
+    would otherwise create partitions for far-off days.
+    """
+    id: str
+    workflow_id: str = Field(alias="workflowId")
+    status: str
+    metrics: dict[str, Any] | None = None
+    created_at: datetime = Field(alias="createdAt")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("created_at")
+    @classmethod
+    def _not_in_future(cls, value: datetime) -> datetime:
+        latest = datetime.now(timezone.utc) + MAX_CLOCK_SKEW
+        if value.astimezone(timezone.utc) > latest:
+            raise ValueError("createdAt is too far in the future")
+        return value
+
+
+class ExecutionBatchResponse(BaseModel):
+    """Acknowledgement that records were queued for ingestion."""
+    accepted: int
@@ -0,0 +1,30 @@
+"""Pydantic schemas for asynchronous generation jobs."""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+
+from .workflow import ChatRequest, WorkflowBlueprint
+
+JobStatus = Literal["queued", "running", "succeeded", "dead"]
+
+
+class GenerationJobRequest(ChatRequest):
+    """Chat request to generate in the background."""
+    callback_url: HttpUrl | None = Field(None, alias="callbackUrl")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class GenerationJob(BaseModel):
+    """State of a queued generation, with its result once finished."""
+    job_id: str = Field(alias="jobId")
+    status: JobStatus
+    attempts: int = 0
+    result: WorkflowBlueprint | None = None
+    error: str | None = None
+    created_at: datetime = Field(alias="createdAt")
+    updated_at: datetime = Field(alias="updatedAt")
+
+    model_config = ConfigDict(populate_by_name=True)
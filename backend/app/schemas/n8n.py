@@ -1,9 +1,28 @@
 """Pydantic schema for exporting workflows into n8n."""
 
-from pydantic import BaseModel
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .workflow import WorkflowBlueprint
 
 
 class N8NExportRequest(BaseModel):
     """Payload describing a workflow export and required credentials."""
     workflow_id: str
     credentials: dict[str, str]
+
+
+class N8NWorkflowUpdateRequest(BaseModel):
+    """Edited blueprint plus the state n8n currently holds for it."""
+    blueprint: WorkflowBlueprint
+    previous_blueprint: WorkflowBlueprint | None = Field(
+        None,
+        alias="previousBlueprint",
+    )
+    previous_workflow: dict[str, Any] | None = Field(
+        None,
+        alias="previousWorkflow",
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -1,8 +1,43 @@
 """Pydantic schemas representing workflow blueprints and chat payloads."""
 
-from typing import Any
+from datetime import datetime
+from typing import Annotated, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+)
+
+# Parameter objects with more keys than this are adopted, not copied.
+LARGE_PARAMETERS = 64
+
+
+def _adopt_large_parameters(
+    value: Any,
+    handler: ValidatorFunctionWrapHandler,
+) -> dict[str, Any]:
+    """Keep an oversized ``parameters`` object as decoded.
+
+    Values are ``Any``, so pydantic never looks inside them; for a big
+    object its only work is a key-by-key copy. Once every key is known
+    to be a string the decoded dict is used as is.
+    """
+    if (
+        type(value) is dict
+        and len(value) > LARGE_PARAMETERS
+        and all(type(key) is str for key in value)
+    ):
+        return value
+    return handler(value)
+
+
+NodeParameters = Annotated[
+    dict[str, Any],
+    WrapValidator(_adopt_large_parameters),
+]
 
 
 class ChatMessage(BaseModel):
@@ -22,7 +57,7 @@ class WorkflowNode(BaseModel):
     id: str
     name: str
     type: str
-    parameters: dict[str, Any] = Field(default_factory=dict)
+    parameters: NodeParameters = Field(default_factory=dict)
     position: dict[str, int] | list[int] | None = None
     type_version: float | None = Field(None, alias="typeVersion")
     js_code: str | None = Field(None, alias="jsCode")
@@ -58,5 +93,25 @@ class WorkflowBlueprint(BaseModel):
     estimated_time_saved_minutes: int = Field(
         alias="estimatedTimeSavedMinutes",
     )
+    # Set when only the whole part of a cut-off response was kept.
+    truncated: bool = False
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class WorkflowSummary(BaseModel):
+    """Stored workflow listed without its full blueprint."""
+    id: str
+    title: str
+    description: str | None = None
+    created_at: datetime = Field(alias="createdAt")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class WorkflowPage(BaseModel):
+    """One keyset-paginated page of workflow summaries."""
+    items: list[WorkflowSummary]
+    next_cursor: str | None = Field(None, alias="nextCursor")
 
     model_config = ConfigDict(populate_by_name=True)
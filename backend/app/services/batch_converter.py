@@ -0,0 +1,193 @@
+"""Convert NDJSON blueprint batches on a worker process pool."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import ValidationError
+
+from ..config import settings
+from ..core.serialization import dumps
+from ..schemas.workflow import WorkflowBlueprint
+from .blueprint_validator import has_errors, validate_blueprint
+from .n8n_converter import to_n8n_payload
+from .workflow_graph import WorkflowGraph
+
+logger = logging.getLogger(__name__)
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _worker_count() -> int:
+    return settings.convert_batch_workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared conversion pool, starting it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # Spawned workers avoid inheriting the event loop and its threads.
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the conversion workers; called from the app lifespan."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+
+
+def _convert_line(index: int, line: bytes) -> bytes:
+    if not line:
+        # iter_lines stands in an empty line for one over the limit.
+        return dumps({"index": index, "error": "line too long"}) + b"\n"
+    try:
+        blueprint = WorkflowBlueprint.model_validate_json(line)
+        graph = WorkflowGraph.from_blueprint(blueprint)
+        diagnostics = validate_blueprint(blueprint, graph=graph)
+        if has_errors(diagnostics):
+            document = {
+                "index": index,
+                "error": "invalid blueprint",
+                "diagnostics": [d.as_dict() for d in diagnostics],
+            }
+        else:
+            document = {
+                "index": index,
+                "workflow": to_n8n_payload(blueprint, graph),
+            }
+    except ValidationError as exc:
+        document = {
+            "index": index,
+            "error": "invalid blueprint",
+            "details": exc.errors(
+                include_url=False,
+                include_context=False,
+                include_input=False,
+            ),
+        }
+    except Exception as exc:  # noqa: BLE001 - reported per item
+        document = {"index": index, "error": f"{type(exc).__name__}: {exc}"}
+    return dumps(document) + b"\n"
+
+
+def _convert_chunk(start: int, lines: list[bytes]) -> bytes:
+    """Worker entrypoint converting consecutive NDJSON lines."""
+    return b"".join(
+        _convert_line(start + offset, line)
+        for offset, line in enumerate(lines)
+    )
+
+
+def _failed_chunk(start: int, size: int, exc: BaseException) -> bytes:
+    message = f"{type(exc).__name__}: {exc}"
+    return b"".join(
+        dumps({"index": start + offset, "error": message}) + b"\n"
+        for offset in range(size)
+    )
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Split a byte stream into non-empty lines.
+
+    Only newly received bytes are searched for newlines. A line longer
+    than ``max_line_bytes`` is discarded as it arrives and ``b""`` is
+    yielded in its place, so the lines after it keep their position.
+    """
+    limit = max_line_bytes or settings.convert_batch_max_line_bytes
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        view = memoryview(chunk)
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end != -1 and not buffer and not oversized:
+                # The whole line is in this chunk; skip the buffer.
+                line = chunk[start:end]
+                if len(line) > limit:
+                    yield b""
+                elif line and not line.isspace():
+                    yield line
+                start = end + 1
+                continue
+            if not oversized:
+                buffer += view[start:] if end == -1 else view[start:end]
+                if len(buffer) > limit:
+                    oversized = True
+                    buffer.clear()
+            if end == -1:
+                break
+            if oversized:
+                yield b""
+            elif buffer and not buffer.isspace():
+                yield bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+    if oversized:
+        yield b""
+    elif buffer and not buffer.isspace():
+        yield bytes(buffer)
+
+
+async def convert_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Convert an NDJSON blueprint stream, yielding results in input order.
+
+    Lines are grouped into chunks and dispatched to the process pool. At
+    most ``convert_batch_max_in_flight`` chunks are outstanding, so reading
+    the request body pauses while workers are saturated and memory stays
+    flat regardless of batch size. Invalid items produce an ``error`` line
+    carrying their ``index`` instead of aborting the batch.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    chunk_size = max(1, settings.convert_batch_chunk_size)
+    max_in_flight = settings.convert_batch_max_in_flight or (
+        2 * _worker_count()
+    )
+    pending: deque[tuple[int, int, asyncio.Future[bytes]]] = deque()
+
+    async def drain_one() -> bytes:
+        start, size, future = pending.popleft()
+        try:
+            return await future
+        except Exception as exc:  # noqa: BLE001 - e.g. a crashed worker
+            logger.error("Batch conversion chunk failed: %s", exc)
+            return _failed_chunk(start, size, exc)
+
+    index = 0
+    batch: list[bytes] = []
+    try:
+        async for line in iter_lines(chunks):
+            batch.append(line)
+            if len(batch) < chunk_size:
+                continue
+            future = loop.run_in_executor(pool, _convert_chunk, index, batch)
+            pending.append((index, len(batch), future))
+            index += len(batch)
+            batch = []
+            while len(pending) >= max_in_flight:
+                yield await drain_one()
+        if batch:
+            future = loop.run_in_executor(pool, _convert_chunk, index, batch)
+            pending.append((index, len(batch), future))
+        while pending:
+            yield await drain_one()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
@@ -0,0 +1,179 @@
+"""Content-addressed Redis cache for generated workflow blueprints."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis
+import redis.asyncio
+from pydantic import ValidationError
+
+from ..config import settings
+from ..core.cache import get_async_redis_client
+from ..schemas.workflow import ChatRequest, WorkflowBlueprint
+
+KEY_PREFIX = "flowforge:blueprint:"
+INDEX_KEY = "flowforge:blueprint:index"
+
+logger = logging.getLogger(__name__)
+
+
+def build_cache_key(payload: ChatRequest, model: str, *prompts: str) -> str:
+    """Hash the normalized conversation, model and prompt text."""
+    document = {
+        "model": model,
+        "prompts": list(prompts),
+        "messages": [
+            [
+                message.role.strip().lower(),
+                message.content.replace("\r\n", "\n").strip(),
+            ]
+            for message in payload.messages
+        ],
+    }
+    encoded = json.dumps(
+        document,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class BlueprintCache:
+    """Store blueprints in Redis and coalesce identical in-flight requests.
+
+    Entries expire after ``ttl_seconds`` and a sorted-set index keeps the
+    cache at ``max_entries`` by evicting the oldest keys first. Redis
+    failures are logged and treated as cache misses. Truncated blueprints
+    are returned to their callers but never stored, so a retry can
+    produce the whole document.
+    """
+
+    def __init__(
+        self,
+        client: redis.asyncio.Redis | None = None,
+        ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds or settings.blueprint_cache_ttl_seconds
+        self._max_entries = (
+            max_entries or settings.blueprint_cache_max_entries
+        )
+        self._enabled = (
+            settings.blueprint_cache_enabled if enabled is None else enabled
+        )
+        self._inflight: dict[str, asyncio.Future[WorkflowBlueprint]] = {}
+
+    @property
+    def client(self) -> redis.asyncio.Redis:
+        """Return the Redis connection, creating it on first use."""
+        if self._client is None:
+            self._client = get_async_redis_client()
+        return self._client
+
+    async def close(self) -> None:
+        """Release the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, key: str) -> WorkflowBlueprint | None:
+        """Return the cached blueprint for ``key`` or ``None`` on a miss."""
+        if not self._enabled:
+            return None
+        try:
+            raw = await self.client.get(KEY_PREFIX + key)
+        except redis.RedisError as exc:
+            logger.warning("Blueprint cache lookup failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        try:
+            return WorkflowBlueprint.model_validate_json(raw)
+        except ValidationError as exc:
+            logger.warning("Discarding corrupt cached blueprint: %s", exc)
+            return None
+
+    async def set(self, key: str, blueprint: WorkflowBlueprint) -> None:
+        """Store ``blueprint`` under ``key`` and enforce the size bound."""
+        if not self._enabled or blueprint.truncated:
+            return
+        document = blueprint.model_dump_json(by_alias=True)
+        try:
+            await self._store(key, document)
+        except redis.RedisError as exc:
+            logger.warning("Blueprint cache write failed: %s", exc)
+
+    async def get_or_generate(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[WorkflowBlueprint]],
+    ) -> WorkflowBlueprint:
+        """Return a cached blueprint or run ``factory`` exactly once.
+
+        Concurrent callers asking for the same key share a single
+        in-flight generation. A caller that disconnects does not cancel
+        the generation for the others.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+            inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fill(key, factory))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(
+                lambda future: self._release(key, future)
+            )
+        return await asyncio.shield(inflight)
+
+    async def _fill(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[WorkflowBlueprint]],
+    ) -> WorkflowBlueprint:
+        blueprint = await factory()
+        await self.set(key, blueprint)
+        return blueprint
+
+    def _release(self, key: str, future: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when every waiter went away.
+            future.exception()
+
+    async def _store(self, key: str, document: str) -> None:
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(KEY_PREFIX + key, document, ex=self._ttl)
+        pipe.zadd(INDEX_KEY, {key: now})
+        # Drop index members whose payload has already expired.
+        pipe.zremrangebyscore(INDEX_KEY, "-inf", now - self._ttl)
+        pipe.zcard(INDEX_KEY)
+        *_, size = await pipe.execute()
+
+        overflow = int(size) - self._max_entries
+        if overflow <= 0:
+            return
+        evicted = await self.client.zpopmin(INDEX_KEY, overflow)
+        if evicted:
+            await self.client.delete(
+                *(KEY_PREFIX + _decode(member) for member, _ in evicted)
+            )
+
+
+def _decode(member: bytes | str) -> str:
+    if isinstance(member, bytes):
+        return member.decode("utf-8")
+    return member
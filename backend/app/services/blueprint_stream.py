@@ -0,0 +1,144 @@
+"""Incremental scanner that surfaces blueprint steps and edges mid-stream."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from ..core.serialization import loads
+
+STREAMED_SECTIONS = frozenset({"steps", "edges"})
+
+
+class BlueprintStreamParser:
+    """Scan a blueprint JSON document chunk by chunk.
+
+    The parser tracks string state and container nesting in a single pass
+    over the text. Whenever an object directly inside the top-level
+    ``steps`` or ``edges`` array closes, it is decoded and returned from
+    :meth:`feed`. Everything else is left to the final full parse.
+
+    The same scan tells a truncated document apart from one that merely
+    contains braces inside strings, and remembers the last point where a
+    whole step, edge or top-level value had closed, so a cut-off response
+    can be resumed or salvaged from there.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: str | None = None
+        self._key: str | None = None
+        self._item_start: int | None = None
+        self._counts = dict.fromkeys(STREAMED_SECTIONS, 0)
+        self._resume = 0
+        self._resume_stack: tuple[str, ...] = ()
+
+    @property
+    def complete(self) -> bool:
+        """Return whether the root object has been fully closed."""
+        return self._pos > 0 and not self._stack and not self._in_string
+
+    @property
+    def text(self) -> str:
+        """Return everything fed so far."""
+        return self._text
+
+    @property
+    def resume_point(self) -> int:
+        """Offset just past the last whole item or top-level value."""
+        return self._resume
+
+    def salvage(self) -> str | None:
+        """Return the text up to :attr:`resume_point`, closed into JSON.
+
+        ``None`` means no item or top-level value had closed yet.
+        """
+        if not self._resume:
+            return None
+        closers = "".join(
+            "}" if opener == "{" else "]"
+            for opener in reversed(self._resume_stack)
+        )
+        return self._text[:self._resume] + closers
+
+    def feed(self, chunk: str) -> list[tuple[str, int, dict[str, Any]]]:
+        """Consume ``chunk`` and return items completed by it.
+
+        Each entry is ``(section, index, item)`` where ``index`` counts
+        objects seen so far in that section, valid or not.
+        """
+        self._text += chunk
+        text = self._text
+        stack = self._stack
+        completed: list[tuple[str, int, dict[str, Any]]] = []
+
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(stack) == 1:
+                        self._last_string = text[self._string_start:pos + 1]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == ":" and len(stack) == 1:
+                self._key = _decode_key(self._last_string)
+            elif char in "{[":
+                stack.append(char)
+                if (
+                    char == "{"
+                    and len(stack) == 3
+                    and stack[1] == "["
+                    and self._key in STREAMED_SECTIONS
+                ):
+                    self._item_start = pos
+            elif char in "}]":
+                if stack:
+                    stack.pop()
+                if 0 < len(stack) <= 2:
+                    self._resume = pos + 1
+                    self._resume_stack = tuple(stack)
+                if (
+                    char == "}"
+                    and len(stack) == 2
+                    and self._item_start is not None
+                ):
+                    item = self._decode_item(text[self._item_start:pos + 1])
+                    self._item_start = None
+                    section = self._key or ""
+                    index = self._counts[section]
+                    self._counts[section] = index + 1
+                    if item is not None:
+                        completed.append((section, index, item))
+
+        self._pos = len(text)
+        return completed
+
+    @staticmethod
+    def _decode_item(fragment: str) -> dict[str, Any] | None:
+        try:
+            item = loads(fragment)
+        except json.JSONDecodeError:
+            return None
+        return item if isinstance(item, dict) else None
+
+
+def _decode_key(raw: str | None) -> str | None:
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
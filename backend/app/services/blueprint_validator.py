@@ -0,0 +1,310 @@
+"""Structural validation of workflow blueprints before conversion."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from ..schemas.workflow import WorkflowBlueprint, WorkflowEdge
+from .node_catalog import NodeCatalog, NodeSpec, get_node_catalog
+from .workflow_graph import MISSING, WorkflowGraph
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    """One finding about a blueprint, tied to a step and/or an edge."""
+    code: str
+    severity: str
+    message: str
+    node_id: str | None = None
+    edge_id: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the diagnostic as camelCase JSON."""
+        return {
+            "code": self.code,
+            "severity": self.severity,
+            "message": self.message,
+            "nodeId": self.node_id,
+            "edgeId": self.edge_id,
+        }
+
+
+class BlueprintValidationError(ValueError):
+    """Raised when a blueprint has errors that would break it in n8n."""
+
+    def __init__(self, diagnostics: Sequence[Diagnostic]) -> None:
+        self.diagnostics = list(diagnostics)
+        errors = [d for d in self.diagnostics if d.severity == ERROR]
+        summary = "; ".join(d.message for d in errors[:3])
+        super().__init__(
+            f"Blueprint has {len(errors)} error(s): {summary}"
+        )
+
+
+_Report = Callable[[Diagnostic], None]
+
+
+def has_errors(diagnostics: Iterable[Diagnostic]) -> bool:
+    """Return whether any diagnostic blocks conversion."""
+    return any(d.severity == ERROR for d in diagnostics)
+
+
+def ensure_valid(
+    blueprint: WorkflowBlueprint,
+    graph: WorkflowGraph | None = None,
+) -> list[Diagnostic]:
+    """Return the blueprint's warnings or raise on any error."""
+    diagnostics = validate_blueprint(blueprint, graph=graph)
+    if has_errors(diagnostics):
+        raise BlueprintValidationError(diagnostics)
+    return diagnostics
+
+
+def validate_blueprints(
+    blueprints: Iterable[WorkflowBlueprint],
+) -> list[list[Diagnostic]]:
+    """Validate many blueprints against one catalog snapshot."""
+    catalog = get_node_catalog()
+    return [validate_blueprint(blueprint, catalog) for blueprint in blueprints]
+
+
+def validate_blueprint(
+    blueprint: WorkflowBlueprint,
+    catalog: NodeCatalog | None = None,
+    graph: WorkflowGraph | None = None,
+) -> list[Diagnostic]:
+    """Check one blueprint in O(steps + edges).
+
+    Errors are what the converter would otherwise corrupt silently:
+    duplicate step ids or names and edges to unknown steps. Everything
+    else is a warning: port indices beyond the catalog's static counts
+    (merge and switch grow ports in later versions), cycles (n8n runs
+    loops), unreachable steps, unknown node types, parameter mismatches
+    and duplicate edge ids. Pass ``graph`` to reuse the index the
+    converter will use.
+    """
+    catalog = catalog or get_node_catalog()
+    graph = graph or WorkflowGraph.from_blueprint(blueprint)
+    diagnostics: list[Diagnostic] = []
+    add = diagnostics.append
+
+    duplicates = set(graph.duplicates)
+    specs: list[NodeSpec | None] = [None] * len(graph)
+    triggers = [False] * len(graph)
+    names: set[str] = set()
+    for node, step in enumerate(blueprint.steps):
+        if node in duplicates:
+            add(Diagnostic(
+                "duplicate_step_id",
+                ERROR,
+                f"Step id '{step.id}' is used more than once",
+                node_id=step.id,
+            ))
+            continue
+        if step.name in names:
+            # n8n wires connections by node name.
+            add(Diagnostic(
+                "duplicate_step_name",
+                ERROR,
+                f"Step name '{step.name}' is used more than once",
+                node_id=step.id,
+            ))
+        names.add(step.name)
+
+        spec = catalog.get(step.type)
+        specs[node] = spec
+        if spec is None:
+            # Types missing from the catalog follow n8n's "...Trigger"
+            # naming.
+            triggers[node] = step.type.endswith("Trigger")
+            add(Diagnostic(
+                "unknown_node_type",
+                WARNING,
+                f"Node type '{step.type}' is not in the catalog",
+                node_id=step.id,
+            ))
+            continue
+        triggers[node] = spec.trigger
+        for issue in spec.check_parameters(step.parameters or {}):
+            add(Diagnostic(
+                issue.code,
+                WARNING,
+                issue.message,
+                node_id=step.id,
+            ))
+
+    # Only edges that can produce a diagnostic are read: a plain edge
+    # (main, output 0 to input 0) between known steps is fine unless an
+    # end has no ports at all.
+    duplicate_edges = set(graph.duplicate_edges)
+    ported = graph.ported
+    closed_outputs = [
+        spec is not None and spec.max_outputs < 1 for spec in specs
+    ]
+    closed_inputs = [
+        spec is not None and spec.max_inputs < 1 for spec in specs
+    ]
+    for position, (source, target) in enumerate(
+        zip(graph.sources, graph.targets)
+    ):
+        if (
+            source == MISSING
+            or target == MISSING
+            or ported[position]
+            or position in duplicate_edges
+            or closed_outputs[source]
+            or closed_inputs[target]
+        ):
+            _check_edge(
+                graph, position, position in duplicate_edges, specs, add
+            )
+
+    _check_cycles(graph, add)
+    _check_reachability(graph, triggers, duplicates, add)
+    return diagnostics
+
+
+def _check_edge(
+    graph: WorkflowGraph,
+    position: int,
+    duplicate: bool,
+    specs: list[NodeSpec | None],
+    add: _Report,
+) -> None:
+    edge = graph.edges[position]
+    source = graph.sources[position]
+    target = graph.targets[position]
+    if duplicate:
+        add(Diagnostic(
+            "duplicate_edge_id",
+            WARNING,
+            f"Edge id '{edge.id}' is used more than once",
+            edge_id=edge.id,
+        ))
+    if source == MISSING:
+        add(Diagnostic(
+            "unknown_edge_source",
+            ERROR,
+            f"Edge source '{edge.source}' is not a step",
+            edge_id=edge.id,
+        ))
+    if target == MISSING:
+        add(Diagnostic(
+            "unknown_edge_target",
+            ERROR,
+            f"Edge target '{edge.target}' is not a step",
+            edge_id=edge.id,
+        ))
+    if source == MISSING or target == MISSING:
+        return
+    if (edge.connection_type or "main") == "main":
+        _check_ports(edge, specs[source], specs[target], add)
+
+
+def _check_ports(
+    edge: WorkflowEdge,
+    source: NodeSpec | None,
+    target: NodeSpec | None,
+    add: _Report,
+) -> None:
+    output = edge.source_output_index or 0
+    if source is not None and not 0 <= output < source.max_outputs:
+        add(Diagnostic(
+            "output_index_out_of_range",
+            WARNING,
+            f"'{edge.source}' has {source.max_outputs} output(s);"
+            f" edge uses output {output}",
+            node_id=edge.source,
+            edge_id=edge.id,
+        ))
+    target_input = edge.target_input_index or 0
+    if target is not None and not 0 <= target_input < target.max_inputs:
+        add(Diagnostic(
+            "input_index_out_of_range",
+            WARNING,
+            f"'{edge.target}' has {target.max_inputs} input(s);"
+            f" edge uses input {target_input}",
+            node_id=edge.target,
+            edge_id=edge.id,
+        ))
+
+
+def _check_cycles(graph: WorkflowGraph, add: _Report) -> None:
+    """Report one back edge per cycle with an iterative DFS."""
+    ids = graph.ids
+    offsets = graph.offsets
+    adjacent = graph.adjacent
+    # 0 = unvisited, 1 = on the current path, 2 = finished
+    state = [0] * len(ids)
+    for root in range(len(ids)):
+        if state[root]:
+            continue
+        state[root] = 1
+        # Frames iterate positions in the CSR row of their node.
+        stack = [(root, iter(range(offsets[root], offsets[root + 1])))]
+        while stack:
+            node, positions = stack[-1]
+            for position in positions:
+                target = adjacent[position]
+                if state[target] == 1:
+                    edge = graph.edges[graph.out_edges[position]]
+                    add(Diagnostic(
+                        "cycle",
+                        WARNING,
+                        f"Edge from '{ids[node]}' back to '{ids[target]}'"
+                        " closes a cycle",
+                        node_id=ids[target],
+                        edge_id=edge.id,
+                    ))
+                elif state[target] == 0:
+                    state[target] = 1
+                    row = range(offsets[target], offsets[target + 1])
+                    stack.append((target, iter(row)))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+
+
+def _check_reachability(
+    graph: WorkflowGraph,
+    triggers: list[bool],
+    duplicates: set[int],
+    add: _Report,
+) -> None:
+    if not len(graph):
+        return
+    frontier = [node for node, trigger in enumerate(triggers) if trigger]
+    if not frontier:
+        add(Diagnostic(
+            "no_trigger",
+            WARNING,
+            "Blueprint has no trigger step; it can only run manually",
+        ))
+        return
+    offsets = graph.offsets
+    adjacent = graph.adjacent
+    reached = [False] * len(graph)
+    for node in frontier:
+        reached[node] = True
+    while frontier:
+        following: list[int] = []
+        for node in frontier:
+            for target in adjacent[offsets[node]:offsets[node + 1]]:
+                if not reached[target]:
+                    reached[target] = True
+                    following.append(target)
+        frontier = following
+    for node, seen in enumerate(reached):
+        if not seen and node not in duplicates:
+            add(Diagnostic(
+                "unreachable_node",
+                WARNING,
+                f"Step '{graph.ids[node]}' is not reachable from any trigger",
+                node_id=graph.ids[node],
+            ))
@@ -0,0 +1,368 @@
+"""Deploy many blueprints to n8n concurrently, at most once per content."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import redis
+import redis.asyncio
+
+from ..config import settings
+from ..core import metrics
+from ..core.cache import get_async_redis_client
+from ..core.serialization import dumps, loads
+from ..schemas.workflow import WorkflowBlueprint
+from .blueprint_validator import BlueprintValidationError, ensure_valid
+from .n8n_client import N8NClient, N8NClientError
+
+KEY_PREFIX = "flowforge:deploy:"
+_PENDING = b"pending"
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_key(blueprint: WorkflowBlueprint) -> str:
+    """Hash the blueprint's content, independent of key order."""
+    document = blueprint.model_dump(
+        mode="json",
+        by_alias=True,
+        exclude_none=True,
+    )
+    encoded = json.dumps(
+        document,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _maybe_sent(exc: Exception) -> bool:
+    """Whether a failed create may still have produced a workflow.
+
+    An n8n error status or a connection that was never made means
+    nothing was created; a timeout or dropped response mid-request, or
+    any failure after n8n answered, leaves the outcome unknown.
+    """
+    if isinstance(exc, N8NClientError):
+        return exc.status_code is None and not exc.retryable
+    return True
+
+
+class DeployLedger:
+    """Redis record of the n8n workflow created for each content hash.
+
+    A key holds ``pending`` while one deploy of that content is in flight
+    and the created workflow's id and URL afterwards. The pending marker
+    expires after ``lock_seconds`` so a crashed deploy does not block the
+    key forever. A create whose outcome is unknown, because the request
+    may have reached n8n before failing, leaves an ``unknown`` entry for
+    the full TTL rather than risking a duplicate on replay. Redis
+    failures are logged and treated as missing keys, so deploys still go
+    through without the duplicate guard.
+    """
+
+    def __init__(
+        self,
+        client: redis.asyncio.Redis | None = None,
+        ttl_seconds: int | None = None,
+        lock_seconds: int | None = None,
+        poll_interval: float = 0.25,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds or settings.n8n_deploy_idempotency_ttl_seconds
+        self._lock = lock_seconds or settings.n8n_deploy_lock_seconds
+        self._poll = poll_interval
+
+    @property
+    def client(self) -> redis.asyncio.Redis:
+        """Return the Redis connection, creating it on first use."""
+        if self._client is None:
+            self._client = get_async_redis_client()
+        return self._client
+
+    async def close(self) -> None:
+        """Release the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def acquire(self, key: str) -> dict[str, Any] | None:
+        """Return the workflow already deployed for ``key``, or reserve it.
+
+        ``None`` means the caller owns the key and must :meth:`record` or
+        :meth:`release` it. While another deploy holds the key this waits
+        for its result, or for its marker to lapse.
+        """
+        name = KEY_PREFIX + key
+        while True:
+            try:
+                if await self.client.set(
+                    name,
+                    _PENDING,
+                    nx=True,
+                    ex=self._lock,
+                ):
+                    return None
+                value = await self.client.get(name)
+            except redis.RedisError as exc:
+                logger.warning("Deploy ledger lookup failed: %s", exc)
+                return None
+            if value is not None and value != _PENDING:
+                return loads(value)
+            await asyncio.sleep(self._poll)
+
+    async def refresh(self, key: str) -> None:
+        """Extend the pending marker before another attempt."""
+        try:
+            await self.client.expire(KEY_PREFIX + key, self._lock)
+        except redis.RedisError as exc:
+            logger.warning("Deploy ledger refresh failed: %s", exc)
+
+    async def record(self, key: str, workflow: dict[str, Any]) -> None:
+        """Remember the workflow created for ``key``."""
+        try:
+            await self.client.set(
+                KEY_PREFIX + key,
+                dumps(workflow),
+                ex=self._ttl,
+            )
+        except redis.RedisError as exc:
+            logger.warning("Deploy ledger write failed: %s", exc)
+
+    async def mark_unknown(self, key: str, error: str) -> None:
+        """Remember that a create for ``key`` may have reached n8n."""
+        try:
+            await self.client.set(
+                KEY_PREFIX + key,
+                dumps({"unknown": True, "error": error}),
+                ex=self._ttl,
+            )
+        except redis.RedisError as exc:
+            logger.warning("Deploy ledger write failed: %s", exc)
+
+    async def release(self, key: str) -> None:
+        """Drop the pending marker after a failed deploy."""
+        name = KEY_PREFIX + key
+        try:
+            if await self.client.get(name) == _PENDING:
+                await self.client.delete(name)
+        except redis.RedisError as exc:
+            logger.warning("Deploy ledger release failed: %s", exc)
+
+
+class BulkDeployer:
+    """Create many workflows in n8n with bounded concurrency.
+
+    Identical blueprints in one batch are deployed once, and the ledger
+    turns replays of an earlier batch into ``existing`` results instead of
+    duplicates. Retryable failures (429, 5xx, connection refused) back off
+    exponentially with full jitter, honouring ``Retry-After``. A workflow
+    keeps its concurrency slot while it backs off, so a rate-limited n8n
+    sees less traffic rather than the same amount from other workflows.
+    """
+
+    def __init__(
+        self,
+        client: N8NClient | None = None,
+        ledger: DeployLedger | None = None,
+        concurrency: int | None = None,
+        max_attempts: int | None = None,
+        backoff: float | None = None,
+        max_backoff: float | None = None,
+    ) -> None:
+        self._client = client or N8NClient()
+        self.ledger = ledger or DeployLedger()
+        self._concurrency = (
+            concurrency or settings.n8n_bulk_deploy_concurrency
+        )
+        self._max_attempts = max_attempts or settings.n8n_deploy_max_attempts
+        self._backoff = (
+            settings.n8n_deploy_backoff_seconds if backoff is None else backoff
+        )
+        self._max_backoff = (
+            max_backoff or settings.n8n_deploy_max_backoff_seconds
+        )
+
+    async def deploy(
+        self,
+        blueprints: Sequence[WorkflowBlueprint],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield progress events as workflows are retried and finish.
+
+        Every event carries the blueprint's input ``index`` and a
+        ``status``: ``retrying`` (with ``attempt`` and ``delaySeconds``),
+        then one of ``created``, ``existing``, ``failed``, ``unknown``
+        (the create may have landed; it is not retried) or ``invalid``.
+        """
+        events: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        groups: dict[str, list[int]] = {}
+        firsts: dict[str, WorkflowBlueprint] = {}
+        for index, blueprint in enumerate(blueprints):
+            try:
+                ensure_valid(blueprint)
+            except BlueprintValidationError as exc:
+                metrics.BULK_DEPLOYS.labels("invalid").inc()
+                yield {
+                    "index": index,
+                    "status": "invalid",
+                    "diagnostics": [d.as_dict() for d in exc.diagnostics],
+                }
+                continue
+            key = idempotency_key(blueprint)
+            groups.setdefault(key, []).append(index)
+            firsts.setdefault(key, blueprint)
+
+        slots = asyncio.Semaphore(self._concurrency)
+        tasks = [
+            asyncio.create_task(
+                self._deploy_one(key, indexes, firsts[key], slots, events)
+            )
+            for key, indexes in groups.items()
+        ]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event = await events.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _deploy_one(
+        self,
+        key: str,
+        indexes: list[int],
+        blueprint: WorkflowBlueprint,
+        slots: asyncio.Semaphore,
+        events: asyncio.Queue[dict[str, Any] | None],
+    ) -> None:
+        try:
+            async with slots:
+                workflow = await self.ledger.acquire(key)
+                if workflow is not None and workflow.get("unknown"):
+                    outcome = {
+                        "status": "unknown",
+                        "idempotencyKey": key,
+                        "error": workflow["error"],
+                        "attempts": 0,
+                    }
+                elif workflow is not None:
+                    outcome = {
+                        "status": "existing",
+                        "idempotencyKey": key,
+                        "workflow": workflow,
+                        "attempts": 0,
+                    }
+                else:
+                    outcome = await self._create(
+                        key,
+                        indexes,
+                        blueprint,
+                        events,
+                    )
+            for position, index in enumerate(indexes):
+                event = dict(outcome, index=index)
+                if position and event["status"] == "created":
+                    event["status"] = "existing"  # same content, same batch
+                metrics.BULK_DEPLOYS.labels(event["status"]).inc()
+                await events.put(event)
+        finally:
+            await events.put(None)
+
+    async def _create(
+        self,
+        key: str,
+        indexes: list[int],
+        blueprint: WorkflowBlueprint,
+        events: asyncio.Queue[dict[str, Any] | None],
+    ) -> dict[str, Any]:
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    response = await self._client.deploy_workflow(blueprint)
+                    break
+                except N8NClientError as exc:
+                    if not exc.retryable or attempt >= self._max_attempts:
+                        raise
+                    delay = self._delay(attempt, exc.retry_after)
+                    metrics.N8N_RETRIES.inc()
+                    for index in indexes:
+                        await events.put(
+                            {
+                                "index": index,
+                                "status": "retrying",
+                                "attempt": attempt,
+                                "delaySeconds": round(delay, 3),
+                                "error": str(exc),
+                            }
+                        )
+                    await asyncio.sleep(delay)
+                    await self.ledger.refresh(key)
+        except Exception as exc:  # noqa: BLE001 - reported per workflow
+            if _maybe_sent(exc):
+                await self.ledger.mark_unknown(key, str(exc))
+                status = "unknown"
+            else:
+                await self.ledger.release(key)
+                status = "failed"
+            return {
+                "status": status,
+                "idempotencyKey": key,
+                "error": str(exc),
+                "attempts": attempt,
+            }
+        workflow = {
+            "id": response.get("id"),
+            "name": response.get("name"),
+            "url": response.get("url"),
+        }
+        await self.ledger.record(key, workflow)
+        return {
+            "status": "created",
+            "idempotencyKey": key,
+            "workflow": workflow,
+            "attempts": attempt,
+        }
+
+    def _delay(self, attempt: int, retry_after: float | None) -> float:
+        ceiling = min(self._max_backoff, self._backoff * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._max_backoff))
+        return delay
+
+    async def close(self) -> None:
+        """Release the ledger's Redis connection."""
+        await self.ledger.close()
+
+
+_deployer: BulkDeployer | None = None
+
+
+def get_bulk_deployer() -> BulkDeployer:
+    """Return the process-wide bulk deployer, creating it lazily."""
+    global _deployer
+    if _deployer is None:
+        _deployer = BulkDeployer()
+    return _deployer
+
+
+async def close_bulk_deployer() -> None:
+    """Close the deployer's connections; called from the app lifespan."""
+    global _deployer
+    if _deployer is not None:
+        await _deployer.close()
+        _deployer = None
@@ -1,18 +1,31 @@
-"""DeepSeek AI service for workflow generation using OpenAI-compatible API."""
+"""LLM blueprint generation shared by providers, and the DeepSeek one."""
 
+import asyncio
 import importlib
 import json
 import logging
 import os
 import re
 from datetime import datetime
-import time
 import random
+import time
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
+from pydantic import BaseModel, ValidationError
+
 from ..config import Settings
-from ..schemas.workflow import ChatRequest, WorkflowBlueprint
+from ..core import metrics, serialization
+from ..schemas.workflow import (
+    ChatRequest,
+    WorkflowBlueprint,
+    WorkflowEdge,
+    WorkflowNode,
+)
+from .blueprint_stream import BlueprintStreamParser
+from .hedging import Hedger
+from .prompt_budget import PromptBudget, current_prompt_usage
 
 try:  # pragma: no cover - optional dependency for best-effort repairs
     from json_repair import repair_json  # type: ignore[import-not-found]
@@ -105,7 +118,14 @@ JSON_ONLY_REMINDER = (
   "Respond with a single valid JSON object matching the WorkflowBlueprint "
   "schema. Do not include markdown fences, commentary, or trailing commas."
 )
+CONTINUE_PROMPT = (
+  "Your previous reply was cut off. Continue the JSON exactly after its "
+  "last character. Output only the remaining text; do not repeat anything "
+  "and do not add commentary."
+)
 MAX_RESPONSE_ATTEMPTS = 2
+MAX_CONTINUATIONS = 2
+MAX_COMPLETION_TOKENS = 6000
 
 DEFAULT_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 DATA_ROOT = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR)))
@@ -114,85 +134,105 @@ FAILURE_DUMP_DIR = DATA_ROOT / "deepseek_failures"
 logger = logging.getLogger(__name__)
 
 
-class DeepSeekService:
-    """Service for generating workflow blueprints using DeepSeek AI."""
+class ProviderAPIError(RuntimeError):
+    """Raised when a provider API call itself fails after retries."""
 
-    def __init__(self) -> None:
-        settings = Settings()
-        if not settings.deepseek_api_key:
-            raise RuntimeError("DeepSeek API key is not configured.")
 
-        try:
-            openai_module = importlib.import_module("openai")
-        except ImportError as exc:  # pragma: no cover - optional dependency
-            message = (
-                "The 'openai' package is required to call the DeepSeek API."
-                " Install it with `pip install openai`."
-            )
-            raise RuntimeError(message) from exc
+class TruncatedResponseError(RuntimeError):
+    """Raised when a model response stops before the JSON document ends."""
 
-        try:
-            client_factory: Any = getattr(openai_module, "OpenAI")
-        except AttributeError as exc:  # pragma: no cover - defensive guard
-            message = (
-                "The installed 'openai' package does not expose an OpenAI"
-                " client. Install a version that provides the OpenAI class."
-            )
-            raise RuntimeError(message) from exc
 
-        self.client = client_factory(
-            api_key=settings.deepseek_api_key,
-            base_url="https://api.deepseek.com",
-            timeout=180.0,  # 3 minutes timeout
-        )
-        self.model = settings.deepseek_model
+def _observe_upstream(
+    service: str,
+    operation: str,
+    outcome: str,
+    started: float,
+) -> None:
+    metrics.UPSTREAM_SECONDS.labels(service, operation, outcome).observe(
+        time.perf_counter() - started
+    )
+
+
+class BlueprintService:
+    """Generate workflow blueprints with an LLM provider.
+
+    Prompt assembly, retries, parsing, repair and truncation handling are
+    shared by every provider; a subclass passes its client to
+    :meth:`__init__` and implements :meth:`_complete` and
+    :meth:`_stream_completion`, the two calls that reach the API.
+    """
+
+    provider: str
+    label: str
+    _hedger: Hedger | None = None
+    _budget = PromptBudget()
+    _call_timer: Any
+    _retries: Any
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        max_concurrency: int,
+        settings: Settings,
+    ) -> None:
+        self.client = client
+        self.model = model
+        # Caps in-flight completions so slow generations cannot pile up
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._budget = PromptBudget.from_settings(settings)
 
     async def generate_workflow(
         self,
         payload: ChatRequest,
     ) -> WorkflowBlueprint:
-        """Generate a workflow blueprint from chat messages using DeepSeek."""
+        """Generate a workflow blueprint from chat messages."""
         if not payload.messages:
             raise RuntimeError("At least one chat message is required.")
 
-        # Build messages with system instruction
-        base_messages = [
-            {"role": "system", "content": SYSTEM_INSTRUCTION},
-            {"role": "system", "content": MEMORY_PRESET},
-        ]
-        base_messages.extend(
-            {"role": msg.role, "content": msg.content}
-            for msg in payload.messages
-        )
+        with metrics.PROMPT_ASSEMBLY.time():
+            base_messages = self._build_messages(payload)
 
         last_raw_text = ""
         last_error: Exception | None = None
 
         for attempt in range(1, MAX_RESPONSE_ATTEMPTS + 1):
-            attempt_messages = [dict(message) for message in base_messages]
+            attempt_messages = base_messages
             if attempt > 1:
-                attempt_messages[0]["content"] = (
-                    SYSTEM_INSTRUCTION + "\n\n" + JSON_ONLY_REMINDER
-                )
+                # Appended rather than edited into the system prompt so the
+                # retry still shares the cached prompt prefix.
+                attempt_messages = base_messages + [
+                    {"role": "system", "content": JSON_ONLY_REMINDER}
+                ]
 
-            raw_text = self._invoke_deepseek(attempt_messages)
-            last_raw_text = raw_text
-            clean_text = self._clean_json_text(raw_text)
+            async def request_blueprint(
+                messages: list[dict[str, str]] = attempt_messages,
+            ) -> WorkflowBlueprint:
+                nonlocal last_raw_text
+                raw_text = await self._invoke(messages)
+                last_raw_text = raw_text
+                try:
+                    return self._parse_blueprint(raw_text)
+                except TruncatedResponseError:
+                    return await self._complete_truncated(messages, raw_text)
 
             try:
-                payload_text = self._extract_json_payload(clean_text).strip()
-                data = self._parse_json_string(payload_text)
-                data = self._fix_missing_fields(data)
-                return WorkflowBlueprint.model_validate(data)
+                if self._hedger is not None:
+                    # A hedge only wins with a response that parses.
+                    return await self._hedger.run(request_blueprint)
+                return await request_blueprint()
+            except ProviderAPIError:
+                raise
             except (json.JSONDecodeError, RuntimeError) as exc:
                 last_error = exc
                 logger.warning(
-                    "DeepSeek response parsing failed on attempt %d/%d: %s. "
+                    "%s response parsing failed on attempt %d/%d: %s. "
                     "Snippet: %s",
+                    self.label,
                     attempt,
                     MAX_RESPONSE_ATTEMPTS,
                     exc,
-                    raw_text[:200].replace("\n", " "),
+                    last_raw_text[:200].replace("\n", " "),
                 )
 
         error_preview = last_raw_text[:300].replace("\n", " ")
@@ -200,47 +240,326 @@ class DeepSeekService:
             failure_path = self._persist_failure_payload(last_raw_text)
             if failure_path:
                 logger.info(
-                    "DeepSeek failure payload saved to %s",
+                    "%s failure payload saved to %s",
+                    self.label,
                     failure_path,
                 )
 
         error_msg = (
-            "DeepSeek returned invalid JSON after retries. "
+            f"{self.label} returned invalid JSON after retries. "
             f"Last error: {last_error}. Response preview: {error_preview}"
         )
         raise RuntimeError(error_msg) from last_error
 
-    def _invoke_deepseek(self, messages: list[dict[str, str]]) -> str:
-        """Call the DeepSeek API and return the raw text response.
+    async def stream_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> AsyncIterator[tuple[str, BaseModel]]:
+        """Stream a blueprint generation as it is produced.
+
+        Yields ``("node", WorkflowNode)`` and ``("edge", WorkflowEdge)``
+        pairs as soon as each object closes in the provider stream, then a
+        final ``("blueprint", WorkflowBlueprint)`` once the full document
+        has been validated. Streaming responses are not retried because
+        already emitted items cannot be taken back.
+        """
+        if not payload.messages:
+            raise RuntimeError("At least one chat message is required.")
+
+        with metrics.PROMPT_ASSEMBLY.time():
+            messages = self._build_messages(payload)
+
+        parser = BlueprintStreamParser()
+        chunks: list[str] = []
+        # Each delta holds at least one token, so the reader never waits
+        # on a slow client and gives its semaphore slot back on time.
+        deltas: asyncio.Queue[str | Exception | None] = asyncio.Queue(
+            MAX_COMPLETION_TOKENS
+        )
+        reader = asyncio.create_task(self._read_stream(messages, deltas))
+        try:
+            while (delta := await deltas.get()) is not None:
+                if isinstance(delta, Exception):
+                    raise ProviderAPIError(
+                        f"{self.label} streaming call failed: {delta}"
+                    ) from delta
+                chunks.append(delta)
+                for section, index, item in parser.feed(delta):
+                    event = self._coerce_stream_item(section, index, item)
+                    if event is not None:
+                        yield event
+        finally:
+            reader.cancel()
+
+        raw_text = "".join(chunks).strip()
+        try:
+            blueprint = self._parse_blueprint(raw_text)
+        except json.JSONDecodeError as exc:
+            if raw_text:
+                self._persist_failure_payload(raw_text)
+            raise RuntimeError(
+                f"{self.label} streamed invalid JSON: {exc}"
+            ) from exc
+        except TruncatedResponseError:
+            # Emitted nodes cannot be retracted, so finish with what
+            # arrived whole rather than asking for a continuation.
+            salvaged = self._salvage_blueprint(raw_text)
+            if salvaged is None:
+                metrics.TRUNCATIONS.labels("failed").inc()
+                raise
+            metrics.TRUNCATIONS.labels("salvaged").inc()
+            blueprint = salvaged
+        yield "blueprint", blueprint
+
+    async def _read_stream(
+        self,
+        messages: list[dict[str, str]],
+        deltas: asyncio.Queue[str | Exception | None],
+    ) -> None:
+        """Copy one streamed completion into ``deltas``, then ``None``.
+
+        The concurrency slot is held only while the provider is read. A
+        failure is queued in place of the end marker.
+        """
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                async for delta in self._stream_completion(messages):
+                    await deltas.put(delta)
+            except Exception as exc:  # pragma: no cover - network/SDK errors
+                _observe_upstream(self.provider, "stream", "error", started)
+                await deltas.put(exc)
+                return
+            _observe_upstream(self.provider, "stream", "success", started)
+        await deltas.put(None)
+
+    async def _complete_truncated(
+        self,
+        messages: list[dict[str, str]],
+        raw_text: str,
+    ) -> WorkflowBlueprint:
+        """Finish a cut-off response instead of regenerating it.
+
+        The partial output is trimmed back to its last whole step, edge
+        or top-level value and the model is asked to continue from there.
+        If that still does not produce a complete document, the longest
+        valid prefix is salvaged.
+        """
+        text = raw_text
+        for _ in range(MAX_CONTINUATIONS):
+            parser = self._scan_payload(text)
+            if parser is None or not parser.resume_point:
+                break
+            prefix = parser.text[:parser.resume_point]
+            continuation = await self._invoke(
+                [
+                    *messages,
+                    {"role": "assistant", "content": prefix},
+                    {"role": "user", "content": CONTINUE_PROMPT},
+                ],
+                json_mode=False,
+            )
+            text = prefix + continuation
+            try:
+                blueprint = self._parse_blueprint(text)
+            except TruncatedResponseError:
+                continue
+            metrics.TRUNCATIONS.labels("continued").inc()
+            return blueprint
+
+        blueprint = self._salvage_blueprint(text)
+        if blueprint is None:
+            metrics.TRUNCATIONS.labels("failed").inc()
+            raise TruncatedResponseError(
+                f"{self.label} response was truncated and could not be"
+                " completed."
+            )
+        metrics.TRUNCATIONS.labels("salvaged").inc()
+        logger.warning(
+            "Salvaged truncated blueprint %s with %d steps and %d edges",
+            blueprint.id,
+            len(blueprint.steps),
+            len(blueprint.edges),
+        )
+        return blueprint
+
+    def _scan_payload(self, raw_text: str) -> BlueprintStreamParser | None:
+        """Scan the JSON object in ``raw_text`` from its opening brace."""
+        clean_text = self._clean_json_text(raw_text)
+        start = clean_text.find("{")
+        if start == -1:
+            return None
+        parser = BlueprintStreamParser()
+        parser.feed(clean_text[start:])
+        return parser
+
+    def _salvage_blueprint(self, raw_text: str) -> WorkflowBlueprint | None:
+        """Keep the whole steps and edges of a truncated response.
+
+        The result is marked ``truncated`` so it is shown but not cached.
+        """
+        parser = self._scan_payload(raw_text)
+        salvaged = parser.salvage() if parser is not None else None
+        if salvaged is None:
+            return None
+        try:
+            data = serialization.loads(salvaged)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        data = self._fix_missing_fields(data)
+        data.setdefault("steps", [])
+        data.setdefault("credentials", [])
+        data.setdefault("estimatedTimeSavedMinutes", 0)
+        step_ids = {
+            step.get("id") for step in data["steps"] if isinstance(step, dict)
+        }
+        # Edges may point at steps that were cut off.
+        data["edges"] = [
+            edge
+            for edge in data.get("edges", [])
+            if isinstance(edge, dict)
+            and edge.get("source") in step_ids
+            and edge.get("target") in step_ids
+        ]
+        data["truncated"] = True
+        try:
+            return WorkflowBlueprint.model_validate(data)
+        except ValidationError:
+            return None
+
+    def _build_messages(self, payload: ChatRequest) -> list[dict[str, str]]:
+        """Prefix the chat history with the system and memory prompts.
+
+        The history is fitted to the prompt budget; the two prompts are
+        sent unchanged so the provider's prefix cache keeps hitting.
+        """
+        plan = self._budget.plan(
+            (
+                {"role": "system", "content": SYSTEM_INSTRUCTION},
+                {"role": "system", "content": MEMORY_PRESET},
+            ),
+            payload.messages,
+        )
+        metrics.PROMPT_TOKENS_ESTIMATED.inc(plan.estimated_tokens)
+        if plan.compacted_turns:
+            metrics.COMPACTED_TURNS.inc(plan.compacted_turns)
+        usage = current_prompt_usage()
+        if usage is not None:
+            usage.estimated_tokens += plan.estimated_tokens
+            usage.compacted_turns = max(
+                usage.compacted_turns,
+                plan.compacted_turns,
+            )
+        return plan.messages
+
+    def _record_usage(self, usage: Any) -> None:
+        """Account the provider-reported prompt usage of one completion."""
+        metrics.PROMPT_TOKENS_BILLED.inc(
+            getattr(usage, "prompt_tokens", 0) or 0
+        )
+        metrics.PROMPT_TOKENS_CACHE_HIT.inc(
+            getattr(usage, "prompt_cache_hit_tokens", 0) or 0
+        )
+        request_usage = current_prompt_usage()
+        if request_usage is not None:
+            request_usage.record_response(usage)
+
+    def _parse_blueprint(self, raw_text: str) -> WorkflowBlueprint:
+        """Turn a raw model response into a validated blueprint."""
+        try:
+            with metrics.CLEAN_JSON.time():
+                clean_text = self._clean_json_text(raw_text)
+            with metrics.EXTRACT_JSON.time():
+                payload_text = self._extract_json_payload(clean_text).strip()
+            data = self._parse_json_string(payload_text)
+            with metrics.VALIDATE.time():
+                data = self._fix_missing_fields(data)
+                return WorkflowBlueprint.model_validate(data)
+        except json.JSONDecodeError:
+            metrics.PARSE_FAILURES.labels("invalid_json").inc()
+            raise
+        except TruncatedResponseError:
+            metrics.PARSE_FAILURES.labels("truncated").inc()
+            raise
+        except ValidationError:
+            metrics.PARSE_FAILURES.labels("schema").inc()
+            raise
+        except RuntimeError:
+            metrics.PARSE_FAILURES.labels("malformed").inc()
+            raise
+
+    def _coerce_stream_item(
+        self,
+        section: str,
+        index: int,
+        item: dict[str, Any],
+    ) -> tuple[str, BaseModel] | None:
+        """Validate one streamed step or edge, skipping malformed items."""
+        if section == "steps" and "name" not in item:
+            item["name"] = (
+                item["id"].replace("-", " ").title()
+                if isinstance(item.get("id"), str)
+                else f"Step {index + 1}"
+            )
+        if section == "edges":
+            item.setdefault("id", f"edge{index + 1}")
+
+        try:
+            if section == "steps":
+                return "node", WorkflowNode.model_validate(item)
+            return "edge", WorkflowEdge.model_validate(item)
+        except ValidationError as exc:
+            logger.debug("Skipping malformed streamed %s: %s", section, exc)
+            return None
+
+    async def _invoke(
+        self,
+        messages: list[dict[str, str]],
+        json_mode: bool = True,
+    ) -> str:
+        """Call the provider API and return the raw text response.
 
         Retries transient network/HTTP errors with exponential backoff.
+        The concurrency slot is only held while a request is in flight so
+        callers sleeping through a backoff do not starve other requests.
+        ``json_mode=False`` lifts the JSON-object constraint, which a
+        continuation of a cut-off document cannot satisfy.
         """
+        with self._call_timer.time():
+            return await self._invoke_with_retries(
+                messages,
+                json_mode,
+            )
+
+    async def _invoke_with_retries(
+        self,
+        messages: list[dict[str, str]],
+        json_mode: bool = True,
+    ) -> str:
         max_attempts = 3
         base_delay = 1.0
 
         for attempt in range(1, max_attempts + 1):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.2,
-                    top_p=0.9,
-                    stream=False,
-                    # Allow larger payloads for complex blueprints.
-                    max_tokens=6000,
-                    stop=["```", "</json>"],
-                    response_format={"type": "json_object"},
-                )
-                if (
-                    not response.choices
-                    or not response.choices[0].message.content
-                ):
-                    raise RuntimeError("DeepSeek returned an empty response.")
-
-                raw_text = response.choices[0].message.content.strip()
-                if not raw_text:
-                    raise RuntimeError(
-                        "DeepSeek response content is empty after strip"
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        raw_text = await self._complete(messages, json_mode)
+                    except Exception:
+                        _observe_upstream(
+                            self.provider,
+                            "completion",
+                            "error",
+                            started,
+                        )
+                        raise
+                    _observe_upstream(
+                        self.provider,
+                        "completion",
+                        "success",
+                        started,
                     )
                 return raw_text
             except Exception as exc:  # pragma: no cover - network/SDK errors
@@ -250,26 +569,40 @@ class DeepSeekService:
                     delay = base_delay * (2 ** (attempt - 1))
                     jitter = random.uniform(0, 0.25 * delay)
                     sleep_time = delay + jitter
+                    self._retries.inc()
                     logger.warning(
-                        (
-                            "DeepSeek call failed (attempt %d/%d): %s. "
-                            "Retrying in %.2fs"
-                        ),
+                        "%s call failed (attempt %d/%d): %s. "
+                        "Retrying in %.2fs",
+                        self.label,
                         attempt,
                         max_attempts,
                         exc,
                         sleep_time,
                     )
-                    # This call is sync inside an async flow; time.sleep is ok
-                    time.sleep(sleep_time)
+                    await asyncio.sleep(sleep_time)
                     continue
-                error_msg = f"DeepSeek API call failed: {str(exc)}"
-                raise RuntimeError(error_msg) from exc
+                error_msg = f"{self.label} API call failed: {str(exc)}"
+                raise ProviderAPIError(error_msg) from exc
+
+    async def _complete(
+        self,
+        messages: list[dict[str, str]],
+        json_mode: bool,
+    ) -> str:
+        """Run one non-streaming completion and return its text."""
+        raise NotImplementedError
+
+    def _stream_completion(
+        self,
+        messages: list[dict[str, str]],
+    ) -> AsyncIterator[str]:
+        """Yield the text deltas of one streamed completion."""
+        raise NotImplementedError
 
     def _extract_json_payload(self, raw_text: str) -> str:
         """Extract the JSON payload from mixed text responses."""
         if not raw_text:
-            raise RuntimeError("DeepSeek response payload is empty.")
+            raise RuntimeError(f"{self.label} response payload is empty.")
 
         # Fast path: looks like pure JSON
         trimmed = raw_text.strip()
@@ -281,7 +614,7 @@ class DeepSeekService:
         end = trimmed.rfind("}")
         if start == -1 or end == -1 or end <= start:
             raise RuntimeError(
-                "DeepSeek response did not contain a JSON object."
+                f"{self.label} response did not contain a JSON object."
             )
 
         return trimmed[start:end + 1]
@@ -341,34 +674,44 @@ class DeepSeekService:
         return text.strip()
 
     def _looks_truncated(self, payload_text: str) -> bool:
-        """Detect obviously truncated JSON payloads."""
+        """Detect JSON payloads that stop before the root object closes.
+
+        Braces inside strings, such as ``jsCode`` bodies, are ignored.
+        """
         stripped = payload_text.strip()
-        brace_mismatch = stripped.count("{") != stripped.count("}")
-        return not stripped.endswith("}") or brace_mismatch
+        if not stripped.endswith("}"):
+            return True
+        parser = BlueprintStreamParser()
+        parser.feed(stripped)
+        return not parser.complete
 
     def _parse_json_string(self, payload_text: str) -> dict:
         """Parse JSON with optional repair and truncation guard."""
         if self._looks_truncated(payload_text):
-            raise RuntimeError("DeepSeek response appears truncated.")
+            raise TruncatedResponseError(
+                f"{self.label} response appears truncated."
+            )
 
         try:
-            return json.loads(payload_text)
+            with metrics.PARSE_JSON.time():
+                return serialization.loads(payload_text)
         except json.JSONDecodeError as exc:
             if not repair_json:
                 raise
 
             try:
-                repaired = repair_json(payload_text)
+                with metrics.REPAIR_JSON.time():
+                    repaired = repair_json(payload_text)
             except (ValueError, json.JSONDecodeError) as repair_exc:
                 raise exc from repair_exc
 
             if self._looks_truncated(repaired):
-                raise RuntimeError(
-                    "DeepSeek response appears truncated after repair."
+                raise TruncatedResponseError(
+                    f"{self.label} response appears truncated after repair."
                 ) from exc
 
             try:
-                return json.loads(repaired)
+                return serialization.loads(repaired)
             except json.JSONDecodeError as repaired_exc:
                 raise exc from repaired_exc
 
@@ -381,5 +724,105 @@ class DeepSeekService:
             file_path.write_text(raw_text, encoding="utf-8")
             return file_path
         except OSError as exc:  # pragma: no cover - best effort logging
-            logger.debug("Failed to persist DeepSeek payload: %s", exc)
+            logger.debug("Failed to persist %s payload: %s", self.label, exc)
             return None
+
+
+class DeepSeekService(BlueprintService):
+    """Generate workflow blueprints with DeepSeek's OpenAI-compatible API."""
+
+    provider = "deepseek"
+    label = "DeepSeek"
+    _call_timer = metrics.DEEPSEEK_CALL
+    _retries = metrics.DEEPSEEK_RETRIES
+
+    def __init__(self) -> None:
+        settings = Settings()
+        if not settings.deepseek_api_key:
+            raise RuntimeError("DeepSeek API key is not configured.")
+
+        try:
+            openai_module = importlib.import_module("openai")
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            message = (
+                "The 'openai' package is required to call the DeepSeek API."
+                " Install it with `pip install openai`."
+            )
+            raise RuntimeError(message) from exc
+
+        try:
+            client_factory: Any = getattr(openai_module, "AsyncOpenAI")
+        except AttributeError as exc:  # pragma: no cover - defensive guard
+            message = (
+                "The installed 'openai' package does not expose an"
+                " AsyncOpenAI client. Install a version that provides it."
+            )
+            raise RuntimeError(message) from exc
+
+        super().__init__(
+            client_factory(
+                api_key=settings.deepseek_api_key,
+                base_url="https://api.deepseek.com",
+                timeout=180.0,  # 3 minutes timeout
+            ),
+            settings.deepseek_model,
+            settings.deepseek_max_concurrency,
+            settings,
+        )
+        if settings.deepseek_hedge_enabled:
+            self._hedger = Hedger.from_settings(settings)
+
+    async def _complete(
+        self,
+        messages: list[dict[str, str]],
+        json_mode: bool,
+    ) -> str:
+        """Run one non-streaming completion and return its text."""
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.2,
+            top_p=0.9,
+            stream=False,
+            # Allow larger payloads for complex blueprints.
+            max_tokens=MAX_COMPLETION_TOKENS,
+            stop=["```", "</json>"],
+            response_format={"type": "json_object" if json_mode else "text"},
+        )
+        self._record_usage(getattr(response, "usage", None))
+        if not response.choices or not response.choices[0].message.content:
+            raise RuntimeError("DeepSeek returned an empty response.")
+
+        raw_text = response.choices[0].message.content.strip()
+        if not raw_text:
+            raise RuntimeError(
+                "DeepSeek response content is empty after strip"
+            )
+        return raw_text
+
+    async def _stream_completion(
+        self,
+        messages: list[dict[str, str]],
+    ) -> AsyncIterator[str]:
+        """Yield the text deltas of one streamed completion."""
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.2,
+            top_p=0.9,
+            stream=True,
+            max_tokens=MAX_COMPLETION_TOKENS,
+            stop=["```", "</json>"],
+            response_format={"type": "json_object"},
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            # With include_usage the last chunk carries the totals.
+            usage = getattr(chunk, "usage", None)
+            if usage is not None:
+                self._record_usage(usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
@@ -0,0 +1,329 @@
+"""Buffered bulk ingestion of execution records into Postgres."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import date, datetime, timedelta, timezone
+
+from psycopg import errors as pg_errors
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from ..config import settings
+from ..core.database import engine
+from ..models.execution import Execution
+from ..schemas.execution import ExecutionRecord
+
+logger = logging.getLogger(__name__)
+
+Writer = Callable[[Sequence[ExecutionRecord]], Awaitable[None]]
+
+_COPY_SQL = (
+    "COPY executions (id, workflow_id, status, metrics, created_at) "
+    "FROM STDIN"
+)
+_STOP = object()
+
+_ingestor: ExecutionIngestor | None = None
+
+
+class IngestBacklogError(RuntimeError):
+    """Raised when the buffer stays full because the database is lagging."""
+
+
+# --------------------------- partitions ------------------------------------
+
+def partition_name(day: date) -> str:
+    """Return the name of the daily partition holding ``day``."""
+    return f"executions_{day:%Y%m%d}"
+
+
+async def ensure_partitions(days: Sequence[date]) -> None:
+    """Create the daily partitions for ``days`` if they are missing."""
+    async with engine.begin() as conn:
+        for day in sorted(set(days)):
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(day)} "
+                    "PARTITION OF executions FOR VALUES "
+                    f"FROM ('{day.isoformat()} 00:00+00') "
+                    f"TO ('{day + timedelta(days=1)} 00:00+00')"
+                )
+            )
+
+
+async def drop_expired_partitions(retention_days: int) -> list[str]:
+    """Drop whole daily partitions older than the retention window.
+
+    Dropping a partition is a metadata operation, unlike a ``DELETE``
+    that has to visit and vacuum every expired row.
+    """
+    cutoff = partition_name(
+        datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+    )
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = 'executions'"
+            )
+        )
+        expired = sorted(name for (name,) in result if name < cutoff)
+        for name in expired:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    return expired
+
+
+# --------------------------- writers ---------------------------------------
+
+async def copy_executions(records: Sequence[ExecutionRecord]) -> None:
+    """Bulk load ``records`` with COPY, upserting if any id already exists.
+
+    COPY is the fastest path but aborts on duplicates, which happen when
+    n8n redelivers a run; that batch is then written with a multi-row
+    ``INSERT ... ON CONFLICT DO NOTHING`` instead.
+    """
+    try:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            try:
+                async with driver.cursor() as cursor:
+                    async with cursor.copy(_COPY_SQL) as copy:
+                        for record in records:
+                            await copy.write_row(_copy_row(record))
+                await driver.commit()
+            except BaseException:
+                await driver.rollback()
+                raise
+    except pg_errors.UniqueViolation:
+        await insert_executions(records)
+
+
+async def insert_executions(records: Sequence[ExecutionRecord]) -> None:
+    """Write ``records`` with batched multi-row inserts, skipping dupes."""
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Execution).on_conflict_do_nothing(),
+            [record.model_dump() for record in records],
+        )
+
+
+def _day(record: ExecutionRecord) -> date:
+    return record.created_at.astimezone(timezone.utc).date()
+
+
+def _copy_row(record: ExecutionRecord) -> tuple[object, ...]:
+    metrics = None if record.metrics is None else json.dumps(record.metrics)
+    return (
+        record.id,
+        record.workflow_id,
+        record.status,
+        metrics,
+        record.created_at,
+    )
+
+
+# --------------------------- ingestor --------------------------------------
+
+class ExecutionIngestor:
+    """Buffer execution records and flush them in bulk.
+
+    Records go into a bounded queue. A single consumer task drains it in
+    batches of up to ``batch_size`` records, or whatever arrived within
+    ``flush_interval`` seconds of the first one. While a flush is slow or
+    retrying, the queue fills up and :meth:`submit` waits, which pushes
+    the backpressure to the producers instead of growing memory.
+
+    Records older than the retention window are counted in ``expired``
+    and skipped: their partition would be dropped as soon as it was
+    created, so the insert could only fail.
+    """
+
+    def __init__(
+        self,
+        writer: Writer | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        max_queue: int | None = None,
+        max_attempts: int = 5,
+        retry_backoff: float = 0.5,
+        manage_partitions: bool = True,
+    ) -> None:
+        self._writer = writer or copy_executions
+        self._batch_size = batch_size or settings.execution_ingest_batch_size
+        self._flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.execution_ingest_flush_interval_seconds
+        )
+        self._queue: asyncio.Queue[object] = asyncio.Queue(
+            max_queue or settings.execution_ingest_max_queue
+        )
+        self._max_attempts = max_attempts
+        self._retry_backoff = retry_backoff
+        self._manage_partitions = manage_partitions
+        self._known_days: set[date] = set()
+        self._task: asyncio.Task[None] | None = None
+        self.flushed = 0
+        self.dropped = 0
+        self.expired = 0
+
+    @property
+    def pending(self) -> int:
+        """Return how many records are waiting to be flushed."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything already queued, then stop the task."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(
+        self,
+        records: Sequence[ExecutionRecord],
+        timeout: float | None = None,
+    ) -> None:
+        """Queue ``records``, waiting while the buffer is full.
+
+        Raises :class:`IngestBacklogError` if space does not free up
+        within ``timeout`` seconds. Records queued before the timeout are
+        kept; re-submitting them is safe because a record carries its own
+        ``(id, created_at)`` key and rows already stored are skipped.
+        """
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        for record in records:
+            try:
+                queue.put_nowait(record)
+                continue
+            except asyncio.QueueFull:
+                pass
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                await asyncio.wait_for(queue.put(record), remaining)
+            except asyncio.TimeoutError as exc:
+                raise IngestBacklogError(
+                    "Execution ingestion is backlogged; retry later"
+                ) from exc
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            first = await queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[ExecutionRecord]) -> None:
+        batch = self._skip_expired(batch)
+        if not batch:
+            return
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                if self._manage_partitions:
+                    await self._ensure_partitions(batch)
+                await self._writer(batch)
+                self.flushed += len(batch)
+                return
+            except Exception:  # noqa: BLE001 - keep the consumer alive
+                logger.warning(
+                    "Execution flush failed (attempt %s/%s)",
+                    attempt,
+                    self._max_attempts,
+                    exc_info=True,
+                )
+                if attempt < self._max_attempts:
+                    await asyncio.sleep(
+                        min(self._retry_backoff * 2 ** (attempt - 1), 30.0)
+                    )
+        self.dropped += len(batch)
+        logger.error(
+            "Dropping %s execution records after %s attempts",
+            len(batch),
+            self._max_attempts,
+        )
+
+    def _skip_expired(
+        self,
+        batch: list[ExecutionRecord],
+    ) -> list[ExecutionRecord]:
+        cutoff = datetime.now(timezone.utc).date() - timedelta(
+            days=settings.execution_retention_days
+        )
+        kept = [record for record in batch if _day(record) >= cutoff]
+        expired = len(batch) - len(kept)
+        if expired:
+            self.expired += expired
+            logger.warning(
+                "Skipping %s execution records older than %s days",
+                expired,
+                settings.execution_retention_days,
+            )
+        return kept
+
+    async def _ensure_partitions(self, batch: list[ExecutionRecord]) -> None:
+        days = {_day(record) for record in batch}
+        missing = days - self._known_days
+        if not missing:
+            return
+        await ensure_partitions(sorted(missing))
+        self._known_days |= missing
+        try:
+            dropped = await drop_expired_partitions(
+                settings.execution_retention_days
+            )
+        except Exception:  # noqa: BLE001 - retention is best effort
+            logger.warning("Dropping expired partitions failed", exc_info=True)
+        else:
+            if dropped:
+                logger.info("Dropped execution partitions: %s", dropped)
+
+
+def get_execution_ingestor() -> ExecutionIngestor:
+    """Return the process-wide ingestor, creating it lazily."""
+    global _ingestor
+    if _ingestor is None:
+        _ingestor = ExecutionIngestor()
+    return _ingestor
+
+
+async def close_execution_ingestor() -> None:
+    """Flush and stop the ingestor; called from the app lifespan."""
+    global _ingestor
+    if _ingestor is not None:
+        await _ingestor.stop()
+        _ingestor = None
@@ -0,0 +1,132 @@
+"""Gemini AI service for workflow generation via google-generativeai."""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+from ..config import Settings
+from ..core import metrics
+from .deepseek_service import MAX_COMPLETION_TOKENS, BlueprintService
+
+# Gemini names the assistant turn "model".
+_ROLES = {"user": "user", "assistant": "model"}
+
+
+def to_gemini_request(
+    messages: list[dict[str, str]],
+) -> tuple[str | None, list[dict[str, Any]]]:
+    """Split chat messages into a system instruction and Gemini contents.
+
+    Gemini takes system prompts separately, so every system message is
+    joined, in order, into one instruction.
+    """
+    system = [m["content"] for m in messages if m["role"] == "system"]
+    contents = [
+        {"role": _ROLES.get(m["role"], "user"), "parts": [m["content"]]}
+        for m in messages
+        if m["role"] != "system"
+    ]
+    return "\n\n".join(system) or None, contents
+
+
+def _usage(response: Any) -> SimpleNamespace | None:
+    """Map Gemini usage metadata onto the OpenAI-style fields we record."""
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is None:
+        return None
+    return SimpleNamespace(
+        prompt_tokens=metadata.prompt_token_count,
+        prompt_cache_hit_tokens=metadata.cached_content_token_count,
+    )
+
+
+class GeminiService(BlueprintService):
+    """Generate workflow blueprints with Gemini."""
+
+    provider = "gemini"
+    label = "Gemini"
+    _call_timer = metrics.GEMINI_CALL
+    _retries = metrics.GEMINI_RETRIES
+
+    def __init__(self) -> None:
+        settings = Settings()
+        if not settings.gemini_api_key:
+            raise RuntimeError("Gemini API key is not configured.")
+
+        try:
+            genai = importlib.import_module("google.generativeai")
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            message = (
+                "The 'google-generativeai' package is required to call"
+                " Gemini. Install it with `pip install google-generativeai`."
+            )
+            raise RuntimeError(message) from exc
+
+        genai.configure(api_key=settings.gemini_api_key)
+        super().__init__(
+            genai,
+            settings.gemini_model,
+            settings.gemini_max_concurrency,
+            settings,
+        )
+
+    def _generate(
+        self,
+        messages: list[dict[str, str]],
+        json_mode: bool,
+        stream: bool,
+    ) -> Any:
+        system, contents = to_gemini_request(messages)
+        model = self.client.GenerativeModel(
+            self.model,
+            system_instruction=system,
+        )
+        return model.generate_content_async(
+            contents,
+            generation_config={
+                "temperature": 0.2,
+                "top_p": 0.9,
+                "max_output_tokens": MAX_COMPLETION_TOKENS,
+                "stop_sequences": ["```", "</json>"],
+                "response_mime_type": (
+                    "application/json" if json_mode else "text/plain"
+                ),
+            },
+            stream=stream,
+        )
+
+    async def _complete(
+        self,
+        messages: list[dict[str, str]],
+        json_mode: bool,
+    ) -> str:
+        response = await self._generate(messages, json_mode, stream=False)
+        self._record_usage(_usage(response))
+        try:
+            raw_text = response.text.strip()
+        except ValueError as exc:
+            # Blocked or empty candidates have no text parts.
+            raise RuntimeError("Gemini returned an empty response.") from exc
+        if not raw_text:
+            raise RuntimeError("Gemini returned an empty response.")
+        return raw_text
+
+    async def _stream_completion(
+        self,
+        messages: list[dict[str, str]],
+    ) -> AsyncIterator[str]:
+        response = await self._generate(messages, True, stream=True)
+        usage = None
+        async for chunk in response:
+            usage = _usage(chunk) or usage
+            try:
+                delta = chunk.text
+            except ValueError:
+                continue
+            if delta:
+                yield delta
+        # Every chunk repeats the running totals; record the last once.
+        self._record_usage(usage)
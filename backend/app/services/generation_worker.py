@@ -0,0 +1,252 @@
+"""Worker that consumes generation jobs from the Redis queue."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import logging
+import os
+import socket
+import uuid
+
+import httpx
+
+from ..config import settings
+from .job_queue import ClaimedJob, GenerationJobQueue
+from .llm_router import GenerationService
+
+logger = logging.getLogger(__name__)
+
+# Redirects that keep the method and body; each target is checked again.
+_CALLBACK_REDIRECTS = (307, 308)
+_MAX_CALLBACK_REDIRECTS = 3
+
+
+def default_consumer_name() -> str:
+    """Name unique to this process, stable for its lifetime."""
+    suffix = uuid.uuid4().hex[:6]
+    return f"{socket.gethostname()}-{os.getpid()}-{suffix}"
+
+
+async def check_callback_url(url: str) -> str | None:
+    """Return the address to deliver ``url``'s callback to.
+
+    Raises ``ValueError`` unless ``url`` may receive job callbacks. Hosts
+    listed in ``job_callback_allowed_hosts`` are trusted and resolved as
+    usual when connecting (``None``); any other host must resolve to
+    public addresses only, so a submitter cannot point the worker at
+    loopback, private or link-local services, and the first of them is
+    returned to connect to.
+    """
+    parsed = httpx.URL(url)
+    if parsed.scheme not in ("http", "https"):
+        raise ValueError(f"unsupported callback scheme {parsed.scheme!r}")
+    host = parsed.host
+    if host in settings.job_callback_allowed_hosts:
+        return None
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        resolved = await asyncio.get_running_loop().getaddrinfo(
+            host,
+            port,
+            type=socket.SOCK_STREAM,
+        )
+    except socket.gaierror as exc:
+        raise ValueError(f"cannot resolve {host!r}: {exc}") from exc
+    addresses = [ipaddress.ip_address(info[4][0]) for info in resolved]
+    for address in addresses:
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"{host!r} resolves to {address}, not public")
+    if not addresses:
+        raise ValueError(f"cannot resolve {host!r}")
+    return str(addresses[0])
+
+
+class PinnedTransport(httpx.AsyncBaseTransport):
+    """Connect to a checked address while keeping the URL's host name.
+
+    The Host header, the TLS server name and the certificate check
+    still use the host name, so DNS is not asked again between the
+    address check and the connection.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        inner: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._address = address
+        self._inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(
+        self,
+        request: httpx.Request,
+    ) -> httpx.Response:
+        pinned = httpx.Request(
+            request.method,
+            request.url.copy_with(host=self._address),
+            headers=request.headers,
+            stream=request.stream,
+            extensions={
+                **request.extensions,
+                "sni_hostname": request.url.host,
+            },
+        )
+        return await self._inner.handle_async_request(pinned)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _callback_transport() -> httpx.AsyncBaseTransport:
+    """Transport callbacks are sent through; replaced in tests."""
+    return httpx.AsyncHTTPTransport()
+
+
+class GenerationWorker:
+    """Run up to ``concurrency`` generation jobs at once.
+
+    Leases of running jobs are renewed every third of the visibility
+    timeout, so only a worker that died or hung loses its jobs to another
+    worker. Upstream API failures and unparseable responses are retried;
+    any other error dead-letters the job immediately.
+    """
+
+    def __init__(
+        self,
+        queue: GenerationJobQueue,
+        service: GenerationService,
+        concurrency: int | None = None,
+        consumer: str | None = None,
+    ) -> None:
+        self.queue = queue
+        self.service = service
+        self.concurrency = max(
+            1,
+            concurrency or settings.job_worker_concurrency,
+        )
+        self.consumer = consumer or default_consumer_name()
+        self._running: dict[asyncio.Task[None], ClaimedJob] = {}
+
+    async def run(self, stop: asyncio.Event, block_ms: int = 5000) -> None:
+        """Claim and process jobs until ``stop`` is set, then drain."""
+        heartbeat = asyncio.create_task(self._heartbeat())
+        logger.info(
+            "Generation worker %s started (concurrency %d)",
+            self.consumer,
+            self.concurrency,
+        )
+        try:
+            while not stop.is_set():
+                free = self.concurrency - len(self._running)
+                if free <= 0:
+                    await asyncio.wait(
+                        self._running,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    continue
+                try:
+                    jobs = await self.queue.claim(
+                        self.consumer,
+                        free,
+                        block_ms=block_ms,
+                    )
+                except Exception as exc:  # noqa: BLE001 - keep consuming
+                    logger.warning("Claiming jobs failed: %s", exc)
+                    await asyncio.sleep(1.0)
+                    continue
+                for job in jobs:
+                    task = asyncio.create_task(self._process(job))
+                    self._running[task] = job
+                    task.add_done_callback(self._running.pop)
+            if self._running:
+                await asyncio.wait(self._running)
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def _process(self, job: ClaimedJob) -> None:
+        try:
+            await self._generate(job)
+        except Exception as exc:  # noqa: BLE001 - the lease will lapse
+            # Redis failed mid-job; another worker redelivers it later.
+            logger.warning("Settling job %s failed: %s", job.job_id, exc)
+
+    async def _generate(self, job: ClaimedJob) -> None:
+        try:
+            blueprint = await self.service.generate_workflow(job.request)
+        except RuntimeError as exc:
+            # API errors and unparseable responses are worth another try.
+            logger.warning(
+                "Generation job %s failed on attempt %d: %s",
+                job.job_id,
+                job.attempts,
+                exc,
+            )
+            await self.queue.fail(job, str(exc), retry=True)
+            return
+        except Exception as exc:  # noqa: BLE001 - dead-letter, keep running
+            logger.exception("Generation job %s crashed", job.job_id)
+            await self.queue.fail(job, str(exc), retry=False)
+            return
+        await self.queue.complete(job, blueprint)
+        if job.callback_url:
+            await self._deliver(job)
+
+    async def _deliver(self, job: ClaimedJob) -> None:
+        """POST the finished job to its callback URL, best effort."""
+        state = await self.queue.get(job.job_id)
+        if state is None or job.callback_url is None:
+            return
+        content = state.model_dump_json(by_alias=True)
+        url = job.callback_url
+        try:
+            for _ in range(_MAX_CALLBACK_REDIRECTS + 1):
+                response = await self._post_callback(url, content)
+                if response.status_code not in _CALLBACK_REDIRECTS:
+                    break
+                url = str(response.url.join(response.headers["location"]))
+            response.raise_for_status()
+        except ValueError as exc:
+            logger.warning(
+                "Refusing callback for job %s to %s: %s",
+                job.job_id,
+                url,
+                exc,
+            )
+        except (httpx.HTTPError, KeyError) as exc:
+            # The result stays pollable, so a failed callback is not retried.
+            logger.warning(
+                "Callback for job %s to %s failed: %s",
+                job.job_id,
+                url,
+                exc,
+            )
+
+    async def _post_callback(self, url: str, content: str) -> httpx.Response:
+        # Every hop is checked and then sent to the address that passed.
+        address = await check_callback_url(url)
+        transport = _callback_transport()
+        if address is not None:
+            transport = PinnedTransport(address, transport)
+        async with httpx.AsyncClient(
+            transport=transport,
+            timeout=settings.job_callback_timeout_seconds,
+        ) as client:
+            return await client.post(
+                url,
+                content=content,
+                headers={"Content-Type": "application/json"},
+            )
+
+    async def _heartbeat(self) -> None:
+        interval = self.queue.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            message_ids = [job.message_id for job in self._running.values()]
+            try:
+                await self.queue.extend(self.consumer, message_ids)
+            except Exception as exc:  # noqa: BLE001 - retry next beat
+                logger.warning("Renewing job leases failed: %s", exc)
@@ -0,0 +1,163 @@
+"""Latency-driven request hedging with a bounded hedge budget."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from ..config import Settings
+from ..core import metrics
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with percentile lookups."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._recent: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+        self._min_samples = min_samples
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency, evicting the oldest once the window is full."""
+        if len(self._recent) == self._recent.maxlen:
+            oldest = self._recent[0]
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._recent.append(seconds)
+        insort(self._sorted, seconds)
+
+    def percentile(self, quantile: float) -> float | None:
+        """Return the ``quantile`` latency, or ``None`` until warmed up."""
+        count = len(self._sorted)
+        if count < self._min_samples:
+            return None
+        return self._sorted[min(count - 1, int(quantile * count))]
+
+
+class HedgeBudget:
+    """Token bucket allowing hedges on at most ``percent`` of requests.
+
+    Every request earns ``percent / 100`` of a token and every hedge
+    spends one, so hedges stay bounded even while the upstream is slow
+    for everyone. ``burst`` caps how many tokens can be saved up.
+    """
+
+    def __init__(self, percent: float, burst: float = 5.0) -> None:
+        self._earn = max(0.0, percent) / 100.0
+        self._burst = max(1.0, burst)
+        self._tokens = 0.0
+
+    def record_request(self) -> None:
+        """Credit the budget for one primary request."""
+        self._tokens = min(self._burst, self._tokens + self._earn)
+
+    def try_spend(self) -> bool:
+        """Take one token for a hedge if the budget allows it."""
+        # The epsilon absorbs float drift from summing fractional credits.
+        if self._tokens < 1.0 - 1e-9:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+class Hedger:
+    """Race a backup request against a slow primary.
+
+    The primary starts immediately. If it has not produced a result after
+    the learned ``percentile`` latency (or ``initial_delay`` until enough
+    samples exist), and the budget allows it, a second identical request
+    is fired. The first leg to return a result wins and the other is
+    cancelled; a leg that raises simply drops out of the race.
+
+    Only primaries are timed. A primary that loses to its hedge is
+    recorded as censored at its elapsed time, a lower bound on what it
+    would have taken, so the learned delay is not biased towards the
+    fast legs that happened to win.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget_percent: float = 5.0,
+        min_delay: float = 1.0,
+        initial_delay: float = 30.0,
+        tracker: LatencyTracker | None = None,
+        budget: HedgeBudget | None = None,
+    ) -> None:
+        self.tracker = tracker or LatencyTracker()
+        self.budget = budget or HedgeBudget(budget_percent)
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._initial_delay = initial_delay
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> Hedger:
+        """Build a hedger from the ``deepseek_hedge_*`` settings."""
+        return cls(
+            percentile=settings.deepseek_hedge_percentile,
+            budget_percent=settings.deepseek_hedge_budget_percent,
+            min_delay=settings.deepseek_hedge_min_delay_seconds,
+            initial_delay=settings.deepseek_hedge_initial_delay_seconds,
+        )
+
+    def delay(self) -> float:
+        """Return how long to wait before hedging the current request."""
+        learned = self.tracker.percentile(self._percentile)
+        if learned is None:
+            return self._initial_delay
+        return max(self._min_delay, learned)
+
+    async def run(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """Return the first successful result of up to two legs."""
+        loop = asyncio.get_running_loop()
+        self.budget.record_request()
+        primary = asyncio.ensure_future(factory())
+        started = loop.time()
+        pending = {primary}
+        timeout: float | None = self.delay()
+        last_error: BaseException | None = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # The delay elapsed with the primary still running.
+                    timeout = None
+                    if self.budget.try_spend():
+                        metrics.HEDGES.labels("launched").inc()
+                        pending.add(asyncio.ensure_future(factory()))
+                    else:
+                        metrics.HEDGES.labels("budget_denied").inc()
+                    continue
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        last_error = error
+                        continue
+                    if task is primary:
+                        self.tracker.observe(loop.time() - started)
+                    else:
+                        metrics.HEDGES.labels("won").inc()
+                        if not primary.done():
+                            # Censored: it is cancelled below.
+                            self.tracker.observe(loop.time() - started)
+                    return task.result()
+            if last_error is None:  # pragma: no cover - defensive guard
+                raise RuntimeError("Hedged call finished without a result")
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,398 @@
+"""Redis Streams queue for asynchronous blueprint generation jobs."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import redis
+import redis.asyncio
+
+from ..config import settings
+from ..core import metrics
+from ..core.cache import get_async_redis_client
+from ..schemas.job import GenerationJob
+from ..schemas.workflow import ChatRequest, WorkflowBlueprint
+
+STREAM_KEY = "flowforge:jobs"
+DEAD_LETTER_KEY = "flowforge:jobs:dead"
+# Job ids waiting out their retry backoff, scored by due time in ms.
+RETRY_KEY = "flowforge:jobs:retry"
+JOB_KEY_PREFIX = "flowforge:job:"
+GROUP = "flowforge-workers"
+_DEAD_LETTER_MAXLEN = 10_000
+
+# Moves up to ARGV[2] jobs due by ARGV[1] from the retry set (KEYS[1])
+# back onto the stream (KEYS[2]). A script runs atomically, so a job
+# is never out of the set without being on the stream.
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1],
+    "LIMIT", 0, ARGV[2])
+for _, job in ipairs(due) do
+    redis.call("ZREM", KEYS[1], job)
+    redis.call("XADD", KEYS[2], "*", "job", job)
+end
+return #due
+"""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClaimedJob:
+    """Job leased to one worker until it is acked or the lease lapses."""
+    job_id: str
+    message_id: str
+    attempts: int
+    request: ChatRequest
+    callback_url: str | None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _text(value: bytes | str) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class GenerationJobQueue:
+    """At-least-once job queue on a Redis Stream consumer group.
+
+    Each job is a hash holding the request, status and result, plus a
+    stream entry that carries only the job id. Workers read the stream
+    through one consumer group, so adding workers adds throughput without
+    coordination. A claimed entry stays pending until acked; if its worker
+    stops renewing the lease for ``visibility_timeout`` seconds, the next
+    claim by any worker takes it over. Jobs that fail or are redelivered
+    more than ``max_attempts`` times move to a dead-letter stream.
+
+    A retried job waits out an exponential backoff with equal jitter,
+    between half and all of ``retry_backoff * 2 ** (attempts - 1)``
+    capped at ``max_retry_backoff``, in a sorted set of due times;
+    claims move due jobs back onto the stream before reading it.
+
+    Job hashes expire ``result_ttl`` seconds after submission, and again
+    after they finish, so abandoned jobs do not accumulate.
+    """
+
+    def __init__(
+        self,
+        client: redis.asyncio.Redis | None = None,
+        visibility_timeout: float | None = None,
+        max_attempts: int | None = None,
+        result_ttl: int | None = None,
+        retry_backoff: float | None = None,
+        max_retry_backoff: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._client = client
+        self.visibility_timeout = (
+            visibility_timeout or settings.job_visibility_timeout_seconds
+        )
+        self._max_attempts = max_attempts or settings.job_max_attempts
+        self._result_ttl = result_ttl or settings.job_result_ttl_seconds
+        self._retry_backoff = (
+            settings.job_retry_backoff_seconds
+            if retry_backoff is None
+            else retry_backoff
+        )
+        self._max_retry_backoff = (
+            max_retry_backoff or settings.job_retry_max_backoff_seconds
+        )
+        self._clock = clock
+        self._group_ready = False
+
+    @property
+    def client(self) -> redis.asyncio.Redis:
+        """Return the Redis connection, creating it on first use."""
+        if self._client is None:
+            self._client = get_async_redis_client()
+        return self._client
+
+    async def close(self) -> None:
+        """Release the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def ensure_group(self) -> None:
+        """Create the stream and consumer group if they do not exist."""
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(
+                STREAM_KEY,
+                GROUP,
+                id="0",
+                mkstream=True,
+            )
+        except redis.ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    # --------------------------- producers ---------------------------------
+
+    async def submit(
+        self,
+        request: ChatRequest,
+        callback_url: str | None = None,
+    ) -> GenerationJob:
+        """Store a new job and enqueue it; returns its initial state."""
+        await self.ensure_group()
+        job_id = uuid.uuid4().hex
+        now = _now()
+        fields = {
+            "status": "queued",
+            "attempts": 0,
+            "request": request.model_dump_json(),
+            "callback_url": callback_url or "",
+            "created_at": now,
+            "updated_at": now,
+        }
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(JOB_KEY_PREFIX + job_id, mapping=fields)
+        pipe.expire(JOB_KEY_PREFIX + job_id, self._result_ttl)
+        pipe.xadd(STREAM_KEY, {"job": job_id})
+        await pipe.execute()
+        metrics.JOBS.labels("submitted").inc()
+        return GenerationJob(
+            job_id=job_id,
+            status="queued",
+            created_at=now,
+            updated_at=now,
+        )
+
+    async def get(self, job_id: str) -> GenerationJob | None:
+        """Return the job state, or ``None`` if unknown or expired."""
+        raw = await self.client.hgetall(JOB_KEY_PREFIX + job_id)
+        if not raw:
+            return None
+        fields = {_text(key): _text(value) for key, value in raw.items()}
+        result = fields.get("result")
+        return GenerationJob(
+            job_id=job_id,
+            status=fields["status"],
+            attempts=int(fields.get("attempts", 0)),
+            result=(
+                WorkflowBlueprint.model_validate_json(result)
+                if result
+                else None
+            ),
+            error=fields.get("error") or None,
+            created_at=fields["created_at"],
+            updated_at=fields["updated_at"],
+        )
+
+    # --------------------------- consumers ---------------------------------
+
+    async def claim(
+        self,
+        consumer: str,
+        count: int,
+        block_ms: int = 5000,
+    ) -> list[ClaimedJob]:
+        """Lease up to ``count`` jobs to ``consumer``.
+
+        Retries whose backoff has passed are requeued, then entries whose
+        lease lapsed are taken over; otherwise new entries are read,
+        blocking up to ``block_ms`` for one to arrive (``0`` returns at
+        once rather than blocking forever).
+        """
+        await self.ensure_group()
+        await self._promote_due(count)
+        reclaimed = await self.client.xautoclaim(
+            STREAM_KEY,
+            GROUP,
+            consumer,
+            min_idle_time=int(self.visibility_timeout * 1000),
+            start_id="0-0",
+            count=count,
+        )
+        entries = [entry for entry in reclaimed[1] if entry[1]]
+        if not entries:
+            response = await self.client.xreadgroup(
+                GROUP,
+                consumer,
+                {STREAM_KEY: ">"},
+                count=count,
+                block=block_ms or None,
+            )
+            entries = [
+                entry for _, stream_entries in response or ()
+                for entry in stream_entries
+            ]
+
+        jobs: list[ClaimedJob] = []
+        for message_id, fields in entries:
+            job = await self._lease(_text(message_id), fields)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    async def extend(self, consumer: str, message_ids: Sequence[str]) -> None:
+        """Renew the leases of jobs the consumer is still working on."""
+        if not message_ids:
+            return
+        await self.client.xclaim(
+            STREAM_KEY,
+            GROUP,
+            consumer,
+            min_idle_time=0,
+            message_ids=list(message_ids),
+            justid=True,
+        )
+
+    async def complete(
+        self,
+        job: ClaimedJob,
+        blueprint: WorkflowBlueprint,
+    ) -> None:
+        """Store the result and ack the job."""
+        await self._finish(
+            job.job_id,
+            job.message_id,
+            {
+                "status": "succeeded",
+                "result": blueprint.model_dump_json(by_alias=True),
+                "error": "",
+            },
+        )
+        metrics.JOBS.labels("succeeded").inc()
+
+    async def fail(self, job: ClaimedJob, error: str, retry: bool) -> None:
+        """Schedule a retry after backoff, or dead-letter the job."""
+        if not retry or job.attempts >= self._max_attempts:
+            await self._dead_letter(job.job_id, job.message_id, error)
+            return
+        ceiling = min(
+            self._max_retry_backoff,
+            self._retry_backoff * 2 ** (job.attempts - 1),
+        )
+        delay = random.uniform(ceiling / 2, ceiling)
+        due_ms = int((self._clock() + delay) * 1000)
+        key = JOB_KEY_PREFIX + job.job_id
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(
+            key,
+            mapping={"status": "queued", "error": error, "updated_at": _now()},
+        )
+        pipe.zadd(RETRY_KEY, {job.job_id: due_ms})
+        pipe.xack(STREAM_KEY, GROUP, job.message_id)
+        pipe.xdel(STREAM_KEY, job.message_id)
+        await pipe.execute()
+        metrics.JOBS.labels("retried").inc()
+
+    async def _promote_due(self, count: int) -> None:
+        now_ms = int(self._clock() * 1000)
+        await self.client.eval(
+            PROMOTE_DUE_SCRIPT,
+            2,
+            RETRY_KEY,
+            STREAM_KEY,
+            now_ms,
+            count,
+        )
+
+    async def _lease(
+        self,
+        message_id: str,
+        fields: dict[Any, Any],
+    ) -> ClaimedJob | None:
+        job_id = _text(fields.get(b"job") or fields.get("job") or b"")
+        key = JOB_KEY_PREFIX + job_id
+        attempts = await self.client.hincrby(key, "attempts", 1)
+        raw = await self.client.hmget(key, ["request", "callback_url"])
+        if raw[0] is None:
+            # The job hash expired or was never written; drop the entry.
+            await self._ack(message_id)
+            return None
+        if attempts > self._max_attempts:
+            await self._dead_letter(
+                job_id,
+                message_id,
+                "Lease expired too many times; the job keeps stalling.",
+            )
+            return None
+        await self.client.hset(
+            key,
+            mapping={"status": "running", "updated_at": _now()},
+        )
+        return ClaimedJob(
+            job_id=job_id,
+            message_id=message_id,
+            attempts=attempts,
+            request=ChatRequest.model_validate_json(raw[0]),
+            callback_url=_text(raw[1] or b"") or None,
+        )
+
+    async def _dead_letter(
+        self,
+        job_id: str,
+        message_id: str,
+        error: str,
+    ) -> None:
+        logger.warning("Dead-lettering generation job %s: %s", job_id, error)
+        await self._finish(
+            job_id,
+            message_id,
+            {"status": "dead", "error": error},
+            dead_letter=True,
+        )
+        metrics.JOBS.labels("dead").inc()
+
+    async def _finish(
+        self,
+        job_id: str,
+        message_id: str,
+        fields: dict[str, str],
+        dead_letter: bool = False,
+    ) -> None:
+        key = JOB_KEY_PREFIX + job_id
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(key, mapping={**fields, "updated_at": _now()})
+        pipe.expire(key, self._result_ttl)
+        if dead_letter:
+            pipe.xadd(
+                DEAD_LETTER_KEY,
+                {"job": job_id, "error": fields["error"]},
+                maxlen=_DEAD_LETTER_MAXLEN,
+                approximate=True,
+            )
+        pipe.xack(STREAM_KEY, GROUP, message_id)
+        pipe.xdel(STREAM_KEY, message_id)
+        await pipe.execute()
+
+    async def _ack(self, message_id: str) -> None:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xack(STREAM_KEY, GROUP, message_id)
+        pipe.xdel(STREAM_KEY, message_id)
+        await pipe.execute()
+
+
+_queue: GenerationJobQueue | None = None
+
+
+def get_job_queue() -> GenerationJobQueue:
+    """Return the process-wide job queue, creating it lazily."""
+    global _queue
+    if _queue is None:
+        _queue = GenerationJobQueue()
+    return _queue
+
+
+async def close_job_queue() -> None:
+    """Close the job queue's connection; called from the app lifespan."""
+    global _queue
+    if _queue is not None:
+        await _queue.close()
+        _queue = None
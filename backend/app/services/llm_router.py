@@ -0,0 +1,365 @@
+"""Route generations across LLM providers by health and latency."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from typing import Protocol
+
+import httpx
+from pydantic import BaseModel
+
+from ..config import Settings
+from ..core import metrics
+from ..schemas.workflow import ChatRequest, WorkflowBlueprint
+from .deepseek_service import DeepSeekService
+from .gemini_service import GeminiService
+
+logger = logging.getLogger(__name__)
+
+# Below this the expected cost of a flaky provider stops growing.
+_MIN_SUCCESS_RATE = 0.05
+
+
+class GenerationService(Protocol):
+    """What the router needs from a provider-specific service."""
+
+    model: str
+
+    async def generate_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> WorkflowBlueprint:
+        ...
+
+    def stream_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> AsyncIterator[tuple[str, BaseModel]]:
+        ...
+
+
+# Provider name, as used by ``Settings.ai_provider``, to its service.
+PROVIDERS: dict[str, Callable[[], GenerationService]] = {
+    "deepseek": DeepSeekService,
+    "gemini": GeminiService,
+}
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when no provider could serve a generation."""
+
+
+def is_provider_fault(exc: BaseException) -> bool:
+    """Whether ``exc`` says the provider itself is unhealthy.
+
+    Timeouts, lost connections and 5xx responses count; rejected
+    requests (4xx) and output that failed to parse do not. The SDK error
+    is looked for along the ``__cause__`` chain of wrapped errors.
+    """
+    seen: set[int] = set()
+    error: BaseException | None = exc
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(
+            error,
+            (TimeoutError, ConnectionError, httpx.TransportError),
+        ):
+            return True
+        # OpenAI errors carry status_code, Google API errors code.
+        status = getattr(error, "status_code", getattr(error, "code", None))
+        if isinstance(status, int) and not isinstance(status, bool):
+            return status >= 500
+        error = error.__cause__
+    return False
+
+
+class ProviderHealth:
+    """EWMA latency and error rate of one provider plus its breaker.
+
+    The circuit opens after ``max_failures`` failures in a row, or once
+    at least ``min_samples`` calls were seen and the error rate reaches
+    ``error_threshold``. After ``cooldown`` seconds it is half open: one
+    probe call is let through, and its outcome closes or reopens it.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        max_failures: int = 3,
+        error_threshold: float = 0.5,
+        min_samples: int = 10,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.alpha = alpha
+        self.max_failures = max(1, max_failures)
+        self.error_threshold = error_threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self._clock = clock
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """``closed``, ``open`` or ``half_open``."""
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through."""
+        state = self.state
+        return state == "closed" or (
+            state == "half_open" and not self._probing
+        )
+
+    def acquire(self) -> bool | None:
+        """Claim one call: ``None`` if refused, else whether it probes.
+
+        A probe must be handed back with :meth:`release` once it ends.
+        """
+        if not self.available():
+            return None
+        self._probing = self.opened_at is not None
+        return self._probing
+
+    def release(self) -> None:
+        """Let the next probe through once the current one has ended."""
+        self._probing = False
+
+    def expected_seconds(self) -> float:
+        """Latency inflated by the chance of having to go elsewhere."""
+        success = max(_MIN_SUCCESS_RATE, 1.0 - self.error_rate)
+        return (self.latency or 0.0) / success
+
+    def record_success(self, seconds: float) -> bool:
+        """Fold in a successful call; return whether it closed the circuit."""
+        self._observe_latency(seconds)
+        self.error_rate -= self.alpha * self.error_rate
+        self.samples += 1
+        self.consecutive_failures = 0
+        if self.opened_at is None:
+            return False
+        self.opened_at = None
+        return True
+
+    def record_failure(self, seconds: float) -> bool:
+        """Fold in a failed call; return whether it opened the circuit."""
+        self._observe_latency(seconds)
+        self.error_rate += self.alpha * (1.0 - self.error_rate)
+        self.samples += 1
+        self.consecutive_failures += 1
+        if self.opened_at is not None:
+            # A failed probe restarts the cooldown.
+            self.opened_at = self._clock()
+            return False
+        if self.consecutive_failures >= self.max_failures or (
+            self.samples >= self.min_samples
+            and self.error_rate >= self.error_threshold
+        ):
+            self.opened_at = self._clock()
+            return True
+        return False
+
+    def _observe_latency(self, seconds: float) -> None:
+        # Slow failures count too, so a browning-out provider sinks.
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.alpha * (seconds - self.latency)
+
+
+class LLMRouter:
+    """Send each generation to the healthiest, fastest provider.
+
+    Providers are ranked by :meth:`ProviderHealth.expected_seconds`;
+    ones without a sample yet go first, in preference order, so each is
+    measured once. A failed, timed-out or unparseable generation is
+    retried on the next provider and the caller only sees the result;
+    ``failover_timeout`` abandons a generation that is still running so
+    a stalled provider cannot hold the request. Only failures that
+    :func:`is_provider_fault` blames on the provider count against its
+    health.
+
+    A stream fails over only until its first event; after that the
+    error is raised because emitted nodes cannot be taken back.
+    """
+
+    def __init__(
+        self,
+        services: Mapping[str, GenerationService],
+        failover_timeout: float = 0.0,
+        health: Callable[[], ProviderHealth] = ProviderHealth,
+    ) -> None:
+        if not services:
+            raise RuntimeError("No AI provider is configured.")
+        self.services = dict(services)
+        self.failover_timeout = failover_timeout
+        self.health = {name: health() for name in self.services}
+        self._preference = {name: i for i, name in enumerate(self.services)}
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        factories: Mapping[str, Callable[[], GenerationService]] | None = None,
+    ) -> LLMRouter:
+        """Build every provider that has credentials, preferred first."""
+        if factories is None:
+            factories = PROVIDERS
+        order = sorted(
+            factories,
+            key=lambda name: name != settings.ai_provider,
+        )
+        services: dict[str, GenerationService] = {}
+        problems = []
+        for name in order:
+            try:
+                services[name] = factories[name]()
+            except RuntimeError as exc:
+                problems.append(str(exc))
+        if not services:
+            raise RuntimeError(" ".join(problems))
+
+        def health() -> ProviderHealth:
+            return ProviderHealth(
+                alpha=settings.llm_ewma_alpha,
+                max_failures=settings.llm_breaker_failures,
+                error_threshold=settings.llm_breaker_error_rate,
+                min_samples=settings.llm_breaker_min_samples,
+                cooldown=settings.llm_breaker_cooldown_seconds,
+            )
+
+        return cls(services, settings.llm_failover_timeout_seconds, health)
+
+    @property
+    def model(self) -> str:
+        """Models of every provider, part of the blueprint cache key."""
+        return "+".join(service.model for service in self.services.values())
+
+    def ranked(self) -> list[str]:
+        """Providers whose circuit lets a call through, best first."""
+        return sorted(
+            (name for name, h in self.health.items() if h.available()),
+            key=lambda name: (
+                self.health[name].latency is not None,
+                self.health[name].expected_seconds(),
+                self._preference[name],
+            ),
+        )
+
+    async def generate_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> WorkflowBlueprint:
+        """Generate on the best provider, failing over on any error."""
+        if not payload.messages:
+            raise RuntimeError("At least one chat message is required.")
+        candidates = self.ranked()
+        last_error: BaseException | None = None
+        for position, name in enumerate(candidates):
+            health = self.health[name]
+            probe = health.acquire()
+            if probe is None:
+                continue
+            call = self.services[name].generate_workflow(payload)
+            if self.failover_timeout > 0 and position < len(candidates) - 1:
+                call = asyncio.wait_for(call, self.failover_timeout)
+            started = time.perf_counter()
+            try:
+                blueprint = await call
+            except Exception as exc:  # noqa: BLE001 - try the next provider
+                self._failed(name, started, exc)
+                last_error = exc
+                continue
+            finally:
+                if probe:
+                    health.release()
+            self._succeeded(name, started)
+            return blueprint
+        raise self._unavailable(last_error)
+
+    async def stream_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> AsyncIterator[tuple[str, BaseModel]]:
+        """Stream from the best provider that produces a first event."""
+        if not payload.messages:
+            raise RuntimeError("At least one chat message is required.")
+        last_error: BaseException | None = None
+        for name in self.ranked():
+            health = self.health[name]
+            probe = health.acquire()
+            if probe is None:
+                continue
+            started = time.perf_counter()
+            emitted = False
+            try:
+                async for event in self.services[name].stream_workflow(
+                    payload
+                ):
+                    emitted = True
+                    yield event
+            except Exception as exc:
+                self._failed(name, started, exc)
+                if emitted:
+                    raise
+                last_error = exc
+                continue
+            finally:
+                if probe:
+                    health.release()
+            self._succeeded(name, started)
+            return
+        raise self._unavailable(last_error)
+
+    def _succeeded(self, name: str, started: float) -> None:
+        seconds = time.perf_counter() - started
+        if self.health[name].record_success(seconds):
+            logger.info("LLM provider %s recovered; circuit closed", name)
+            metrics.LLM_ROUTING.labels(name, "circuit_closed").inc()
+
+    def _failed(
+        self,
+        name: str,
+        started: float,
+        exc: BaseException,
+    ) -> None:
+        seconds = time.perf_counter() - started
+        logger.warning(
+            "LLM provider %s failed after %.1fs: %s: %s",
+            name,
+            seconds,
+            type(exc).__name__,
+            exc,
+        )
+        metrics.LLM_ROUTING.labels(name, "failover").inc()
+        if not is_provider_fault(exc):
+            return
+        if self.health[name].record_failure(seconds):
+            logger.warning("LLM provider %s degraded; circuit opened", name)
+            metrics.LLM_ROUTING.labels(name, "circuit_open").inc()
+
+    def _unavailable(
+        self,
+        last_error: BaseException | None,
+    ) -> LLMUnavailableError:
+        if last_error is None:
+            return LLMUnavailableError(
+                "Every AI provider is unavailable; try again shortly."
+            )
+        error = LLMUnavailableError(
+            f"Every AI provider failed. Last error: {last_error}"
+        )
+        error.__cause__ = last_error
+        return error
@@ -1,32 +1,129 @@
 """Async client for interacting with an external n8n instance."""
 
+import importlib.util
 import logging
+import time
 from typing import Any
 
 import httpx
 
 from ..config import settings
+from ..core import metrics
+from ..core.serialization import loads
 from ..schemas.workflow import WorkflowBlueprint
-from .n8n_converter import to_n8n_payload
+from .blueprint_validator import ensure_valid
+from .n8n_converter import to_n8n_payload, to_n8n_payload_incremental
+from .workflow_graph import WorkflowGraph
 
 
 logger = logging.getLogger(__name__)
 
+_http_client: httpx.AsyncClient | None = None
+
+# Transport errors raised before any byte of the request was sent.
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
 
 class N8NClientError(RuntimeError):
-    """Raised when communication with the n8n API fails."""
+    """Raised when communication with the n8n API fails.
+
+    ``retryable`` is set when the request can safely be sent again:
+    n8n answered 429 or 5xx, or the connection was never established.
+    ``retry_after`` carries n8n's ``Retry-After`` hint in seconds.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        retryable: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _client_error(exc: httpx.HTTPError) -> N8NClientError:
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return N8NClientError(
+            f"n8n responded with status {code}: {exc.response.text}",
+            status_code=code,
+            retryable=code == 429 or code >= 500,
+            retry_after=_retry_after(exc.response),
+        )
+    # Only failures before the request left are safe to resend; a
+    # timed-out POST may already have created the workflow.
+    return N8NClientError(
+        "Unable to reach the n8n instance",
+        retryable=isinstance(exc, _UNSENT_ERRORS),
+    )
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None  # absent, or an HTTP date we do not bother parsing
+
+
+def _http2_enabled() -> bool:
+    if not settings.n8n_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "N8N_HTTP2 is enabled but the 'h2' package is missing; "
+            "falling back to HTTP/1.1. Install it with "
+            "`pip install httpx[http2]`."
+        )
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client, creating it lazily."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.n8n_max_connections,
+                max_keepalive_connections=(
+                    settings.n8n_max_keepalive_connections
+                ),
+                keepalive_expiry=settings.n8n_keepalive_expiry_seconds,
+            ),
+            http2=_http2_enabled(),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the pooled HTTP client; called from the app lifespan."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class N8NClient:
-    """Thin wrapper that issues authenticated requests to the n8n REST API."""
+    """Thin wrapper that issues authenticated requests to the n8n REST API.
+
+    All instances share the pooled client from :func:`get_http_client`
+    unless an explicit ``client`` is supplied, so connections are kept
+    alive across calls.
+    """
 
     def __init__(
         self,
         base_url: str | None = None,
         timeout: float = 10.0,
+        client: httpx.AsyncClient | None = None,
     ) -> None:
         self._base_url = base_url or settings.n8n_base_url.rstrip("/")
         self._timeout = timeout
+        self._client = client
         self._headers: dict[str, str] = {}
         if settings.n8n_api_key:
             self._headers["X-N8N-API-KEY"] = settings.n8n_api_key
@@ -39,20 +136,43 @@ class N8NClient:
                 settings.n8n_basic_auth_password,
             )
 
-    async def get_status(self) -> dict[str, Any]:
-        """Return health information reported by the target n8n instance."""
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the HTTP client used for requests."""
+        return self._client or get_http_client()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        outcome = "error"
         try:
-            async with httpx.AsyncClient(
-                base_url=self._base_url,
+            response = await self.client.request(
+                method,
+                f"{self._base_url}{path}",
                 headers=self._headers,
                 auth=self._auth,
                 timeout=self._timeout,
-            ) as client:
-                response = await client.get("/healthz")
-                response.raise_for_status()
-                if response.content:
-                    return response.json()
-                return {"status": "ok"}
+                **kwargs,
+            )
+            outcome = "success" if response.is_success else "error"
+            return response
+        finally:
+            metrics.UPSTREAM_SECONDS.labels("n8n", method, outcome).observe(
+                time.perf_counter() - started
+            )
+
+    async def get_status(self) -> dict[str, Any]:
+        """Return health information reported by the target n8n instance."""
+        try:
+            response = await self._request("GET", "/healthz")
+            response.raise_for_status()
+            if response.content:
+                return response.json()
+            return {"status": "ok"}
         except httpx.HTTPStatusError as exc:
             # pragma: no cover - simple pass-through
             detail = exc.response.text
@@ -65,36 +185,98 @@ class N8NClient:
             # pragma: no cover - simple pass-through
             raise N8NClientError("Unable to reach the n8n instance") from exc
 
+    async def _send_workflow(
+        self,
+        method: str,
+        path: str,
+        payload: dict[str, Any],
+    ) -> dict[str, Any]:
+        try:
+            logger.debug(
+                "Sending workflow to n8n",
+                extra={"payload": payload},
+            )
+            with metrics.N8N_DEPLOY.time():
+                response = await self._request(method, path, json=payload)
+            response.raise_for_status()
+            data = loads(response.content)
+            workflow_id = data.get("id")
+            if workflow_id:
+                data["url"] = f"{self._base_url}/workflow/{workflow_id}"
+            return data
+        except httpx.HTTPError as exc:
+            raise _client_error(exc) from exc
+
+    async def list_workflows(
+        self,
+        cursor: str | None = None,
+        limit: int = 250,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one page of workflows and the cursor of the next page."""
+        params: dict[str, Any] = {"limit": limit, "excludePinnedData": True}
+        if cursor:
+            params["cursor"] = cursor
+        try:
+            response = await self._request(
+                "GET",
+                "/api/v1/workflows",
+                params=params,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise _client_error(exc) from exc
+        data = loads(response.content)
+        return data.get("data", []), data.get("nextCursor") or None
+
     async def deploy_workflow(
         self,
         blueprint: WorkflowBlueprint,
     ) -> dict[str, Any]:
         """Create a workflow in n8n using the supplied blueprint definition."""
-        payload = to_n8n_payload(blueprint)
-        try:
-            async with httpx.AsyncClient(
-                base_url=self._base_url,
-                headers=self._headers,
-                auth=self._auth,
-                timeout=self._timeout,
-            ) as client:
-                logger.debug(
-                    "Deploying workflow to n8n",
-                    extra={"payload": payload},
+        graph = WorkflowGraph.from_blueprint(blueprint)
+        ensure_valid(blueprint, graph)
+        with metrics.CONVERT.time():
+            payload = to_n8n_payload(blueprint, graph)
+        return await self._send_workflow("POST", "/api/v1/workflows", payload)
+
+    async def update_workflow(
+        self,
+        workflow_id: str,
+        blueprint: WorkflowBlueprint,
+        previous_blueprint: WorkflowBlueprint | None = None,
+        previous_payload: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Replace an existing n8n workflow instead of creating a new one.
+
+        With the previous blueprint and its converted payload only the
+        changed steps are reconverted, and no request is sent at all when
+        the resulting document matches what n8n already has.
+        """
+        graph = WorkflowGraph.from_blueprint(blueprint)
+        ensure_valid(blueprint, graph)
+        if previous_blueprint is not None and previous_payload is not None:
+            with metrics.CONVERT.time():
+                payload = to_n8n_payload_incremental(
+                    blueprint,
+                    previous_blueprint,
+                    previous_payload,
+                    graph,
                 )
-                response = await client.post("/api/v1/workflows", json=payload)
-                response.raise_for_status()
-                data = response.json()
-                workflow_id = data.get("id")
-                if workflow_id:
-                    data["url"] = f"{self._base_url}/workflow/{workflow_id}"
-                return data
-        except httpx.HTTPStatusError as exc:
-            # pragma: no cover - surface upstream error details
-            detail = exc.response.text
-            raise N8NClientError(
-                f"n8n responded with status {exc.response.status_code}: {detail}"
-            ) from exc
-        except httpx.HTTPError as exc:
-            # pragma: no cover - simple pass-through
-            raise N8NClientError("Unable to reach the n8n instance") from exc
+            if all(
+                previous_payload.get(key) == value
+                for key, value in payload.items()
+            ):
+                return {
+                    "id": workflow_id,
+                    "url": f"{self._base_url}/workflow/{workflow_id}",
+                    "unchanged": True,
+                }
+        else:
+            with metrics.CONVERT.time():
+                payload = to_n8n_payload(blueprint, graph)
+        # n8n's public API has no PATCH; PUT replaces the whole document.
+        return await self._send_workflow(
+            "PUT",
+            f"/api/v1/workflows/{workflow_id}",
+            payload,
+        )
@@ -1,20 +1,23 @@
 """Convert workflow blueprints into n8n payloads.
 
 - LLM-safe parameter normalization
-- Node registry validation & aliasing
+- Node catalog lookups & aliasing
 - Credential auto-mapping hints
 - Target-index-aware connections
-- Layered auto-layout (tree), with grid fallback
+- Layered auto-layout (longest path + crossing sweeps), grid fallback
 - Safe workflow settings for n8n 1.118+
 """
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
 from collections.abc import Iterable
-from typing import Any, Dict, List, Optional, Set, Tuple
+from itertools import islice
+from typing import Any, Optional
 
-from ..schemas.workflow import WorkflowBlueprint
+from ..schemas.workflow import WorkflowBlueprint, WorkflowEdge, WorkflowNode
+from .n8n_layout import layered_layout
+from .node_catalog import NodeSpec, get_node_catalog
+from .workflow_graph import WorkflowGraph
 
 # --------------------------- layout constants ------------------------------
 
@@ -31,37 +34,6 @@ def _derive_grid_position(index: int) -> list[int]:
     return [_BASE_X + col * _X_GAP, _BASE_Y + row * _Y_GAP]
 
 
-# --------------------------- known nodes -----------------------------------
-
-NODE_REGISTRY: dict[str, dict[str, Any]] = {
-    "n8n-nodes-base.cron": {"typeVersion": 1, "needs_credentials": False},
-    "n8n-nodes-base.webhook": {"typeVersion": 1, "needs_credentials": False},
-    "n8n-nodes-base.if": {"typeVersion": 2, "needs_credentials": False},
-    "n8n-nodes-base.merge": {"typeVersion": 2, "needs_credentials": False},
-    "n8n-nodes-base.code": {"typeVersion": 2, "needs_credentials": False},
-    "n8n-nodes-base.switch": {"typeVersion": 3, "needs_credentials": False},
-    "n8n-nodes-base.wait": {"typeVersion": 1, "needs_credentials": False},
-    "n8n-nodes-base.httpRequest": {
-        "typeVersion": 4,
-        "needs_credentials": False,
-    },
-    "n8n-nodes-base.hubspot": {"typeVersion": 2, "needs_credentials": True},
-    "n8n-nodes-base.slack": {"typeVersion": 2, "needs_credentials": True},
-    "n8n-nodes-base.googleSheets": {
-        "typeVersion": 4,
-        "needs_credentials": True,
-    },
-    "n8n-nodes-base.emailSend": {"typeVersion": 2, "needs_credentials": True},
-    "n8n-nodes-base.zendesk": {"typeVersion": 1, "needs_credentials": True},
-    "n8n-nodes-base.stripe": {"typeVersion": 2, "needs_credentials": True},
-    "n8n-nodes-base.twilio": {"typeVersion": 2, "needs_credentials": True},
-    "n8n-nodes-base.openAi": {"typeVersion": 4, "needs_credentials": True},
-}
-
-TYPE_ALIASES = {
-    "n8n-nodes-base.switch": "n8n-nodes-base.if",
-}
-
 PARAM_COLLECTION_KEYS = {
     "headerParameters",
     "queryParameters",
@@ -76,16 +48,8 @@ PARAM_COLLECTION_KEYS = {
 
 # --------------------------- parameter cleaning ----------------------------
 
-def _sanitize_property_values(value: Any) -> list[dict[str, Any]] | None:
-    if isinstance(value, list):
-        cleaned: list[dict[str, Any]] = []
-        for item in value:
-            if isinstance(item, dict):
-                cleaned.append(_sanitize_parameters(item))
-        return cleaned
-    if isinstance(value, dict):
-        return [_sanitize_parameters(value)]
-    return None
+# Keys renamed to their canonical form unless the canonical key has a value.
+_KEY_ALIASES = {"option": "options"}
 
 
 def _coerce_to_parameters_dict(obj: Any) -> Optional[dict[str, Any]]:
@@ -93,6 +57,8 @@ def _coerce_to_parameters_dict(obj: Any) -> Optional[dict[str, Any]]:
         return None
     if isinstance(obj, dict):
         if "parameters" in obj and isinstance(obj["parameters"], list):
+            if len(obj) == 1:
+                return obj
             return {"parameters": obj["parameters"]}
         if "values" in obj and isinstance(obj["values"], list):
             return {"parameters": obj["values"]}
@@ -102,67 +68,236 @@ def _coerce_to_parameters_dict(obj: Any) -> Optional[dict[str, Any]]:
     return None
 
 
-def _coerce_parameter_list(value: Any) -> list[dict[str, Any]] | None:
+def _coerce_dict_list(value: Any) -> list[dict[str, Any]] | None:
     if isinstance(value, list):
+        if all(isinstance(item, dict) for item in value):
+            return value
         return [item for item in value if isinstance(item, dict)]
     if isinstance(value, dict):
         return [value]
     return None
 
 
-def _sanitize_parameters(data: Any, parent_key: str | None = None) -> Any:
-    if isinstance(data, dict):
-        sanitized: dict[str, Any] = {}
-        for key, value in data.items():
-            if value is None:
-                continue
+# Rules applied to an already-sanitized value, keyed by its output key.
+# Each returns the replacement value or ``None`` to drop the key.
+_VALUE_RULES = {
+    "propertyValues": _coerce_dict_list,
+}
 
-            new_key = (
-                "options"
-                if key == "option" and "options" not in data
-                else key
-            )
 
-            if new_key in PARAM_COLLECTION_KEYS:
-                coerced = _coerce_to_parameters_dict(value)
-                if coerced:
-                    sanitized[new_key] = coerced
-                continue
+# Keys that may trigger a rewrite; anything else is copied verbatim.
+_SPECIAL_KEYS = frozenset(
+    {*_KEY_ALIASES, *PARAM_COLLECTION_KEYS, *_VALUE_RULES, "values"}
+)
+
+
+def _needs_rewrite(data: dict[str, Any] | list[Any]) -> bool:
+    """Scan a tree for anything a sanitizer rule would change.
+
+    A flat work list keeps this much cheaper than the rewriting pass, and
+    it stops at the first hit, so clean input costs a single scan.
+    """
+    pending = [data]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if value is None:
+                    return True
+                if key in _SPECIAL_KEYS:
+                    alias = _KEY_ALIASES.get(key)
+                    if alias is not None and node.get(alias) is None:
+                        return True
+                    if key in PARAM_COLLECTION_KEYS:
+                        coerced = _coerce_to_parameters_dict(value)
+                        if not coerced or coerced is not value:
+                            return True
+                        # Collection payloads are passed through as-is.
+                        continue
+                    rule = _VALUE_RULES.get(key)
+                    if rule is not None and rule(value) is not value:
+                        return True
+                if isinstance(value, (dict, list)):
+                    pending.append(value)
+        else:
+            for item in node:
+                if item is None:
+                    return True
+                if isinstance(item, (dict, list)):
+                    pending.append(item)
+    return False
+
+
+def _apply_value_rule(
+    key: str,
+    new_key: str,
+    value: Any,
+    parent_key: str | None,
+) -> tuple[str, Any]:
+    """Run the table rule for an entry; a ``None`` value drops it."""
+    rule = _VALUE_RULES.get(new_key)
+    if rule is not None:
+        return new_key, rule(value)
+    if key == "values" and parent_key in PARAM_COLLECTION_KEYS:
+        return "parameters", _coerce_dict_list(value)
+    return new_key, value
 
-            sanitized_value = _sanitize_parameters(value, new_key)
 
-            if new_key == "propertyValues":
-                coerced_list = _sanitize_property_values(sanitized_value)
-                if coerced_list is None:
+def _sanitize_parameters(data: Any, parent_key: str | None = None) -> Any:
+    """Clean LLM-produced parameters in a single iterative pass.
+
+    Drops ``None`` values, renames aliased keys, coerces parameter
+    collections and ``propertyValues`` into the shapes n8n expects.
+
+    Clean trees are detected by a quick scan and returned untouched.
+    Otherwise one post-order walk rebuilds only the containers that
+    change; untouched subtrees are shared rather than copied. The walk
+    keeps its own stack, so nesting depth is not limited by recursion.
+    While a container is unchanged ``output`` stays ``None`` and ``kept``
+    counts its untouched prefix, which is copied once a rewrite happens.
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+    # ``values`` is only rewritten directly below a collection key.
+    if parent_key not in PARAM_COLLECTION_KEYS and not _needs_rewrite(data):
+        return data
+
+    stack: list[tuple[Any, ...]] = []
+    source: Any = data
+    is_dict = isinstance(data, dict)
+    items: Any = iter(data.items()) if is_dict else iter(data)
+    kept = 0
+    output: list[Any] | None = None
+    key = new_key = ""
+
+    while True:
+        child: Any = None
+        if is_dict:
+            for key, value in items:
+                if value is None:
+                    if output is None:
+                        output = list(islice(source.items(), kept))
                     continue
-                sanitized[new_key] = coerced_list
-                continue
 
-            if key == "values" and parent_key in PARAM_COLLECTION_KEYS:
-                coerced_params = _coerce_parameter_list(sanitized_value)
-                if coerced_params is None:
+                new_key = key
+                if key in _SPECIAL_KEYS:
+                    alias = _KEY_ALIASES.get(key)
+                    if alias is not None and source.get(alias) is None:
+                        new_key = alias
+                    if new_key in PARAM_COLLECTION_KEYS:
+                        coerced = _coerce_to_parameters_dict(value)
+                        if (
+                            coerced
+                            and coerced is value
+                            and new_key == key
+                            and output is None
+                        ):
+                            kept += 1
+                            continue
+                        if output is None:
+                            output = list(islice(source.items(), kept))
+                        if coerced:
+                            output.append((new_key, coerced))
+                        continue
+                    if isinstance(value, (dict, list)):
+                        child = value
+                        break
+                    final_key, final = _apply_value_rule(
+                        key, new_key, value, parent_key
+                    )
+                    if final is value and final_key == key and output is None:
+                        kept += 1
+                        continue
+                    if output is None:
+                        output = list(islice(source.items(), kept))
+                    if final is not None:
+                        output.append((final_key, final))
                     continue
-                sanitized["parameters"] = coerced_params
-                continue
-
-            sanitized[new_key] = sanitized_value
-        return sanitized
 
-    if isinstance(data, list):
-        return [
-            _sanitize_parameters(item, parent_key)
-            for item in data
-            if item is not None
-        ]
+                if isinstance(value, (dict, list)):
+                    child = value
+                    break
+                if output is None:
+                    kept += 1
+                else:
+                    output.append((key, value))
+        else:
+            for item in items:
+                if item is None:
+                    if output is None:
+                        output = source[:kept]
+                elif isinstance(item, (dict, list)):
+                    child = item
+                    new_key = parent_key
+                    break
+                elif output is None:
+                    kept += 1
+                else:
+                    output.append(item)
+
+        if child is not None:
+            frame = (source, is_dict, items, parent_key, kept, output)
+            stack.append((*frame, key, new_key))
+            source = child
+            is_dict = isinstance(child, dict)
+            items = iter(child.items()) if is_dict else iter(child)
+            parent_key = new_key
+            kept = 0
+            output = None
+            continue
 
-    return data
+        if output is None:
+            result = source
+        elif is_dict:
+            result = dict(output)
+        else:
+            result = output
+        if not stack:
+            return result
+
+        original = source
+        (
+            source,
+            is_dict,
+            items,
+            parent_key,
+            kept,
+            output,
+            key,
+            new_key,
+        ) = stack.pop()
+        if is_dict:
+            new_key, result = _apply_value_rule(
+                key, new_key, result, parent_key
+            )
+            if result is original and new_key == key and output is None:
+                kept += 1
+                continue
+            if output is None:
+                output = list(islice(source.items(), kept))
+            if result is not None:
+                output.append((new_key, result))
+        elif result is original and output is None:
+            kept += 1
+        else:
+            if output is None:
+                output = source[:kept]
+            output.append(result)
 
 
 def _normalize_parameters(
     node_type: str,
     parameters: dict[str, Any],
+    spec: NodeSpec | None = None,
 ) -> dict[str, Any]:
     cleaned = _sanitize_parameters(parameters, None)
+    if cleaned is parameters:
+        cleaned = dict(cleaned)
+    # Only the top level is ours: containers below it may still be the
+    # blueprint's, so a rule that edits one must copy it first.
+
+    if spec is not None and isinstance(cleaned, dict):
+        spec.coerce_parameters(cleaned)
 
     if node_type == "n8n-nodes-base.wait" and isinstance(cleaned, dict):
         if "waitTill" not in cleaned and "unit" in cleaned:
@@ -173,7 +308,14 @@ def _normalize_parameters(
                 or cleaned.get("duration")
                 or 1
             )
-            cleaned.update({"waitTill": "timeInterval", "amount": int(amount)})
+            if isinstance(amount, dict):
+                # LLMs sometimes nest it, e.g. {"unit": "days", "value": 3}
+                amount = amount.get("value") or amount.get("amount") or 1
+            try:
+                amount = int(amount)
+            except (TypeError, ValueError):
+                amount = 1
+            cleaned.update({"waitTill": "timeInterval", "amount": amount})
 
     # If node: coerce LLM-shaped conditions into n8n expected schema
     if node_type == "n8n-nodes-base.if" and isinstance(cleaned, dict):
@@ -252,22 +394,18 @@ def _normalize_parameters(
                 cleaned["combineOperation"] = (
                     "any" if combinator == "or" else "all"
                 )
-                # Remove unknown helper fields
-                if "options" in conds:
-                    conds.pop("options", None)
 
     return cleaned
 
 
 # --------------------------- credentials hints -----------------------------
 
-def _needs_credentials(node_type: str) -> bool:
-    meta = NODE_REGISTRY.get(node_type) or {}
-    return bool(meta.get("needs_credentials"))
+def _needs_credentials(spec: NodeSpec | None) -> bool:
+    return spec is not None and spec.credentials_required
 
 
-def _infer_credentials_placeholder(node_type: str) -> dict[str, Any]:
-    if not _needs_credentials(node_type):
+def _infer_credentials_placeholder(spec: NodeSpec | None) -> dict[str, Any]:
+    if not _needs_credentials(spec):
         return {}
     return {}
 
@@ -277,18 +415,16 @@ def _infer_credentials_placeholder(node_type: str) -> dict[str, Any]:
 def _coerce_type_and_version(
     node_type: str,
     type_version: Any,
-) -> tuple[str, int]:
-    canonical_type = TYPE_ALIASES.get(node_type, node_type)
-    default_ver = NODE_REGISTRY.get(canonical_type, {}).get("typeVersion", 1)
+) -> tuple[str, int, NodeSpec | None]:
+    catalog = get_node_catalog()
+    canonical_type = catalog.canonical(node_type)
+    spec = catalog.get(canonical_type)
+    if spec is not None:
+        return canonical_type, spec.coerce_version(type_version), spec
     try:
-        version = (
-            int(type_version)
-            if type_version is not None
-            else int(default_ver)
-        )
+        return canonical_type, int(type_version), None
     except (TypeError, ValueError):
-        version = int(default_ver)
-    return canonical_type, version
+        return canonical_type, 1, None
 
 
 def _coerce_position(pos: object) -> Optional[list[int]]:
@@ -303,97 +439,107 @@ def _coerce_position(pos: object) -> Optional[list[int]]:
     return None
 
 
-def _build_nodes(
-    blueprint: WorkflowBlueprint,
-) -> tuple[list[dict[str, Any]], dict[str, str], dict[str, dict[str, Any]]]:
-    nodes: list[dict[str, Any]] = []
-    node_lookup: dict[str, str] = {}
-    id_to_node: dict[str, dict[str, Any]] = {}
+def _build_node(step: WorkflowNode) -> dict[str, Any]:
+    node_type, type_version, spec = _coerce_type_and_version(
+        step.type,
+        step.type_version,
+    )
+
+    parameters = _normalize_parameters(
+        node_type,
+        step.parameters or {},
+        spec,
+    )
+
+    if step.js_code and "code" in node_type.lower():
+        parameters["jsCode"] = step.js_code
+
+    if node_type == "n8n-nodes-base.if" and isinstance(parameters, dict):
+        parameters.setdefault("alwaysOutputData", True)
+
+    if isinstance(step.credentials, dict):
+        credentials = step.credentials
+    else:
+        credentials = _infer_credentials_placeholder(spec)
+
+    node_payload: dict[str, Any] = {
+        "id": step.id,
+        "name": step.name,
+        "type": node_type,
+        "typeVersion": type_version,
+        "position": _coerce_position(step.position),
+        "parameters": parameters,
+        "credentials": credentials,
+    }
 
-    for index, step in enumerate(blueprint.steps):
-        node_type, type_version = _coerce_type_and_version(
-            step.type,
-            step.type_version,
-        )
+    optional_fields = {
+        "retryOnFail": step.retry_on_fail,
+        "maxTries": step.max_tries,
+        "waitBetweenTries": step.wait_between_tries,
+        "alwaysOutputData": step.always_output_data,
+        "continueOnFail": step.continue_on_fail,
+        "notes": step.notes,
+        "notesInFlow": step.notes_in_flow,
+        "disabled": step.disabled,
+    }
+    for key, value in optional_fields.items():
+        if value is not None:
+            node_payload[key] = value
 
-        raw_parameters = dict(step.parameters or {})
-        parameters = _normalize_parameters(node_type, raw_parameters)
+    return node_payload
 
-        if step.js_code and "code" in node_type.lower():
-            parameters["jsCode"] = step.js_code
 
-        if node_type == "n8n-nodes-base.if" and isinstance(parameters, dict):
-            parameters.setdefault("alwaysOutputData", True)
-
-        if isinstance(step.credentials, dict):
-            credentials = step.credentials
-        else:
-            credentials = _infer_credentials_placeholder(node_type)
-
-        position = _coerce_position(step.position)
-
-        node_payload: dict[str, Any] = {
-            "id": step.id,
-            "name": step.name,
-            "type": node_type,
-            "typeVersion": type_version,
-            "position": position or _derive_grid_position(index),
-            "parameters": parameters,
-            "credentials": credentials,
-        }
-
-        optional_fields = {
-            "retryOnFail": step.retry_on_fail,
-            "maxTries": step.max_tries,
-            "waitBetweenTries": step.wait_between_tries,
-            "alwaysOutputData": step.always_output_data,
-            "continueOnFail": step.continue_on_fail,
-            "notes": step.notes,
-            "notesInFlow": step.notes_in_flow,
-            "disabled": step.disabled,
-        }
-        for key, value in optional_fields.items():
-            if value is not None:
-                node_payload[key] = value
-
-        nodes.append(node_payload)
-        node_lookup[step.id] = step.name
-        id_to_node[step.id] = node_payload
-
-    return nodes, node_lookup, id_to_node
+def _build_nodes(blueprint: WorkflowBlueprint) -> list[dict[str, Any]]:
+    """Build one n8n node per step, aligned with the graph's indices."""
+    return [_build_node(step) for step in blueprint.steps]
 
 
 # --------------------------- connections -----------------------------------
 
 def _build_connections(
-    edges: Iterable,
-    node_lookup: dict[str, str],
+    graph: WorkflowGraph,
+    sources: Iterable[int] | None = None,
 ) -> dict[str, dict[str, list[list[dict[str, Any]]]]]:
-    connections: dict[str, dict[str, list[list[dict[str, Any]]]]] = {}
+    """Group resolved edges into n8n's name-keyed connections.
 
-    for edge in edges:
-        src_name = node_lookup.get(edge.source)
-        tgt_name = node_lookup.get(edge.target)
-        if not src_name or not tgt_name:
+    ``sources`` limits the result to those node indices; by default
+    every node is included.
+    """
+    connections: dict[str, dict[str, list[list[dict[str, Any]]]]] = {}
+    names = graph.names
+    edges = graph.edges
+    offsets = graph.offsets
+    out_edges = graph.out_edges
+    adjacent = graph.adjacent
+    ported = graph.ported
+
+    for source in range(len(names)) if sources is None else sources:
+        start = offsets[source]
+        end = offsets[source + 1]
+        if start == end:
             continue
-
-        conn_type = edge.connection_type or "main"
-        src_out = int(edge.source_output_index or 0)
-        tgt_in = int(edge.target_input_index or 0)
-
-        src_map = connections.setdefault(src_name, {})
-        type_matrix = src_map.setdefault(conn_type, [])
-
-        while len(type_matrix) <= src_out:
-            type_matrix.append([])
-
-        type_matrix[src_out].append(
-            {
-                "node": tgt_name,
-                "type": conn_type,
-                "index": tgt_in,
-            }
-        )
+        src_map = connections.setdefault(names[source], {})
+        for position in range(start, end):
+            edge_index = out_edges[position]
+            if ported[edge_index]:
+                edge = edges[edge_index]
+                conn_type = edge.connection_type or "main"
+                src_out = int(edge.source_output_index or 0)
+                tgt_in = int(edge.target_input_index or 0)
+            else:
+                conn_type, src_out, tgt_in = "main", 0, 0
+            type_matrix = src_map.setdefault(conn_type, [])
+
+            while len(type_matrix) <= src_out:
+                type_matrix.append([])
+
+            type_matrix[src_out].append(
+                {
+                    "node": names[adjacent[position]],
+                    "type": conn_type,
+                    "index": tgt_in,
+                }
+            )
 
     return connections
 
@@ -401,79 +547,129 @@ def _build_connections(
 # --------------------------- auto layout -----------------------------------
 
 def _auto_layout(
-    edges: Iterable,
-    id_to_node: Dict[str, dict],
+    graph: WorkflowGraph,
+    nodes: list[dict[str, Any]],
 ) -> None:
-    incoming: Dict[str, int] = defaultdict(int)
-    graph: Dict[str, List[str]] = defaultdict(list)
-    for edge in edges:
-        if edge.source in id_to_node and edge.target in id_to_node:
-            graph[edge.source].append(edge.target)
-            incoming[edge.target] += 1
-            incoming.setdefault(edge.source, incoming.get(edge.source, 0))
-
-    def is_source(node_id: str) -> bool:
-        node = id_to_node[node_id]
-        node_type = node["type"]
-        return incoming.get(node_id, 0) == 0 or node_type in {
-            "n8n-nodes-base.cron",
-            "n8n-nodes-base.webhook",
-        }
-
-    ids = list(id_to_node.keys())
-    sources = [node_id for node_id in ids if is_source(node_id)]
-    visited: Set[str] = set()
-    layers: List[List[str]] = []
-
-    queue: deque[Tuple[str, int]] = deque()
-    for src in sources:
-        queue.append((src, 0))
-        visited.add(src)
-    while queue:
-        node_id, layer = queue.popleft()
-        if len(layers) <= layer:
-            layers.append([])
-        if node_id not in layers[layer]:
-            layers[layer].append(node_id)
-        for nxt in graph.get(node_id, []):
-            if nxt not in visited:
-                visited.add(nxt)
-                queue.append((nxt, layer + 1))
-
-    for node_id in ids:
-        if node_id not in visited:
-            if not layers:
-                layers = [[node_id]]
-            else:
-                layers[-1].append(node_id)
+    """Place every node that does not carry an explicit position."""
+    if all(node.get("position") for node in nodes):
+        return
+
+    if graph.out_edges:
+        trigger_types = get_node_catalog().trigger_types
+        triggers = [node["type"] in trigger_types for node in nodes]
+        slots = [
+            [_BASE_X + layer * _X_GAP, _BASE_Y + row * _Y_GAP]
+            for layer, row in layered_layout(
+                len(nodes), graph.pairs(), triggers
+            )
+        ]
+    else:
+        slots = [_derive_grid_position(index) for index in range(len(nodes))]
 
-    for layer_index, layer_ids in enumerate(layers):
-        for row_index, node_id in enumerate(layer_ids):
-            node = id_to_node[node_id]
-            if not node.get("position"):
-                node["position"] = [
-                    _BASE_X + layer_index * _X_GAP,
-                    _BASE_Y + row_index * _Y_GAP,
-                ]
+    for node, slot in zip(nodes, slots):
+        if not node.get("position"):
+            node["position"] = slot
 
 
 # Payload builder helpers
 
-def to_n8n_payload(blueprint: WorkflowBlueprint) -> dict[str, Any]:
-    nodes, node_lookup, id_to_node = _build_nodes(blueprint)
-    _auto_layout(blueprint.edges, id_to_node)
-    connections = _build_connections(blueprint.edges, node_lookup)
-
-    settings = getattr(blueprint, "settings", None) or {
+def _workflow_settings(blueprint: WorkflowBlueprint) -> dict[str, Any]:
+    return getattr(blueprint, "settings", None) or {
         # n8n expects a boolean here; default to True for visibility
         "saveExecutionProgress": True,
         "saveManualExecutions": True,
         "executionTimeout": -1,
     }
 
+
+def to_n8n_payload(
+    blueprint: WorkflowBlueprint,
+    graph: WorkflowGraph | None = None,
+) -> dict[str, Any]:
+    """Convert ``blueprint``; pass ``graph`` to reuse an existing index."""
+    graph = graph or WorkflowGraph.from_blueprint(blueprint)
+    nodes = _build_nodes(blueprint)
+    _auto_layout(graph, nodes)
+
+    return {
+        "name": blueprint.title,
+        "nodes": nodes,
+        "connections": _build_connections(graph),
+        "settings": _workflow_settings(blueprint),
+    }
+
+
+def _edges_by_source(
+    edges: Iterable[WorkflowEdge],
+) -> dict[str, list[WorkflowEdge]]:
+    grouped: dict[str, list[WorkflowEdge]] = {}
+    for edge in edges:
+        grouped.setdefault(edge.source, []).append(edge)
+    return grouped
+
+
+def to_n8n_payload_incremental(
+    blueprint: WorkflowBlueprint,
+    previous_blueprint: WorkflowBlueprint,
+    previous_payload: dict[str, Any],
+    graph: WorkflowGraph | None = None,
+) -> dict[str, Any]:
+    """Reconvert only what changed since ``previous_blueprint``.
+
+    ``previous_payload`` is the document converted (or deployed) for
+    ``previous_blueprint``. Unchanged steps reuse their node dict from it
+    as-is, so callers must not mutate either payload afterwards. Changed
+    steps are rebuilt but keep their previous position, and connections
+    are rebuilt only for sources whose edges, name or targets changed.
+    Only steps that are new get laid out.
+    """
+    previous_steps = {step.id: step for step in previous_blueprint.steps}
+    previous_nodes = {
+        node.get("id"): node for node in previous_payload.get("nodes") or []
+    }
+
+    graph = graph or WorkflowGraph.from_blueprint(blueprint)
+    nodes: list[dict[str, Any]] = []
+    renamed: set[str] = set()
+
+    for step in blueprint.steps:
+        old_step = previous_steps.get(step.id)
+        old_node = previous_nodes.get(step.id)
+        if old_node is not None and old_step == step:
+            node = old_node
+        else:
+            node = _build_node(step)
+            if old_node is not None and not node["position"]:
+                node["position"] = old_node.get("position")
+        if old_step is None or old_step.name != step.name:
+            renamed.add(step.id)
+        nodes.append(node)
+
+    _auto_layout(graph, nodes)
+
+    previous_connections = previous_payload.get("connections") or {}
+    previous_edges = _edges_by_source(previous_blueprint.edges)
+    connections: dict[str, dict[str, list[list[dict[str, Any]]]]] = {}
+    for source, source_id in enumerate(graph.ids):
+        edge_indices = graph.edges_from(source)
+        if not edge_indices:
+            continue
+        name = graph.names[source]
+        edges = [graph.edges[edge] for edge in edge_indices]
+        reusable = (
+            source_id not in renamed
+            and name in previous_connections
+            and previous_edges.get(source_id) == edges
+            and all(edge.target not in renamed for edge in edges)
+        )
+        if reusable:
+            connections[name] = previous_connections[name]
+        else:
+            connections.update(_build_connections(graph, (source,)))
+
     return {
         "name": blueprint.title,
         "nodes": nodes,
         "connections": connections,
-        "settings": settings,
+        "settings": _workflow_settings(blueprint),
     }
@@ -0,0 +1,256 @@
+"""Convert n8n workflow documents and exports back into blueprints.
+
+:func:`from_n8n_payload` is the reverse of
+:func:`~app.services.n8n_converter.to_n8n_payload`: nodes become steps and
+every ``connections`` slot becomes a :class:`WorkflowEdge` carrying its
+connection type and output and input indices.
+
+Exports are split by :class:`WorkflowExportReader`, which scans raw bytes
+and hands out one workflow at a time, so reading an export of any size
+only ever holds the workflow being decoded plus one chunk.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterator, Mapping
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+
+from ..core.serialization import dumps, loads
+from ..schemas.workflow import WorkflowBlueprint
+
+CHUNK_SIZE = 1 << 16
+
+# A whole string, a bracket, or the opening quote of a string that runs
+# past the end of the buffer.
+_TOKEN = re.compile(rb'"(?:[^"\\]++|\\.)*+"|[\[\]{}]|"')
+# String contents up to the closing quote or a trailing lone backslash.
+_STRING_BODY = re.compile(rb'(?:[^"\\]++|\\.)*+')
+
+# Node keys copied onto the step unchanged, by n8n name.
+_OPTIONAL_NODE_KEYS = (
+    "retryOnFail",
+    "maxTries",
+    "waitBetweenTries",
+    "alwaysOutputData",
+    "continueOnFail",
+    "notes",
+    "notesInFlow",
+    "disabled",
+)
+
+
+class WorkflowExportReader:
+    """Split a JSON export into its top-level workflow documents.
+
+    Accepts a single workflow object, an array of workflows (what
+    ``n8n export:workflow --all`` writes) or workflows concatenated one
+    after another, as in NDJSON. :meth:`feed` returns the raw bytes of
+    every object or array completed by the chunk; scalars in a top-level
+    array are skipped. Consumed bytes are dropped as soon as a document
+    has been handed out.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._start: int | None = None
+        self._depth = 0
+        # Nesting depth at which documents live: 1 inside a root array.
+        self._base: int | None = None
+        self._in_string = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Consume ``chunk`` and return the documents it completed."""
+        buffer = self._buffer
+        keep = self._pos if self._start is None else self._start
+        if keep:
+            del buffer[:keep]
+            self._pos -= keep
+            if self._start is not None:
+                self._start = 0
+        buffer += chunk
+
+        documents: list[bytes] = []
+        pos = self._pos
+        if self._in_string:
+            pos = _STRING_BODY.match(buffer, pos).end()
+            if pos == len(buffer) or buffer[pos] != 0x22:
+                self._pos = pos  # the string goes on in the next chunk
+                return documents
+            self._in_string = False
+            pos += 1
+
+        depth, base, start = self._depth, self._base, self._start
+        for match in _TOKEN.finditer(buffer, pos):
+            at = match.start()
+            char = buffer[at]
+            if char == 0x22:  # quote
+                if match.end() - at == 1:
+                    self._in_string = True
+                    pos = _STRING_BODY.match(buffer, at + 1).end()
+                    break
+            elif char == 0x5B or char == 0x7B:  # [ or {
+                if base is None:
+                    base = 1 if char == 0x5B else 0
+                    if base:
+                        depth = 1
+                        continue
+                if depth == base:
+                    start = at
+                depth += 1
+            else:
+                depth -= 1
+                if depth == base and start is not None:
+                    documents.append(bytes(buffer[start:at + 1]))
+                    start = None
+                elif base is not None and depth < base:
+                    base = None  # root array closed
+                    depth = 0
+        else:
+            pos = len(buffer)
+        self._pos = pos
+        self._depth, self._base, self._start = depth, base, start
+        return documents
+
+    def close(self) -> None:
+        """Raise if the export ended in the middle of a document."""
+        if self._in_string or self._start is not None or self._depth:
+            raise ValueError("n8n export is truncated")
+
+
+def iter_export(
+    source: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[WorkflowBlueprint]:
+    """Yield a blueprint for every workflow in an export file."""
+    reader = WorkflowExportReader()
+    while chunk := source.read(chunk_size):
+        for raw in reader.feed(chunk):
+            yield from_n8n_payload(loads(raw))
+    reader.close()
+
+
+async def import_ndjson(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[bytes]:
+    """Turn a streamed export into NDJSON blueprint lines, in order.
+
+    Each line carries the workflow's ``index`` and either a
+    ``blueprint`` or an ``error``; one bad workflow does not stop the
+    rest of the export.
+    """
+    reader = WorkflowExportReader()
+    index = 0
+    async for chunk in chunks:
+        for raw in reader.feed(chunk):
+            yield _import_line(index, raw)
+            index += 1
+    try:
+        reader.close()
+    except ValueError as exc:
+        yield dumps({"index": index, "error": str(exc)}) + b"\n"
+
+
+def _import_line(index: int, raw: bytes) -> bytes:
+    try:
+        blueprint = from_n8n_payload(loads(raw))
+    except ValidationError:
+        message = "invalid n8n workflow"
+    except (ValueError, TypeError, KeyError) as exc:
+        message = f"{type(exc).__name__}: {exc}"
+    else:
+        document = blueprint.model_dump(mode="json", by_alias=True)
+        return dumps({"index": index, "blueprint": document}) + b"\n"
+    return dumps({"index": index, "error": message}) + b"\n"
+
+
+# --------------------------- reverse conversion ----------------------------
+
+def _position(value: Any) -> list[int] | None:
+    # n8n stores canvas positions as floats; blueprints use ints.
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        try:
+            return [int(value[0]), int(value[1])]
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def from_n8n_payload(document: Mapping[str, Any]) -> WorkflowBlueprint:
+    """Map an n8n workflow document onto a :class:`WorkflowBlueprint`.
+
+    Connections whose source or target node is missing are dropped, as
+    :func:`to_n8n_payload` does for dangling edges.
+    """
+    if not isinstance(document, Mapping):
+        raise TypeError("n8n workflow must be a JSON object")
+    nodes = document.get("nodes") or []
+    ids: dict[str, str] = {}
+    steps: list[dict[str, Any]] = []
+    credential_types: dict[str, None] = {}
+    for node in nodes:
+        name = node["name"]
+        step_id = str(node.get("id") or name)
+        ids[name] = step_id
+        step: dict[str, Any] = {
+            "id": step_id,
+            "name": name,
+            "type": node["type"],
+            "typeVersion": node.get("typeVersion"),
+            "position": _position(node.get("position")),
+            "parameters": node.get("parameters") or {},
+        }
+        credentials = node.get("credentials")
+        if isinstance(credentials, dict) and credentials:
+            step["credentials"] = credentials
+            credential_types.update(dict.fromkeys(credentials))
+        for key in _OPTIONAL_NODE_KEYS:
+            if node.get(key) is not None:
+                step[key] = node[key]
+        steps.append(step)
+
+    edges: list[dict[str, Any]] = []
+    connections = document.get("connections") or {}
+    for source_name, outputs in connections.items():
+        source = ids.get(source_name)
+        if source is None:
+            continue
+        for connection_type, slots in (outputs or {}).items():
+            prefix = (
+                "" if connection_type == "main" else f"{connection_type}:"
+            )
+            for output, targets in enumerate(slots or ()):
+                for target in targets or ():
+                    target_id = ids.get(target.get("node"))
+                    if target_id is None:
+                        continue
+                    target_input = int(target.get("index") or 0)
+                    edges.append(
+                        {
+                            "id": (
+                                f"{prefix}{source}:{output}"
+                                f"->{target_id}:{target_input}"
+                            ),
+                            "source": source,
+                            "target": target_id,
+                            "connectionType": connection_type,
+                            "sourceOutputIndex": output,
+                            "targetInputIndex": target_input,
+                        }
+                    )
+
+    title = document.get("name") or "Imported workflow"
+    return WorkflowBlueprint.model_validate(
+        {
+            "id": str(document.get("id") or title),
+            "title": title,
+            "description": "",
+            "steps": steps,
+            "edges": edges,
+            "credentials": list(credential_types),
+            "estimatedTimeSavedMinutes": 0,
+        }
+    )
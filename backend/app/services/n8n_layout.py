@@ -0,0 +1,157 @@
+"""Layered (Sugiyama-style) auto-layout for converted n8n workflows.
+
+The engine works on integer node indices:
+
+1. Break cycles by dropping DFS back edges and edges into trigger nodes.
+2. Rank nodes by longest path from the sources (Kahn order, O(V+E)).
+3. Order nodes inside each layer by DFS discovery, which keeps connected
+   components together, then reduce crossings with a bounded number of
+   barycenter sweeps.
+
+Everything is deterministic for a given input order, so positions are
+stable between runs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+DEFAULT_SWEEPS = 4
+
+
+def _discovery_order(
+    node_count: int,
+    successors: list[list[int]],
+    roots: list[int],
+) -> tuple[list[int], set[tuple[int, int]]]:
+    """Iterative DFS returning visit order and the back edges it found."""
+    state = [0] * node_count  # 0 = unseen, 1 = on stack, 2 = done
+    order: list[int] = []
+    back_edges: set[tuple[int, int]] = set()
+
+    for root in (*roots, *range(node_count)):
+        if state[root]:
+            continue
+        state[root] = 1
+        order.append(root)
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if state[child] == 0:
+                    state[child] = 1
+                    order.append(child)
+                    stack.append((child, iter(successors[child])))
+                    break
+                if state[child] == 1:
+                    back_edges.add((node, child))
+            else:
+                state[node] = 2
+                stack.pop()
+    return order, back_edges
+
+
+def _longest_path_ranks(
+    node_count: int,
+    successors: list[list[int]],
+) -> list[int]:
+    """Rank every node by the longest path reaching it (Kahn order)."""
+    indegree = [0] * node_count
+    for targets in successors:
+        for target in targets:
+            indegree[target] += 1
+
+    ranks = [0] * node_count
+    ready = [node for node in range(node_count) if indegree[node] == 0]
+    while ready:
+        node = ready.pop()
+        next_rank = ranks[node] + 1
+        for target in successors[node]:
+            if ranks[target] < next_rank:
+                ranks[target] = next_rank
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+    return ranks
+
+
+def _sweep(
+    layers: list[list[int]],
+    row: list[int],
+    neighbours: list[list[int]],
+    layer_indices: range,
+) -> None:
+    """Reorder layers by the mean row of each node's neighbours."""
+    for layer_index in layer_indices:
+        layer = layers[layer_index]
+        if len(layer) < 2:
+            continue
+        keys: dict[int, float] = {}
+        for node in layer:
+            adjacent = neighbours[node]
+            if adjacent:
+                keys[node] = sum(row[other] for other in adjacent) / len(
+                    adjacent
+                )
+            else:
+                keys[node] = row[node]
+        # Ties keep the current order so results stay stable.
+        layer.sort(key=lambda node: (keys[node], row[node]))
+        for position, node in enumerate(layer):
+            row[node] = position
+
+
+def layered_layout(
+    node_count: int,
+    edges: Iterable[tuple[int, int]],
+    triggers: Sequence[bool] | None = None,
+    sweeps: int = DEFAULT_SWEEPS,
+) -> list[tuple[int, int]]:
+    """Return a ``(layer, row)`` slot for every node index.
+
+    ``edges`` are ``(source, target)`` index pairs. Nodes flagged in
+    ``triggers`` always start a layer-0 chain, mirroring n8n where
+    triggers cannot have inputs. ``sweeps`` bounds the number of
+    down/up barycenter passes used to reduce crossings.
+    """
+    is_trigger = list(triggers) if triggers else [False] * node_count
+    successors: list[list[int]] = [[] for _ in range(node_count)]
+    has_input = [False] * node_count
+    for source, target in edges:
+        if source == target or is_trigger[target]:
+            continue
+        successors[source].append(target)
+        has_input[target] = True
+
+    roots = [
+        node
+        for node in range(node_count)
+        if is_trigger[node] or not has_input[node]
+    ]
+    order, back_edges = _discovery_order(node_count, successors, roots)
+    if back_edges:
+        successors = [
+            [target for target in targets if (node, target) not in back_edges]
+            for node, targets in enumerate(successors)
+        ]
+
+    ranks = _longest_path_ranks(node_count, successors)
+    layers: list[list[int]] = [[] for _ in range(max(ranks, default=-1) + 1)]
+    for node in order:
+        layers[ranks[node]].append(node)
+
+    row = [0] * node_count
+    for layer in layers:
+        for position, node in enumerate(layer):
+            row[node] = position
+
+    if sweeps > 0 and len(layers) > 1:
+        predecessors: list[list[int]] = [[] for _ in range(node_count)]
+        for node, targets in enumerate(successors):
+            for target in targets:
+                predecessors[target].append(node)
+        for _ in range(sweeps):
+            _sweep(layers, row, predecessors, range(1, len(layers)))
+            _sweep(layers, row, successors, range(len(layers) - 2, -1, -1))
+
+    return [(ranks[node], row[node]) for node in range(node_count)]
@@ -0,0 +1,323 @@
+"""Redis mirror of the workflows deployed in n8n."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import redis
+import redis.asyncio
+
+from ..config import settings
+from ..core import metrics
+from ..core.cache import get_async_redis_client
+from ..core.serialization import dumps, loads
+from .n8n_client import N8NClient
+
+DOCUMENT_KEY = "flowforge:n8n:workflows"
+SUMMARY_KEY = "flowforge:n8n:workflows:summary"
+INDEX_KEY = "flowforge:n8n:workflows:updated"
+META_KEY = "flowforge:n8n:mirror"
+LOCK_KEY = "flowforge:n8n:mirror:lock"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MirrorSyncResult:
+    """What one sync pass changed."""
+    pages: int = 0
+    seen: int = 0
+    written: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+
+def _updated_score(workflow: dict[str, Any]) -> float:
+    stamp = workflow.get("updatedAt")
+    if not stamp:
+        return 0.0
+    try:
+        return datetime.fromisoformat(stamp).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _summary(workflow: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": workflow["id"],
+        "name": workflow.get("name"),
+        "active": workflow.get("active", False),
+        "createdAt": workflow.get("createdAt"),
+        "updatedAt": workflow.get("updatedAt"),
+        "tags": [
+            tag.get("name") for tag in workflow.get("tags") or ()
+            if isinstance(tag, dict)
+        ],
+        "nodeCount": len(workflow.get("nodes") or ()),
+    }
+
+
+def _text(value: bytes | str) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class N8NMirror:
+    """Local copy of n8n's workflows, kept current by incremental syncs.
+
+    Full documents, small summaries and an ``updatedAt`` index live in
+    Redis, so listings and lookups never touch n8n. A sync pages through
+    n8n's workflow list and rewrites only workflows whose ``updatedAt``
+    moved past the mirrored copy; ids that disappeared are dropped.
+
+    n8n's public API pages with an opaque cursor and has no ``updatedAt``
+    filter, so pages cannot be requested out of order. Instead the next
+    page is fetched while the current one is being written, overlapping
+    n8n and Redis round trips.
+    """
+
+    def __init__(
+        self,
+        client: redis.asyncio.Redis | None = None,
+        n8n: N8NClient | None = None,
+        max_staleness: float | None = None,
+        page_size: int | None = None,
+    ) -> None:
+        self._client = client
+        self._n8n = n8n or N8NClient()
+        self.max_staleness = (
+            max_staleness or settings.n8n_mirror_max_staleness_seconds
+        )
+        self._page_size = page_size or settings.n8n_mirror_page_size
+        self._task: asyncio.Task[None] | None = None
+        self._stop = asyncio.Event()
+        self._syncing: asyncio.Task[MirrorSyncResult] | None = None
+
+    @property
+    def client(self) -> redis.asyncio.Redis:
+        """Return the Redis connection, creating it on first use."""
+        if self._client is None:
+            self._client = get_async_redis_client()
+        return self._client
+
+    # --------------------------- reads -------------------------------------
+
+    async def list(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Return workflow summaries, most recently updated first."""
+        ids = await self.client.zrevrange(
+            INDEX_KEY,
+            offset,
+            offset + limit - 1,
+        )
+        if not ids:
+            return []
+        raw = await self.client.hmget(SUMMARY_KEY, ids)
+        return [loads(value) for value in raw if value is not None]
+
+    async def get(self, workflow_id: str) -> dict[str, Any] | None:
+        """Return the mirrored n8n document for ``workflow_id``."""
+        raw = await self.client.hget(DOCUMENT_KEY, workflow_id)
+        return None if raw is None else loads(raw)
+
+    async def status(self) -> dict[str, Any]:
+        """Return when the mirror last synced and whether that is too old."""
+        synced, count = await (
+            self.client.pipeline(transaction=False)
+            .hget(META_KEY, "syncedAt")
+            .zcard(INDEX_KEY)
+            .execute()
+        )
+        synced_at = float(synced) if synced is not None else None
+        return {
+            "syncedAt": synced_at,
+            "workflows": int(count),
+            "stale": (
+                synced_at is None
+                or time.time() - synced_at > self.max_staleness
+            ),
+        }
+
+    # --------------------------- sync --------------------------------------
+
+    async def sync(self) -> MirrorSyncResult:
+        """Bring the mirror up to date with n8n.
+
+        Concurrent calls in one process share a single pass.
+        """
+        if self._syncing is None or self._syncing.done():
+            self._syncing = asyncio.create_task(self._sync())
+        return await asyncio.shield(self._syncing)
+
+    async def _sync(self) -> MirrorSyncResult:
+        with metrics.MIRROR_SYNC.time():
+            return await self._sync_pages()
+
+    async def _sync_pages(self) -> MirrorSyncResult:
+        # The mirror is as fresh as the moment the first page was read.
+        synced_at = time.time()
+        started = time.perf_counter()
+        result = MirrorSyncResult()
+        known = {
+            _text(member): score
+            for member, score in await self.client.zrange(
+                INDEX_KEY,
+                0,
+                -1,
+                withscores=True,
+            )
+        }
+        seen: set[str] = set()
+        fetch: asyncio.Task[Any] | None = asyncio.create_task(
+            self._n8n.list_workflows(None, self._page_size)
+        )
+        try:
+            while fetch is not None:
+                workflows, cursor = await fetch
+                fetch = None
+                if cursor:
+                    fetch = asyncio.create_task(
+                        self._n8n.list_workflows(cursor, self._page_size)
+                    )
+                result.pages += 1
+                changed = []
+                for workflow in workflows:
+                    workflow_id = str(workflow["id"])
+                    seen.add(workflow_id)
+                    score = _updated_score(workflow)
+                    if known.get(workflow_id) != score:
+                        changed.append((workflow_id, score, workflow))
+                await self._write(changed)
+                result.written += len(changed)
+        finally:
+            if fetch is not None:
+                fetch.cancel()
+
+        removed = [
+            workflow_id for workflow_id in known if workflow_id not in seen
+        ]
+        await self._remove(removed)
+        result.seen = len(seen)
+        result.removed = len(removed)
+        await self.client.hset(
+            META_KEY,
+            mapping={"syncedAt": synced_at},
+        )
+        result.seconds = time.perf_counter() - started
+        metrics.MIRROR_SYNCED.labels("written").inc(result.written)
+        metrics.MIRROR_SYNCED.labels("removed").inc(result.removed)
+        metrics.MIRROR_SYNCED.labels("unchanged").inc(
+            result.seen - result.written
+        )
+        return result
+
+    async def _write(
+        self,
+        changed: Sequence[tuple[str, float, dict[str, Any]]],
+    ) -> None:
+        if not changed:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(
+            DOCUMENT_KEY,
+            mapping={
+                workflow_id: dumps(workflow)
+                for workflow_id, _, workflow in changed
+            },
+        )
+        pipe.hset(
+            SUMMARY_KEY,
+            mapping={
+                workflow_id: dumps(_summary(workflow))
+                for workflow_id, _, workflow in changed
+            },
+        )
+        pipe.zadd(
+            INDEX_KEY,
+            {workflow_id: score for workflow_id, score, _ in changed},
+        )
+        await pipe.execute()
+
+    async def _remove(self, workflow_ids: Sequence[str]) -> None:
+        if not workflow_ids:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hdel(DOCUMENT_KEY, *workflow_ids)
+        pipe.hdel(SUMMARY_KEY, *workflow_ids)
+        pipe.zrem(INDEX_KEY, *workflow_ids)
+        await pipe.execute()
+
+    # --------------------------- refresher ---------------------------------
+
+    def start(self) -> None:
+        """Start the background refresher."""
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresher and release the Redis connection."""
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        # Syncing twice per staleness bound keeps reads within it even
+        # when one pass is slow; the Redis lock lets only one process
+        # per interval do the work.
+        interval = self.max_staleness / 2
+        while not self._stop.is_set():
+            try:
+                if await self.client.set(
+                    LOCK_KEY,
+                    b"1",
+                    nx=True,
+                    px=int(interval * 1000),
+                ):
+                    result = await self.sync()
+                    logger.info(
+                        "n8n mirror synced: %d seen, %d written, %d removed"
+                        " in %.2fs",
+                        result.seen,
+                        result.written,
+                        result.removed,
+                        result.seconds,
+                    )
+            except Exception as exc:  # noqa: BLE001 - retried next interval
+                logger.warning("n8n mirror sync failed: %s", exc)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), interval)
+
+
+_mirror: N8NMirror | None = None
+
+
+def get_n8n_mirror() -> N8NMirror:
+    """Return the process-wide mirror, creating it lazily."""
+    global _mirror
+    if _mirror is None:
+        _mirror = N8NMirror()
+    return _mirror
+
+
+async def close_n8n_mirror() -> None:
+    """Stop the refresher; called from the app lifespan."""
+    global _mirror
+    if _mirror is not None:
+        await _mirror.stop()
+        _mirror = None
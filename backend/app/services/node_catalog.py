@@ -0,0 +1,356 @@
+"""Versioned catalog of supported n8n node types.
+
+The catalog lives in ``app/resources/node_catalog.json`` and is loaded once
+per process on first use. Each node type is compiled into an immutable
+:class:`NodeSpec`, so lookups are a single dict access and the catalog can
+be shared freely between threads and requests.
+
+Regenerate the data file from a running n8n editor with::
+
+    curl -s http://localhost:5678/types/nodes.json > nodes.json
+    python -m app.services.node_catalog nodes.json > catalog.json
+
+The export keeps only the types already listed in the current catalog,
+unless ``--all`` is passed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+CATALOG_PATH = Path(__file__).resolve().parents[1] / "resources" / (
+    "node_catalog.json"
+)
+CATALOG_VERSION = 1
+
+# Python types accepted for each n8n parameter type; ``None`` means any.
+_KIND_TYPES: dict[str, tuple[type, ...] | None] = {
+    "string": (str,),
+    "options": (str,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "collection": (dict,),
+    "fixedCollection": (dict,),
+    "resourceLocator": (str, dict),
+    "json": None,
+}
+
+
+class NodeCatalogError(RuntimeError):
+    """Raised when the catalog file is missing or has the wrong version."""
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterIssue:
+    """One parameter that does not match its node type's schema."""
+    parameter: str
+    code: str
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterSpec:
+    """Compiled schema of a single node parameter."""
+    name: str
+    kind: str
+    types: tuple[type, ...] | None
+    options: frozenset[str] | None
+    required: bool
+
+    def check(self, value: Any) -> ParameterIssue | None:
+        """Return the problem with ``value``, or ``None`` if it fits."""
+        if isinstance(value, str) and value.startswith("="):
+            return None  # expressions are resolved by n8n at run time
+        if self.types is not None and (
+            not isinstance(value, self.types)
+            or (bool not in self.types and isinstance(value, bool))
+        ):
+            return ParameterIssue(
+                self.name,
+                "parameter_type",
+                f"'{self.name}' must be a {self.kind} value",
+            )
+        if self.options is not None and value not in self.options:
+            return ParameterIssue(
+                self.name,
+                "parameter_option",
+                f"'{self.name}' must be one of {sorted(self.options)}",
+            )
+        return None
+
+    def coerce(self, value: Any) -> Any:
+        """Convert LLM-typical string scalars into the declared type."""
+        if not isinstance(value, str) or value.startswith("="):
+            return value
+        if self.kind == "number":
+            try:
+                number = float(value)
+            except ValueError:
+                return value
+            return int(number) if number.is_integer() else number
+        if self.kind == "boolean" and value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        return value
+
+
+@dataclass(frozen=True, slots=True)
+class NodeSpec:
+    """Compiled description of one n8n node type."""
+    type: str
+    display_name: str
+    default_version: int
+    versions: frozenset[int]
+    trigger: bool
+    max_inputs: int
+    max_outputs: int
+    credential_types: tuple[str, ...]
+    credentials_required: bool
+    promptable: bool
+    parameters: Mapping[str, ParameterSpec]
+    # Parameters whose string values may need converting.
+    coercible: tuple[ParameterSpec, ...] = ()
+
+    def coerce_version(self, value: Any) -> int:
+        """Return ``value`` as a supported typeVersion, else the default."""
+        try:
+            version = int(value)
+        except (TypeError, ValueError):
+            return self.default_version
+        if self.versions and version not in self.versions:
+            return self.default_version
+        return version
+
+    def check_parameters(
+        self,
+        parameters: Mapping[str, Any],
+    ) -> list[ParameterIssue]:
+        """Validate known parameters; unknown keys are left to n8n."""
+        issues: list[ParameterIssue] = []
+        for name, spec in self.parameters.items():
+            if name not in parameters:
+                if spec.required:
+                    issues.append(
+                        ParameterIssue(
+                            name,
+                            "parameter_missing",
+                            f"'{name}' is required",
+                        )
+                    )
+                continue
+            issue = spec.check(parameters[name])
+            if issue is not None:
+                issues.append(issue)
+        return issues
+
+    def coerce_parameters(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        """Coerce known scalar parameters in place and return the dict."""
+        for spec in self.coercible:
+            value = parameters.get(spec.name)
+            if isinstance(value, str):
+                parameters[spec.name] = spec.coerce(value)
+        return parameters
+
+
+class NodeCatalog:
+    """Read-only index of node specs keyed by type and alias."""
+
+    def __init__(
+        self,
+        specs: Iterable[NodeSpec],
+        aliases: Mapping[str, str] | None = None,
+        version: int = CATALOG_VERSION,
+        n8n_version: str = "",
+    ) -> None:
+        self._specs: Mapping[str, NodeSpec] = MappingProxyType(
+            {spec.type: spec for spec in specs}
+        )
+        self._aliases: Mapping[str, str] = MappingProxyType(
+            dict(aliases or {})
+        )
+        self.version = version
+        self.n8n_version = n8n_version
+        self.trigger_types = frozenset(
+            spec.type for spec in self._specs.values() if spec.trigger
+        )
+
+    def __contains__(self, node_type: object) -> bool:
+        return node_type in self._specs or node_type in self._aliases
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def canonical(self, node_type: str) -> str:
+        """Resolve an alias to the type that replaces it."""
+        return self._aliases.get(node_type, node_type)
+
+    def get(self, node_type: str) -> NodeSpec | None:
+        """Return the spec for ``node_type`` after alias resolution."""
+        return self._specs.get(self._aliases.get(node_type, node_type))
+
+    def promptable_types(self) -> list[str]:
+        """Node types offered to the model, in catalog order."""
+        return [spec.type for spec in self._specs.values() if spec.promptable]
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> NodeCatalog:
+        """Compile a parsed catalog document."""
+        version = document.get("catalogVersion")
+        if version != CATALOG_VERSION:
+            raise NodeCatalogError(
+                f"Unsupported node catalog version {version!r};"
+                f" expected {CATALOG_VERSION}."
+            )
+        specs = [
+            _compile_node(node_type, entry)
+            for node_type, entry in document["nodes"].items()
+        ]
+        return cls(
+            specs,
+            aliases=document.get("aliases"),
+            version=version,
+            n8n_version=document.get("n8nVersion", ""),
+        )
+
+    @classmethod
+    def load(cls, path: Path = CATALOG_PATH) -> NodeCatalog:
+        """Read and compile the catalog file at ``path``."""
+        try:
+            document = json.loads(path.read_text(encoding="utf-8"))
+        except OSError as exc:
+            raise NodeCatalogError(
+                f"Node catalog not readable at {path}: {exc}"
+            ) from exc
+        return cls.from_document(document)
+
+
+def _compile_node(node_type: str, entry: Mapping[str, Any]) -> NodeSpec:
+    parameters = {
+        name: ParameterSpec(
+            name=name,
+            kind=raw["type"],
+            types=_KIND_TYPES.get(raw["type"]),
+            options=(
+                frozenset(raw["options"]) if raw.get("options") else None
+            ),
+            required=bool(raw.get("required")),
+        )
+        for name, raw in entry.get("parameters", {}).items()
+    }
+    return NodeSpec(
+        type=node_type,
+        display_name=entry.get("displayName", node_type),
+        default_version=int(entry["defaultVersion"]),
+        versions=frozenset(int(v) for v in entry.get("versions", ())),
+        trigger=bool(entry.get("trigger")),
+        max_inputs=int(entry.get("inputs", 1)),
+        max_outputs=int(entry.get("outputs", 1)),
+        credential_types=tuple(entry.get("credentials", ())),
+        credentials_required=bool(entry.get("credentialsRequired")),
+        promptable=bool(entry.get("prompt")),
+        parameters=MappingProxyType(parameters),
+        coercible=tuple(
+            spec
+            for spec in parameters.values()
+            if spec.kind in ("number", "boolean")
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_node_catalog() -> NodeCatalog:
+    """Return the process-wide catalog, loading it on first use."""
+    return NodeCatalog.load()
+
+
+# --------------------------- export from n8n -------------------------------
+
+def catalog_entry_from_n8n(description: Mapping[str, Any]) -> dict[str, Any]:
+    """Translate one n8n node type description into a catalog entry."""
+    raw_versions = description.get("version", 1)
+    if not isinstance(raw_versions, list):
+        raw_versions = [raw_versions]
+    versions = sorted({int(v) for v in raw_versions})
+    default = description.get("defaultVersion", max(raw_versions))
+
+    parameters: dict[str, dict[str, Any]] = {}
+    for prop in description.get("properties", ()):
+        kind = prop.get("type")
+        if kind not in _KIND_TYPES:
+            continue
+        # n8n repeats a property per displayOptions branch; merge them.
+        spec = parameters.setdefault(prop["name"], {"type": kind})
+        if kind == "options":
+            values = {
+                option["value"]
+                for option in prop.get("options", ())
+                if isinstance(option.get("value"), str)
+            }
+            spec["options"] = sorted(set(spec.get("options", ())) | values)
+        if prop.get("required") and not prop.get("displayOptions"):
+            spec["required"] = True
+
+    outputs = description.get("outputs", ["main"])
+    inputs = description.get("inputs", ["main"])
+    credentials = description.get("credentials", ())
+    return {
+        "displayName": description.get("displayName", description["name"]),
+        "defaultVersion": int(default),
+        "versions": versions,
+        "trigger": "trigger" in description.get("group", ()),
+        "inputs": len(inputs) if isinstance(inputs, list) else 1,
+        "outputs": len(outputs) if isinstance(outputs, list) else 1,
+        "credentials": [credential["name"] for credential in credentials],
+        "credentialsRequired": any(
+            credential.get("required") for credential in credentials
+        ),
+        "prompt": False,
+        "parameters": parameters,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Export ``/types/nodes.json`` from n8n as a catalog document."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("nodes", type=Path, help="n8n /types/nodes.json")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="export every node type instead of the current selection",
+    )
+    args = parser.parse_args(argv)
+
+    current = json.loads(CATALOG_PATH.read_text(encoding="utf-8"))
+    descriptions = json.loads(args.nodes.read_text(encoding="utf-8"))
+    nodes: dict[str, Any] = {}
+    for description in descriptions:
+        name = description["name"]
+        if not args.all and name not in current["nodes"]:
+            continue
+        entry = catalog_entry_from_n8n(description)
+        previous = current["nodes"].get(name, {})
+        entry["prompt"] = previous.get("prompt", False)
+        if name in nodes:  # one description per version in newer n8n
+            entry["versions"] = sorted(
+                {*nodes[name]["versions"], *entry["versions"]}
+            )
+            entry["defaultVersion"] = max(
+                nodes[name]["defaultVersion"],
+                entry["defaultVersion"],
+            )
+        nodes[name] = entry
+
+    document = {**current, "nodes": nodes}
+    json.dump(document, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Prompt token budgeting and history compaction for chat generations."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from ..config import Settings
+from ..schemas.workflow import ChatMessage
+
+# Words, numbers and single punctuation marks; long runs split every
+# four characters, roughly how BPE vocabularies cut identifiers and JSON.
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_MESSAGE_OVERHEAD = 4
+_SUMMARY_HEADER = "Summary of earlier conversation (turns {first}-{last}):"
+
+
+@lru_cache(maxsize=4096)
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of ``text`` without a provider tokenizer."""
+    return sum(
+        math.ceil(len(piece) / 4) for piece in _TOKEN_PATTERN.findall(text)
+    )
+
+
+def message_tokens(message: dict[str, str]) -> int:
+    """Estimate one chat message including its framing overhead."""
+    return _MESSAGE_OVERHEAD + estimate_tokens(message["content"])
+
+
+# --------------------------- usage accounting ------------------------------
+
+@dataclass
+class PromptUsage:
+    """Prompt accounting collected while serving one request."""
+    estimated_tokens: int = 0
+    compacted_turns: int = 0
+    prompt_tokens: int = 0
+    cache_hit_tokens: int = 0
+    cache_miss_tokens: int = 0
+    calls: int = field(default=0, repr=False)
+
+    def record_response(self, usage: Any) -> None:
+        """Add the provider-reported usage of one completion."""
+        if usage is None:
+            return
+        self.calls += 1
+        self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+        self.cache_hit_tokens += (
+            getattr(usage, "prompt_cache_hit_tokens", 0) or 0
+        )
+        self.cache_miss_tokens += (
+            getattr(usage, "prompt_cache_miss_tokens", 0) or 0
+        )
+
+    def as_headers(self) -> dict[str, str]:
+        """Render the usage as ``X-Prompt-*`` response headers."""
+        return {
+            "X-Prompt-Tokens-Estimated": str(self.estimated_tokens),
+            "X-Prompt-Compacted-Turns": str(self.compacted_turns),
+            "X-Prompt-Tokens": str(self.prompt_tokens),
+            "X-Prompt-Cache-Hit-Tokens": str(self.cache_hit_tokens),
+            "X-Prompt-Cache-Miss-Tokens": str(self.cache_miss_tokens),
+        }
+
+
+_current_usage: ContextVar[PromptUsage | None] = ContextVar(
+    "prompt_usage",
+    default=None,
+)
+
+
+@contextmanager
+def track_prompt_usage() -> Iterator[PromptUsage]:
+    """Collect prompt usage for the calls made inside the block."""
+    usage = PromptUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def current_prompt_usage() -> PromptUsage | None:
+    """Return the usage collector of the current request, if any."""
+    return _current_usage.get()
+
+
+# --------------------------- budgeting -------------------------------------
+
+@dataclass
+class PromptPlan:
+    """Messages to send plus the accounting behind them."""
+    messages: list[dict[str, str]]
+    estimated_tokens: int
+    compacted_turns: int
+
+
+class PromptBudget:
+    """Fit a conversation under a prompt token budget.
+
+    The stable prefix (system and memory prompts) is always sent first and
+    byte-for-byte unchanged, so provider-side prefix caching can hit.
+    When the history does not fit, the oldest turns are folded into
+    summaries, in fixed chunks counted from the start of the conversation.
+    A chunk's summary therefore never changes once written, and the
+    summaries extend the cacheable prefix from one turn to the next. The
+    most recent ``keep_recent_turns`` turns are always sent verbatim.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 24_000,
+        keep_recent_turns: int = 6,
+        chunk_turns: int = 8,
+        summary_chars_per_turn: int = 240,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.keep_recent_turns = max(0, keep_recent_turns)
+        self.chunk_turns = max(1, chunk_turns)
+        self.summary_chars_per_turn = summary_chars_per_turn
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> PromptBudget:
+        """Build a budget from the ``prompt_*`` settings."""
+        return cls(
+            max_tokens=settings.prompt_max_tokens,
+            keep_recent_turns=settings.prompt_keep_recent_turns,
+            chunk_turns=settings.prompt_compaction_chunk_turns,
+            summary_chars_per_turn=settings.prompt_summary_chars_per_turn,
+        )
+
+    def plan(
+        self,
+        prefix: Sequence[dict[str, str]],
+        history: Sequence[ChatMessage],
+    ) -> PromptPlan:
+        """Return the messages to send for ``history`` after ``prefix``."""
+        turns = [
+            {"role": message.role, "content": message.content}
+            for message in history
+        ]
+        prefix_tokens = sum(message_tokens(message) for message in prefix)
+        turn_tokens = [message_tokens(turn) for turn in turns]
+        total = prefix_tokens + sum(turn_tokens)
+
+        compactable = max(0, len(turns) - self.keep_recent_turns)
+        chunks = compactable // self.chunk_turns
+        summaries: list[dict[str, str]] = []
+        compacted = 0
+        for chunk in range(chunks):
+            if total <= self.max_tokens:
+                break
+            start = chunk * self.chunk_turns
+            end = start + self.chunk_turns
+            summary = self._summarize(turns[start:end], start)
+            summaries.append(summary)
+            total += message_tokens(summary) - sum(turn_tokens[start:end])
+            compacted = end
+
+        messages = [dict(message) for message in prefix]
+        messages.extend(summaries)
+        messages.extend(turns[compacted:])
+        return PromptPlan(
+            messages=messages,
+            estimated_tokens=total,
+            compacted_turns=compacted,
+        )
+
+    def _summarize(
+        self,
+        turns: Sequence[dict[str, str]],
+        offset: int,
+    ) -> dict[str, str]:
+        limit = self.summary_chars_per_turn
+        lines = [
+            _SUMMARY_HEADER.format(first=offset + 1, last=offset + len(turns))
+        ]
+        for turn in turns:
+            content = " ".join(turn["content"].split())
+            if len(content) > limit:
+                content = content[:limit].rstrip() + "..."
+            lines.append(f"- {turn['role']}: {content}")
+        return {"role": "system", "content": "\n".join(lines)}
@@ -0,0 +1,65 @@
+"""Async persistence helpers for application users."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.security import (
+    UNKNOWN_USER_HASH,
+    hash_password,
+    verify_password,
+)
+from ..models.user import User
+
+
+class EmailTakenError(ValueError):
+    """Raised when registering an email that already has an account."""
+
+
+def _normalize(email: str) -> str:
+    return email.strip().lower()
+
+
+async def create_user(
+    session: AsyncSession,
+    email: str,
+    password: str,
+) -> User:
+    """Persist a user with a hashed password under a fresh id."""
+    user = User(
+        id=uuid.uuid4().hex,
+        email=_normalize(email),
+        hashed_password=await asyncio.to_thread(hash_password, password),
+    )
+    session.add(user)
+    try:
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        raise EmailTakenError(f"{user.email} is already registered") from exc
+    return user
+
+
+async def authenticate(
+    session: AsyncSession,
+    email: str,
+    password: str,
+) -> User | None:
+    """Return the user if ``password`` matches, otherwise ``None``.
+
+    Unknown emails are checked against a dummy hash so both misses take
+    as long as a wrong password.
+    """
+    user = await session.scalar(
+        select(User).where(User.email == _normalize(email))
+    )
+    hashed = UNKNOWN_USER_HASH if user is None else user.hashed_password
+    matches = await asyncio.to_thread(verify_password, password, hashed)
+    if user is None or not matches:
+        return None
+    return user
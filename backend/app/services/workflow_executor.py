@@ -1,25 +1,72 @@
 """Coordinator combining NLP parsing and AI workflow generation."""
 
+from collections.abc import AsyncIterator
+
 from fastapi import HTTPException
+from pydantic import BaseModel
 
+from ..config import Settings
+from ..core import metrics
 from ..schemas.workflow import ChatRequest, WorkflowBlueprint
-from .deepseek_service import DeepSeekService
+from .blueprint_cache import BlueprintCache, build_cache_key
+from .deepseek_service import MEMORY_PRESET, SYSTEM_INSTRUCTION
+from .llm_router import LLMRouter
 from .nlp_parser import parse_prompt
 
 
 class WorkflowExecutor:
     """Facade orchestrating prompt parsing and blueprint generation."""
     def __init__(self) -> None:
-        self.ai_service = DeepSeekService()
+        self.ai_service = LLMRouter.from_settings(Settings())
+        self.cache = BlueprintCache()
 
     async def generate_workflow(
         self,
         payload: ChatRequest,
     ) -> WorkflowBlueprint:
-        """Parse the prompt and delegate generation to the AI service."""
+        """Parse the prompt and delegate generation to the AI service.
+
+        Identical conversations are answered from the blueprint cache and
+        concurrent duplicates share one upstream call.
+        """
         parsed_prompt = parse_prompt(payload)
         _ = parsed_prompt  # placeholder until prompt enrichment is applied
+        cache_key = self._cache_key(payload)
         try:
-            return await self.ai_service.generate_workflow(payload)
+            with metrics.GENERATE_IN_FLIGHT.track_inprogress():
+                return await self.cache.get_or_generate(
+                    cache_key,
+                    lambda: self.ai_service.generate_workflow(payload),
+                )
         except RuntimeError as exc:
             raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    async def stream_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> AsyncIterator[tuple[str, BaseModel]]:
+        """Stream blueprint nodes and edges, replaying cached results."""
+        cache_key = self._cache_key(payload)
+        with metrics.STREAM_IN_FLIGHT.track_inprogress():
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                for step in cached.steps:
+                    yield "node", step
+                for edge in cached.edges:
+                    yield "edge", edge
+                yield "blueprint", cached
+                return
+
+            stream = self.ai_service.stream_workflow(payload)
+            async for event, model in stream:
+                if isinstance(model, WorkflowBlueprint):
+                    await self.cache.set(cache_key, model)
+                yield event, model
+
+    def _cache_key(self, payload: ChatRequest) -> str:
+        return build_cache_key(
+            payload,
+            self.ai_service.model,
+            SYSTEM_INSTRUCTION,
+            MEMORY_PRESET,
+        )
@@ -0,0 +1,151 @@
+"""Compact index-based graph of a blueprint, shared by converter passes.
+
+Steps are numbered once in blueprint order and ``blueprint.edges`` is
+walked once, resolving both endpoints to those numbers and noting the
+few edges later passes must look at again. Edge endpoints live in
+parallel int columns and outgoing edges are grouped by source in CSR
+form (``offsets`` into ``out_edges`` and ``adjacent``), so layout,
+connection building and validation work from integer columns and touch
+an edge object only to report on it or to read a non-default port.
+
+Every int column is an ``array("i")``: four bytes per entry and no int
+object behind it, about half what a list costs. Reads box a fresh int,
+which makes validation slightly slower than with lists.
+
+``python -m benchmarks.bench_workflow_graph`` compares this with the
+per-pass indexes it replaced.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from functools import partial
+
+from ..schemas.workflow import WorkflowBlueprint, WorkflowEdge, WorkflowNode
+
+# Marks an edge end that does not name a step.
+MISSING = -1
+
+
+class WorkflowGraph:
+    """Steps and edges of one blueprint as dense integer columns.
+
+    Node ``i`` is ``blueprint.steps[i]``. A step id used more than once
+    resolves to its first step; the later ones are listed in
+    ``duplicates`` and have no edges. Edge ``e`` is
+    ``blueprint.edges[e]``; ``sources[e]`` and ``targets[e]`` are node
+    indices or :data:`MISSING`. Only edges with both ends resolved
+    appear in the CSR adjacency, in their original order per source:
+    row ``i`` spans ``offsets[i]:offsets[i + 1]`` of ``out_edges`` (edge
+    indices) and ``adjacent`` (their targets).
+
+    ``duplicate_edges`` lists edges whose id an earlier edge already
+    used. ``ported[e]`` is 1 when edge ``e`` has a connection type other
+    than ``main`` or a non-zero port; every other edge is ``main`` from
+    output 0 to input 0.
+    """
+
+    __slots__ = (
+        "ids",
+        "names",
+        "duplicates",
+        "edges",
+        "sources",
+        "targets",
+        "duplicate_edges",
+        "ported",
+        "offsets",
+        "out_edges",
+        "adjacent",
+    )
+
+    def __init__(
+        self,
+        steps: Sequence[WorkflowNode],
+        edges: Sequence[WorkflowEdge],
+    ) -> None:
+        count = len(steps)
+        self.ids = [step.id for step in steps]
+        self.names = [step.name for step in steps]
+        # Built back to front so a repeated id keeps its first index.
+        index = dict(zip(reversed(self.ids), range(count - 1, -1, -1)))
+        self.duplicates: list[int] = []
+        if len(index) != count:
+            self.duplicates = [
+                node
+                for node, step_id in enumerate(self.ids)
+                if index[step_id] != node
+            ]
+
+        self.edges = edges
+        get = index.get
+        sources = array("i")
+        targets = array("i")
+        add_source = sources.append
+        add_target = targets.append
+        edge_ids: set[str] = set()
+        self.duplicate_edges: list[int] = []
+        self.ported = ported = bytearray(len(edges))
+        for position, edge in enumerate(edges):
+            add_source(get(edge.source, MISSING))
+            add_target(get(edge.target, MISSING))
+            if edge.id in edge_ids:
+                self.duplicate_edges.append(position)
+            else:
+                edge_ids.add(edge.id)
+            if (
+                edge.source_output_index
+                or edge.target_input_index
+                or edge.connection_type not in (None, "main")
+            ):
+                ported[position] = 1
+        del edge_ids  # not needed while sorting
+        self.sources = sources
+        self.targets = targets
+
+        resolved: Sequence[int] = range(len(edges))
+        if MISSING in sources or MISSING in targets:
+            resolved = [
+                edge
+                for edge in resolved
+                if sources[edge] != MISSING and targets[edge] != MISSING
+            ]
+        # A stable sort by source keeps each source's edges in order, and
+        # a row starts where its source first appears in sorted order.
+        self.out_edges = array(
+            "i", sorted(resolved, key=sources.__getitem__)
+        )
+        self.adjacent = array("i", map(targets.__getitem__, self.out_edges))
+        row_start = partial(
+            bisect_left, self.out_edges, key=sources.__getitem__
+        )
+        self.offsets = array("i", map(row_start, range(count + 1)))
+
+    @classmethod
+    def from_blueprint(cls, blueprint: WorkflowBlueprint) -> WorkflowGraph:
+        """Index ``blueprint``'s steps and resolve its edges."""
+        return cls(blueprint.steps, blueprint.edges)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def edges_from(self, node: int) -> Sequence[int]:
+        """Return the indices of resolved edges leaving ``node``."""
+        return self.out_edges[self.offsets[node]:self.offsets[node + 1]]
+
+    def successors(self, node: int) -> Sequence[int]:
+        """Return the target of every resolved edge leaving ``node``."""
+        return self.adjacent[self.offsets[node]:self.offsets[node + 1]]
+
+    def pairs(self) -> Iterator[tuple[int, int]]:
+        """Iterate ``(source, target)`` for every resolved edge, in order."""
+        pairs = zip(self.sources, self.targets)
+        if len(self.out_edges) == len(self.edges):
+            return pairs
+        return (
+            (source, target)
+            for source, target in pairs
+            if source != MISSING and target != MISSING
+        )
@@ -0,0 +1,179 @@
+"""Async persistence helpers for stored workflow blueprints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.workflow import Workflow
+from ..schemas.workflow import WorkflowBlueprint, WorkflowPage, WorkflowSummary
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Listing reads only these columns; the JSONB blueprint stays on disk.
+_SUMMARY_COLUMNS = (
+    Workflow.id,
+    Workflow.title,
+    Workflow.description,
+    Workflow.created_at,
+)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+# --------------------------- cursors ---------------------------------------
+
+def encode_cursor(created_at: datetime, workflow_id: str) -> str:
+    """Return an opaque cursor pointing just past the given row."""
+    raw = f"{created_at.isoformat()}|{workflow_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Split a cursor from :func:`encode_cursor` back into its key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        stamp, workflow_id = raw.split("|", 1)
+        return datetime.fromisoformat(stamp), workflow_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+
+
+# --------------------------- queries ---------------------------------------
+
+def build_list_query(
+    owner_id: str,
+    limit: int,
+    cursor: tuple[datetime, str] | None = None,
+) -> Select[Any]:
+    """Newest-first summary page that seeks via ``(created_at, id)``.
+
+    The row comparison lets Postgres walk ``ix_workflows_owner_created_id``
+    backwards from the cursor, so every page costs the same regardless of
+    its depth. One extra row is fetched to tell whether more pages exist.
+    """
+    query = select(*_SUMMARY_COLUMNS).where(Workflow.owner_id == owner_id)
+    if cursor is not None:
+        query = query.where(
+            tuple_(Workflow.created_at, Workflow.id) < tuple_(*cursor)
+        )
+    return query.order_by(
+        Workflow.created_at.desc(),
+        Workflow.id.desc(),
+    ).limit(limit + 1)
+
+
+async def list_workflows(
+    session: AsyncSession,
+    owner_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> WorkflowPage:
+    """Return one page of workflow summaries for ``owner_id``."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    key = decode_cursor(cursor) if cursor else None
+    result = await session.execute(build_list_query(owner_id, limit, key))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return WorkflowPage(
+        items=[
+            WorkflowSummary(
+                id=row.id,
+                title=row.title,
+                description=row.description,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+async def get_workflow(
+    session: AsyncSession,
+    owner_id: str,
+    workflow_id: str,
+) -> WorkflowBlueprint | None:
+    """Load one stored blueprint, scoped to its owner."""
+    blueprint = await session.scalar(
+        select(Workflow.blueprint).where(
+            Workflow.owner_id == owner_id,
+            Workflow.id == workflow_id,
+        )
+    )
+    if blueprint is None:
+        return None
+    return WorkflowBlueprint.model_validate(blueprint)
+
+
+async def create_workflow(
+    session: AsyncSession,
+    owner_id: str,
+    blueprint: WorkflowBlueprint,
+) -> WorkflowBlueprint:
+    """Persist ``blueprint`` under a fresh id and return the stored copy."""
+    stored = blueprint.model_copy(update={"id": uuid.uuid4().hex})
+    session.add(
+        Workflow(
+            id=stored.id,
+            owner_id=owner_id,
+            title=stored.title,
+            description=stored.description,
+            blueprint=stored.model_dump(mode="json", by_alias=True),
+        )
+    )
+    await session.commit()
+    return stored
+
+
+async def update_workflow(
+    session: AsyncSession,
+    owner_id: str,
+    workflow_id: str,
+    blueprint: WorkflowBlueprint,
+) -> WorkflowBlueprint | None:
+    """Replace a stored blueprint; return ``None`` if it does not exist."""
+    stored = blueprint.model_copy(update={"id": workflow_id})
+    result = await session.execute(
+        update(Workflow)
+        .where(Workflow.owner_id == owner_id, Workflow.id == workflow_id)
+        .values(
+            title=stored.title,
+            description=stored.description,
+            blueprint=stored.model_dump(mode="json", by_alias=True),
+        )
+    )
+    await session.commit()
+    return stored if result.rowcount else None
+
+
+async def delete_workflow(
+    session: AsyncSession,
+    owner_id: str,
+    workflow_id: str,
+) -> bool:
+    """Delete a stored blueprint; return whether a row was removed."""
+    result = await session.execute(
+        delete(Workflow).where(
+            Workflow.owner_id == owner_id,
+            Workflow.id == workflow_id,
+        )
+    )
+    await session.commit()
+    return bool(result.rowcount)
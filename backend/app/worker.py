@@ -0,0 +1,36 @@
+"""Entrypoint for generation worker processes.
+
+Run one or more per node with ``python -m app.worker``; every worker
+joins the same Redis consumer group.
+"""
+
+import asyncio
+import logging
+import signal
+
+from .config import Settings
+from .services.generation_worker import GenerationWorker
+from .services.job_queue import GenerationJobQueue
+from .services.llm_router import LLMRouter
+from .services.n8n_client import close_http_client
+
+
+async def main() -> None:
+    """Consume generation jobs until SIGINT or SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    queue = GenerationJobQueue()
+    worker = GenerationWorker(queue, LLMRouter.from_settings(Settings()))
+    try:
+        await worker.run(stop)
+    finally:
+        await queue.close()
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""Benchmark the JSON paths used by large workflow responses.
+
+Compares the stdlib ``json`` module and FastAPI's default response
+pipeline with the orjson-backed helpers in ``app.core.serialization`` on
+the workflow fixtures shipped in the repo and on a large synthetic
+conversion. Run from ``backend/``::
+
+    python -m benchmarks.bench_json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core import serialization
+from app.core.serialization import FastJSONResponse
+from app.schemas.workflow import WorkflowBlueprint
+from app.services.n8n_converter import to_n8n_payload
+from benchmarks.converter_suite import (
+    REPO_ROOT,
+    _read_json,
+    fixture_blueprints,
+    synthetic_blueprint,
+)
+
+_DOCUMENT = TypeAdapter(dict[str, object])
+_BLUEPRINT = TypeAdapter(WorkflowBlueprint)
+
+
+def _convert_response_default(content: dict[str, Any]) -> bytes:
+    """What FastAPI did for ``/n8n/convert`` with a dict response model."""
+    validated = _DOCUMENT.validate_python(content)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def _convert_response_fast(content: dict[str, Any]) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def _blueprint_response_default(blueprint: WorkflowBlueprint) -> bytes:
+    """FastAPI's response-model path for ``/chat/generate-workflow``."""
+    dumped = blueprint.model_dump(by_alias=True)
+    validated = _BLUEPRINT.validate_python(dumped)
+    plain = _BLUEPRINT.dump_python(validated, mode="json", by_alias=True)
+    return JSONResponse(plain).body
+
+
+def _blueprint_response_fast(blueprint: WorkflowBlueprint) -> bytes:
+    return blueprint.model_dump_json(by_alias=True).encode()
+
+
+def _bench(func: Any, data: Any, number: int) -> float:
+    seconds = min(timeit.repeat(lambda: func(data), number=number, repeat=7))
+    return seconds / number * 1e6
+
+
+def _row(label: str, size: int, baseline: float, fast: float) -> None:
+    print(
+        f"  {label:<34} {size / 1024:8.1f} KiB "
+        f"{baseline:10.1f} us {fast:10.1f} us {baseline / fast:8.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument(
+        "--synthetic-size",
+        type=int,
+        default=1000,
+        help="steps in the synthetic conversion case",
+    )
+    args = parser.parse_args()
+
+    print(f"orjson available: {serialization.orjson is not None}")
+    print(f"  {'case':<34} {'size':>12} {'stdlib':>13} {'fast':>13}")
+
+    documents = {
+        name: _read_json(REPO_ROOT / name)
+        for name in (
+            "converted_workflow.json",
+            "n8n_saved_workflow.json",
+            "workflows/zendesk_auto_triage.json",
+        )
+        if (REPO_ROOT / name).exists()
+    }
+    blueprints = fixture_blueprints()
+    synthetic = f"synthetic:{args.synthetic_size}"
+    blueprints[synthetic] = synthetic_blueprint(
+        "random-dag",
+        args.synthetic_size,
+    )
+    documents[synthetic] = to_n8n_payload(blueprints[synthetic])
+
+    print("parse (json.loads vs serialization.loads):")
+    for name, document in documents.items():
+        text = json.dumps(document)
+        assert serialization.loads(text) == json.loads(text)
+        _row(
+            name,
+            len(text),
+            _bench(json.loads, text, args.number),
+            _bench(serialization.loads, text, args.number),
+        )
+
+    print("/n8n/convert response (default pipeline vs FastJSONResponse):")
+    for name, document in documents.items():
+        content = {"workflow": document}
+        body = _convert_response_fast(content)
+        assert json.loads(body) == json.loads(
+            _convert_response_default(content)
+        )
+        _row(
+            name,
+            len(body),
+            _bench(_convert_response_default, content, args.number),
+            _bench(_convert_response_fast, content, args.number),
+        )
+
+    print("/chat/generate-workflow response (response model vs dump_json):")
+    for name, blueprint in blueprints.items():
+        body = _blueprint_response_fast(blueprint)
+        assert json.loads(body) == json.loads(
+            _blueprint_response_default(blueprint)
+        )
+        _row(
+            name,
+            len(body),
+            _bench(_blueprint_response_default, blueprint, args.number),
+            _bench(_blueprint_response_fast, blueprint, args.number),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark n8n deploy latency with and without connection pooling.
+
+A local HTTP/1.1 stand-in mimics ``POST /api/v1/workflows`` so the numbers
+only reflect client-side connection handling. Run from ``backend/``::
+
+    python -m benchmarks.bench_n8n_deploy --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.schemas.workflow import WorkflowBlueprint
+from app.services.n8n_client import (
+    N8NClient,
+    close_http_client,
+    get_http_client,
+)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment to avoid delayed-ACK stalls.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib hook name
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps({"id": "wf-1", "active": False}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        return
+
+
+def _blueprint(steps: int) -> WorkflowBlueprint:
+    return WorkflowBlueprint.model_validate(
+        {
+            "id": "bench",
+            "title": "Bench",
+            "description": "Deploy benchmark",
+            "steps": [
+                {
+                    "id": f"step-{index}",
+                    "name": f"Step {index}",
+                    "type": "n8n-nodes-base.code",
+                    "parameters": {"jsCode": "return items;"},
+                }
+                for index in range(steps)
+            ],
+            "edges": [
+                {
+                    "id": f"edge-{index}",
+                    "source": f"step-{index}",
+                    "target": f"step-{index + 1}",
+                }
+                for index in range(steps - 1)
+            ],
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+
+async def _run_per_call_clients(
+    base_url: str,
+    blueprint: WorkflowBlueprint,
+    requests: int,
+) -> list[float]:
+    """Previous behaviour: a fresh AsyncClient for every deploy."""
+    latencies: list[float] = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as http_client:
+            client = N8NClient(base_url=base_url, client=http_client)
+            await client.deploy_workflow(blueprint)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _run_pooled_client(
+    base_url: str,
+    blueprint: WorkflowBlueprint,
+    requests: int,
+) -> list[float]:
+    """Current behaviour: the shared, keep-alive connection pool."""
+    client = N8NClient(base_url=base_url)
+    get_http_client()
+    latencies: list[float] = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.deploy_workflow(blueprint)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await close_http_client()
+    return latencies
+
+
+def _summarize(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(
+        f"{label:<18} mean={statistics.mean(ordered) * 1000:7.3f}ms "
+        f"p50={statistics.median(ordered) * 1000:7.3f}ms "
+        f"p95={p95 * 1000:7.3f}ms"
+    )
+
+
+async def _main(requests: int, steps: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    blueprint = _blueprint(steps)
+    try:
+        before = await _run_per_call_clients(base_url, blueprint, requests)
+        after = await _run_pooled_client(base_url, blueprint, requests)
+    finally:
+        server.shutdown()
+
+    _summarize("per-call client", before)
+    _summarize("pooled client", after)
+    speedup = statistics.mean(before) / statistics.mean(after)
+    print(f"mean speedup: {speedup:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_main(args.requests, args.steps))
+
+
+if __name__ == "__main__":
+    main()
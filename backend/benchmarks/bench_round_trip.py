@@ -0,0 +1,127 @@
+"""Benchmark the blueprint -> n8n -> blueprint -> n8n round trip.
+
+For the repo's workflow fixtures and synthetic graphs, times
+``to_n8n_payload``, ``from_n8n_payload`` and the second conversion, and
+checks that both n8n documents are identical. It then streams synthetic
+multi-workflow exports of growing size through ``iter_export`` from a
+temporary file and reports throughput and peak traced memory, which
+should stay flat as the export grows. Run from ``backend/``::
+
+    python -m benchmarks.bench_round_trip
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from app.services.n8n_converter import to_n8n_payload
+from app.services.n8n_import import from_n8n_payload, iter_export
+from benchmarks.converter_suite import (
+    _time_call,
+    fixture_blueprints,
+    synthetic_blueprint,
+)
+
+
+def _round_trip(label: str, blueprint: Any, min_time: float) -> None:
+    first = to_n8n_payload(blueprint)
+    reversed_blueprint = from_n8n_payload(first)
+    second = to_n8n_payload(reversed_blueprint)
+    if first != second:
+        raise SystemExit(f"{label}: round trip changed the n8n document")
+    convert = _time_call(lambda: to_n8n_payload(blueprint), min_time)
+    reverse = _time_call(lambda: from_n8n_payload(first), min_time)
+    again = _time_call(
+        lambda: to_n8n_payload(reversed_blueprint),
+        min_time,
+    )
+    print(
+        f"  {label:<44} {len(blueprint.steps):>6} steps "
+        f"{convert * 1000:9.3f} ms {reverse * 1000:9.3f} ms "
+        f"{again * 1000:9.3f} ms"
+    )
+
+
+def _write_export(path: Path, document: dict[str, Any], count: int) -> int:
+    encoded = json.dumps(document).encode()
+    with path.open("wb") as handle:
+        handle.write(b"[")
+        for index in range(count):
+            if index:
+                handle.write(b",\n")
+            handle.write(encoded)
+        handle.write(b"]")
+    return path.stat().st_size
+
+
+def _stream_export(path: Path) -> int:
+    with path.open("rb") as handle:
+        return sum(1 for _ in iter_export(handle))
+
+
+def _traced_peak(path: Path) -> int:
+    # tracemalloc slows allocation-heavy code several times over, so
+    # memory is measured on a separate pass from throughput.
+    tracemalloc.start()
+    try:
+        _stream_export(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument(
+        "--export-sizes",
+        nargs="+",
+        type=int,
+        default=(100, 400, 1600),
+        help="workflows per synthetic export",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"  {'case':<44} {'size':>12} {'convert':>12} {'reverse':>12} "
+        f"{'reconvert':>12}"
+    )
+    for name, blueprint in fixture_blueprints().items():
+        _round_trip(f"fixture:{name}", blueprint, args.min_time)
+    for shape in ("linear", "random-dag"):
+        for size in (100, 1000, 10_000):
+            _round_trip(
+                f"{shape}:{size}",
+                synthetic_blueprint(shape, size),
+                args.min_time,
+            )
+
+    document = to_n8n_payload(synthetic_blueprint("random-dag", 50))
+    print("\nstreaming export (iter_export):")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "export.json"
+        for count in args.export_sizes:
+            size = _write_export(path, document, count)
+            started = time.perf_counter()
+            read = _stream_export(path)
+            seconds = time.perf_counter() - started
+            assert read == count
+            peak = _traced_peak(path)
+            print(
+                f"  {count:>6} workflows {size / 2**20:9.1f} MiB "
+                f"{size / 2**20 / seconds:8.1f} MiB/s "
+                f"peak {peak / 1024:9.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Micro-benchmark for the n8n parameter sanitizer on nested inputs.
+
+Compares the single-pass iterative sanitizer with the previous recursive
+implementation (kept here as a reference) on clean and dirty parameter
+trees. Run from ``backend/``::
+
+    python -m benchmarks.bench_sanitize_parameters
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from typing import Any, Optional
+
+from app.services.n8n_converter import (
+    PARAM_COLLECTION_KEYS,
+    _sanitize_parameters,
+)
+
+
+def _legacy_coerce_to_parameters_dict(obj: Any) -> Optional[dict[str, Any]]:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        if "parameters" in obj and isinstance(obj["parameters"], list):
+            return {"parameters": obj["parameters"]}
+        if "values" in obj and isinstance(obj["values"], list):
+            return {"parameters": obj["values"]}
+        return obj
+    if isinstance(obj, list):
+        return {"parameters": obj}
+    return None
+
+
+def _legacy_sanitize(data: Any, parent_key: str | None = None) -> Any:
+    """Recursive sanitizer as it existed before the rewrite."""
+    if isinstance(data, dict):
+        sanitized: dict[str, Any] = {}
+        for key, value in data.items():
+            if value is None:
+                continue
+            new_key = (
+                "options"
+                if key == "option" and data.get("options") is None
+                else key
+            )
+            if new_key in PARAM_COLLECTION_KEYS:
+                coerced = _legacy_coerce_to_parameters_dict(value)
+                if coerced:
+                    sanitized[new_key] = coerced
+                continue
+            sanitized_value = _legacy_sanitize(value, new_key)
+            if new_key == "propertyValues":
+                if isinstance(sanitized_value, list):
+                    sanitized[new_key] = [
+                        _legacy_sanitize(item)
+                        for item in sanitized_value
+                        if isinstance(item, dict)
+                    ]
+                elif isinstance(sanitized_value, dict):
+                    sanitized[new_key] = [_legacy_sanitize(sanitized_value)]
+                continue
+            sanitized[new_key] = sanitized_value
+        return sanitized
+    if isinstance(data, list):
+        return [
+            _legacy_sanitize(item, parent_key)
+            for item in data
+            if item is not None
+        ]
+    return data
+
+
+def _deep_body(depth: int, fanout: int, dirty: bool) -> dict[str, Any]:
+    """Build an HTTP-node style body nested ``depth`` levels deep."""
+    node: dict[str, Any] = {"value": "leaf", "count": 1}
+    for level in range(depth):
+        node = {
+            "level": level,
+            "items": [dict(node) for _ in range(fanout)] if level < 3 else
+            [node],
+            "option": {"timeout": 30} if dirty else None,
+            "propertyValues": {"key": "k"} if dirty else [{"key": "k"}],
+        }
+        if not dirty:
+            node.pop("option")
+    return {
+        "url": "https://api.example.com",
+        "bodyParametersUi": {
+            "values" if dirty else "parameters": [{"name": "a", "value": "b"}]
+        },
+        "body": node,
+    }
+
+
+def _bench(label: str, func: Any, data: Any, number: int) -> float:
+    seconds = min(timeit.repeat(lambda: func(data), number=number, repeat=9))
+    per_call = seconds / number * 1e6
+    print(f"  {label:<10} {per_call:10.1f} us/call")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    clean = _deep_body(args.depth, args.fanout, False)
+    cases = {
+        "clean": clean,
+        # Typical LLM slip: one aliased key at the top of a clean body.
+        "top-level alias": {**clean, "option": {"timeout": 30}},
+        "dirty at every level": _deep_body(args.depth, args.fanout, True),
+    }
+    for label, data in cases.items():
+        assert _sanitize_parameters(data) == _legacy_sanitize(data)
+        print(f"depth={args.depth} {label}:")
+        legacy = _bench("recursive", _legacy_sanitize, data, args.number)
+        current = _bench("iterative", _sanitize_parameters, data, args.number)
+        print(f"  speedup    {legacy / current:10.2f}x")
+
+    deep = _deep_body(sys.getrecursionlimit() * 2, 1, True)
+    try:
+        _legacy_sanitize(deep)
+        print("recursive sanitizer handled deep input")
+    except RecursionError:
+        print("recursive sanitizer: RecursionError on deep input")
+    _sanitize_parameters(deep)
+    print("iterative sanitizer handled deep input")
+
+
+if __name__ == "__main__":
+    main()
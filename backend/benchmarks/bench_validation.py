@@ -0,0 +1,150 @@
+"""Benchmark per-request blueprint validation, before and after.
+
+A blueprint crossing ``/n8n/convert``, ``/n8n/workflows`` or
+``/workflows`` is decoded and validated on the way in and, for the
+``/workflows`` endpoints, was dumped and validated again by the response
+model on the way out. For the repo's fixtures, synthetic graphs and a
+blueprint with oversized ``parameters`` objects, this compares:
+
+* request body: stdlib ``json.loads`` plus validation that copies every
+  ``parameters`` object, against ``FastJSONRoute``'s orjson decode plus
+  the current schema, which adopts large ``parameters`` as decoded;
+* response: FastAPI's response-model pass against ``model_response``.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_validation
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import Field, TypeAdapter
+
+from app.core import serialization
+from app.core.serialization import model_response
+from app.schemas.workflow import (
+    LARGE_PARAMETERS,
+    WorkflowBlueprint,
+    WorkflowNode,
+)
+from benchmarks.converter_suite import fixture_blueprints, synthetic_blueprint
+
+
+class _CopiedNode(WorkflowNode):
+    """``WorkflowNode`` as it was before large parameters were adopted."""
+    parameters: dict[str, Any] = Field(default_factory=dict)
+
+
+class _CopiedBlueprint(WorkflowBlueprint):
+    steps: list[_CopiedNode]
+
+
+_OLD = TypeAdapter(_CopiedBlueprint)
+_NEW = TypeAdapter(WorkflowBlueprint)
+
+
+def _request_old(body: bytes) -> Any:
+    return _OLD.validate_python(json.loads(body))
+
+
+def _request_new(body: bytes) -> Any:
+    return _NEW.validate_python(serialization.loads(body))
+
+
+def _response_old(blueprint: WorkflowBlueprint) -> bytes:
+    """FastAPI's ``response_model=WorkflowBlueprint`` pipeline."""
+    dumped = blueprint.model_dump(by_alias=True)
+    validated = _NEW.validate_python(dumped)
+    plain = _NEW.dump_python(validated, mode="json", by_alias=True)
+    return JSONResponse(plain).body
+
+
+def _response_new(blueprint: WorkflowBlueprint) -> bytes:
+    return model_response(blueprint).body
+
+
+def _large_parameters_blueprint(steps: int) -> WorkflowBlueprint:
+    parameters = {
+        f"field{index}": {"values": list(range(20)), "label": "x" * 40}
+        for index in range(LARGE_PARAMETERS * 8)
+    }
+    return WorkflowBlueprint.model_validate(
+        {
+            "id": "large-parameters",
+            "title": "Large parameters",
+            "description": "Steps carrying oversized parameter objects.",
+            "steps": [
+                {
+                    "id": f"step-{index}",
+                    "name": f"Step {index}",
+                    "type": "n8n-nodes-base.set",
+                    "parameters": parameters,
+                }
+                for index in range(steps)
+            ],
+            "edges": [],
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+
+def _bench(func: Any, data: Any, min_time: float) -> float:
+    number = 1
+    while True:
+        seconds = timeit.timeit(lambda: func(data), number=number)
+        if seconds >= min_time:
+            break
+        number *= 2
+    best = min(timeit.repeat(lambda: func(data), number=number, repeat=5))
+    return best / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    args = parser.parse_args()
+
+    blueprints = fixture_blueprints()
+    for size in (100, 1000, 10_000):
+        blueprints[f"random-dag:{size}"] = synthetic_blueprint(
+            "random-dag",
+            size,
+        )
+    blueprints["large-parameters:200"] = _large_parameters_blueprint(200)
+
+    print(
+        f"  {'case':<36} {'body':>11} {'request old':>13} "
+        f"{'new':>10} {'response old':>14} {'new':>10} {'total':>7}"
+    )
+    for name, blueprint in blueprints.items():
+        body = blueprint.model_dump_json(by_alias=True).encode()
+        assert _request_new(body) == blueprint
+        assert json.loads(_response_new(blueprint)) == json.loads(
+            _response_old(blueprint)
+        )
+        request_old = _bench(_request_old, body, args.min_time)
+        request_new = _bench(_request_new, body, args.min_time)
+        response_old = _bench(_response_old, blueprint, args.min_time)
+        response_new = _bench(_response_new, blueprint, args.min_time)
+        old = request_old + response_old
+        new = request_new + response_new
+        print(
+            f"  {name:<36} {len(body) / 1024:7.0f} KiB "
+            f"{request_old:10.3f} ms {request_new:7.3f} ms "
+            f"{response_old:11.3f} ms {response_new:7.3f} ms "
+            f"{old / new:6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
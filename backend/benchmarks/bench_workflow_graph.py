@@ -0,0 +1,183 @@
+"""Benchmark the shared WorkflowGraph against the per-pass indexes.
+
+Before ``WorkflowGraph``, validation, layout and connection building
+each walked ``blueprint.edges`` and built their own string-keyed
+index: validation an id dict and successor lists, the converter id to
+name and id to node dicts, layout another id dict and a list of index
+pairs. Those passes are kept below as a reference. On synthetic
+blueprints this compares:
+
+* edge reads: how many times an edge object is fetched from
+  ``blueprint.edges``, counted through a proxy list;
+* index memory: the traced peak while each side builds its indexes,
+  per pass and in total, and what stays allocated afterwards;
+* time spent building the indexes.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_workflow_graph
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from app.schemas.workflow import WorkflowBlueprint, WorkflowEdge
+from app.services.blueprint_validator import validate_blueprint
+from app.services.n8n_converter import to_n8n_payload
+from app.services.workflow_graph import WorkflowGraph
+from benchmarks.converter_suite import synthetic_blueprint
+
+
+class _CountingEdges(list):
+    """List of edges that counts every element it hands out."""
+
+    reads = 0
+
+    def __iter__(self) -> Iterator[WorkflowEdge]:
+        for edge in super().__iter__():
+            _CountingEdges.reads += 1
+            yield edge
+
+    def __getitem__(self, index: Any) -> Any:
+        _CountingEdges.reads += 1
+        return super().__getitem__(index)
+
+
+def _legacy_validation_index(blueprint: WorkflowBlueprint) -> Any:
+    """Id index, successor lists and edge-id set of the old validator."""
+    index: dict[str, int] = {}
+    ids: list[str] = []
+    for step in blueprint.steps:
+        if step.id not in index:
+            index[step.id] = len(ids)
+            ids.append(step.id)
+    successors: list[list[tuple[int, str]]] = [[] for _ in ids]
+    edge_ids: set[str] = set()
+    for edge in blueprint.edges:
+        edge_ids.add(edge.id)
+        source = index.get(edge.source)
+        target = index.get(edge.target)
+        if source is not None and target is not None:
+            successors[source].append((target, edge.id))
+    return index, ids, successors, edge_ids
+
+
+def _legacy_conversion_index(blueprint: WorkflowBlueprint) -> Any:
+    """Lookups of the old converter plus the old layout's index pairs."""
+    node_lookup = {step.id: step.name for step in blueprint.steps}
+    # The values were the payload nodes, which exist either way.
+    id_to_node = dict.fromkeys(node_lookup)
+    index_of = {node_id: index for index, node_id in enumerate(id_to_node)}
+    pairs = []
+    for edge in blueprint.edges:
+        source = index_of.get(edge.source)
+        target = index_of.get(edge.target)
+        if source is not None and target is not None:
+            pairs.append((source, target))
+    # Connection building walked the edges once more.
+    resolved = 0
+    for edge in blueprint.edges:
+        if node_lookup.get(edge.source) and node_lookup.get(edge.target):
+            resolved += 1
+    return node_lookup, id_to_node, index_of, pairs, resolved
+
+
+def _traced(build: Callable[[], Any]) -> tuple[Any, int, int]:
+    """Run ``build``; return its result, traced peak and retained bytes."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, retained
+
+
+def _reads(blueprint: WorkflowBlueprint, run: Callable[[], Any]) -> int:
+    edges = blueprint.edges
+    blueprint.edges = _CountingEdges(edges)
+    _CountingEdges.reads = 0
+    try:
+        run()
+    finally:
+        blueprint.edges = edges
+    return _CountingEdges.reads
+
+
+def _best(run: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+        gc.enable()
+    return min(timings)
+
+
+def _report(blueprint: WorkflowBlueprint, repeat: int) -> None:
+    def legacy() -> None:
+        _legacy_validation_index(blueprint)
+        _legacy_conversion_index(blueprint)
+
+    def current() -> None:
+        graph = WorkflowGraph.from_blueprint(blueprint)
+        validate_blueprint(blueprint, graph=graph)
+        to_n8n_payload(blueprint, graph)
+
+    edges = len(blueprint.edges)
+    print(f"{blueprint.title} ({len(blueprint.steps)} steps, {edges} edges)")
+    print(
+        f"  edge reads       legacy {_reads(blueprint, legacy):>9}"
+        f"   graph {_reads(blueprint, current):>9}"
+    )
+
+    _, validation_peak, _ = _traced(
+        lambda: _legacy_validation_index(blueprint)
+    )
+    _, conversion_peak, conversion_kept = _traced(
+        lambda: _legacy_conversion_index(blueprint)
+    )
+    _, graph_peak, graph_kept = _traced(
+        lambda: WorkflowGraph.from_blueprint(blueprint)
+    )
+    mb = 1 / 1e6
+    print(
+        f"  index peak (MB)  legacy {validation_peak * mb:.1f} validate +"
+        f" {conversion_peak * mb:.1f} convert"
+        f" = {(validation_peak + conversion_peak) * mb:.1f}"
+        f"   graph {graph_peak * mb:.1f}"
+    )
+    print(
+        f"  index kept (MB)  legacy {conversion_kept * mb:9.1f}"
+        f"   graph {graph_kept * mb:9.1f}"
+    )
+
+    index_seconds = _best(legacy, repeat)
+    graph_seconds = _best(
+        lambda: WorkflowGraph.from_blueprint(blueprint), repeat
+    )
+    print(
+        f"  index time (ms)  legacy {index_seconds * 1e3:9.1f}"
+        f"   graph {graph_seconds * 1e3:9.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for shape in ("linear", "random-dag"):
+        _report(synthetic_blueprint(shape, args.size), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
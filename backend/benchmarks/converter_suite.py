@@ -0,0 +1,491 @@
+"""Benchmark suite for the blueprint to n8n converter.
+
+Times ``to_n8n_payload``, its ``_auto_layout`` and ``_build_connections``
+stages and the ``validate_blueprint`` pre-check on synthetic graphs
+(linear, fan-out, diamond and random DAG shapes from 10 to 50,000 nodes)
+and on the workflow fixtures shipped in the repo.
+For every case it reports throughput and peak traced memory. For every
+synthetic shape it also reports the scaling exponent *k* of
+``time ~ nodes**k``, fitted on a log-log scale.
+
+Results can be stored as a baseline and later runs checked against it::
+
+    python -m benchmarks.converter_suite --update-baseline
+    python -m benchmarks.converter_suite --check
+
+``--check`` exits non-zero when a case is slower than the baseline by more
+than ``--tolerance`` or a scaling exponent grows by more than
+``--exponent-tolerance``. Times are compared relative to a fixed
+calibration workload timed in the same process, so a baseline recorded
+on one machine still holds on a faster or slower one. Cases that look
+slower are measured again ``--confirm-runs`` times and only reported if
+they stay slow, which keeps one noisy sample from failing the check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from app.schemas.workflow import WorkflowBlueprint
+from app.services.blueprint_validator import validate_blueprint
+from app.services.n8n_converter import (
+    _auto_layout,
+    _build_connections,
+    _build_nodes,
+    to_n8n_payload,
+)
+from app.services.workflow_graph import WorkflowGraph
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BASELINE_PATH = Path(__file__).with_name("converter_baseline.json")
+FIXTURES = (
+    "converted_workflow.json",
+    "n8n_saved_workflow.json",
+    "workflows/zendesk_auto_triage.json",
+)
+SHAPES = ("linear", "fan-out", "diamond", "random-dag")
+SIZES = (10, 100, 1_000, 10_000, 50_000)
+QUICK_SIZES = (10, 100, 1_000)
+STAGES = (
+    "to_n8n_payload",
+    "_auto_layout",
+    "_build_connections",
+    "validate_blueprint",
+)
+
+_STEP_TEMPLATES = (
+    ("n8n-nodes-base.code", {"mode": "runOnceForAllItems"}),
+    (
+        "n8n-nodes-base.httpRequest",
+        {
+            "url": "https://api.example.com/items",
+            "method": "POST",
+            "headerParametersUi": {
+                "parameters": [{"name": "Accept", "value": "json"}],
+            },
+            "options": {"timeout": 10000},
+        },
+    ),
+    ("n8n-nodes-base.slack", {"channel": "#alerts", "text": "={{ $json }}"}),
+)
+
+
+# --------------------------- workloads -------------------------------------
+
+def _step(index: int) -> dict[str, Any]:
+    if index == 0:
+        return {
+            "id": "step-0",
+            "name": "Trigger",
+            "type": "n8n-nodes-base.cron",
+            "parameters": {},
+        }
+    node_type, parameters = _STEP_TEMPLATES[index % len(_STEP_TEMPLATES)]
+    return {
+        "id": f"step-{index}",
+        "name": f"Step {index}",
+        "type": node_type,
+        "parameters": parameters,
+    }
+
+
+def _edges_for(shape: str, size: int) -> Iterator[tuple[int, int]]:
+    if shape == "linear":
+        for index in range(1, size):
+            yield index - 1, index
+    elif shape == "fan-out":
+        for index in range(1, size):
+            yield 0, index
+    elif shape == "diamond":
+        # Chain of diamonds: top -> (left, right) -> bottom -> next top.
+        for top in range(0, size - 3, 3):
+            yield top, top + 1
+            yield top, top + 2
+            yield top + 1, top + 3
+            yield top + 2, top + 3
+    elif shape == "random-dag":
+        rng = random.Random(size)
+        for index in range(1, size):
+            window = max(0, index - 50)
+            parents = {rng.randrange(window, index) for _ in range(2)}
+            for parent in sorted(parents):
+                yield parent, index
+    else:
+        raise ValueError(f"Unknown shape: {shape}")
+
+
+def synthetic_blueprint(shape: str, size: int) -> WorkflowBlueprint:
+    """Build a synthetic blueprint with ``size`` steps in ``shape``."""
+    edges = [
+        {
+            "id": f"edge-{number}",
+            "source": f"step-{source}",
+            "target": f"step-{target}",
+        }
+        for number, (source, target) in enumerate(_edges_for(shape, size))
+    ]
+    return WorkflowBlueprint.model_validate(
+        {
+            "id": f"{shape}-{size}",
+            "title": f"{shape} {size}",
+            "description": "Synthetic benchmark workflow.",
+            "steps": [_step(index) for index in range(size)],
+            "edges": edges,
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+
+def _read_json(path: Path) -> Any:
+    raw = path.read_bytes()
+    # Several fixtures were saved from PowerShell as UTF-16 with a BOM.
+    if raw[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return json.loads(raw.decode("utf-16"))
+    return json.loads(raw.decode("utf-8-sig"))
+
+
+def _blueprint_from_n8n(document: dict[str, Any]) -> WorkflowBlueprint:
+    """Map an n8n workflow document onto a blueprint for benchmarking."""
+    nodes = document.get("nodes") or []
+    name_to_id = {
+        node["name"]: node.get("id") or node["name"] for node in nodes
+    }
+    edges = []
+    for source_name, outputs in (document.get("connections") or {}).items():
+        for connection_type, slots in outputs.items():
+            for output_index, targets in enumerate(slots or []):
+                for target in targets or []:
+                    edges.append(
+                        {
+                            "id": f"edge-{len(edges)}",
+                            "source": name_to_id.get(source_name, source_name),
+                            "target": name_to_id.get(
+                                target["node"], target["node"]
+                            ),
+                            "connectionType": connection_type,
+                            "sourceOutputIndex": output_index,
+                            "targetInputIndex": target.get("index", 0),
+                        }
+                    )
+    return WorkflowBlueprint.model_validate(
+        {
+            "id": document.get("id") or document.get("name", "fixture"),
+            "title": document.get("name", "fixture"),
+            "description": "",
+            "steps": [
+                {
+                    "id": name_to_id[node["name"]],
+                    "name": node["name"],
+                    "type": node["type"],
+                    "typeVersion": node.get("typeVersion"),
+                    "parameters": node.get("parameters") or {},
+                }
+                for node in nodes
+            ],
+            "edges": edges,
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 0,
+        }
+    )
+
+
+def fixture_blueprints() -> dict[str, WorkflowBlueprint]:
+    """Load the repo's real-world workflow exports as blueprints."""
+    return {
+        name: _blueprint_from_n8n(_read_json(REPO_ROOT / name))
+        for name in FIXTURES
+        if (REPO_ROOT / name).exists()
+    }
+
+
+# --------------------------- measurement -----------------------------------
+
+def _stage_callable(
+    stage: str,
+    blueprint: WorkflowBlueprint,
+) -> Callable[[], Any]:
+    if stage == "to_n8n_payload":
+        return lambda: to_n8n_payload(blueprint)
+    if stage == "validate_blueprint":
+        return lambda: validate_blueprint(blueprint)
+    graph = WorkflowGraph.from_blueprint(blueprint)
+    if stage == "_auto_layout":
+        nodes = _build_nodes(blueprint)
+
+        # Layout skips placed nodes, so clear positions before every run.
+        def layout() -> None:
+            for node in nodes:
+                node["position"] = None
+            _auto_layout(graph, nodes)
+
+        return layout
+    return lambda: _build_connections(graph)
+
+
+def _time_call(func: Callable[[], Any], min_time: float) -> float:
+    """Return the best per-call time over repeated runs."""
+    best = math.inf
+    spent = 0.0
+    runs = 0
+    while runs < 3 or spent < min_time:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+        if elapsed > min_time:
+            break
+    return best
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _calibration_workload() -> None:
+    # Dict, list and string work in the proportions the converter does.
+    nodes = [
+        {"id": f"n{index}", "name": f"Node {index}", "slot": index % 97}
+        for index in range(5_000)
+    ]
+    by_id = {node["id"]: node for node in nodes}
+    ordered = sorted(
+        by_id.values(),
+        key=lambda node: (node["slot"], node["id"]),
+    )
+    [[node["name"], [node["slot"], len(node["id"])]] for node in ordered]
+
+
+def calibrate(min_time: float) -> float:
+    """Seconds this process takes for the fixed calibration workload."""
+    return _time_call(_calibration_workload, min_time)
+
+
+def measure(
+    label: str,
+    blueprint: WorkflowBlueprint,
+    min_time: float,
+    calibration: float = 1.0,
+) -> dict[str, dict[str, float]]:
+    """Time every stage for one blueprint.
+
+    ``relative`` is the stage time in units of ``calibration`` seconds.
+    """
+    nodes = len(blueprint.steps)
+    results: dict[str, dict[str, float]] = {}
+    for stage in STAGES:
+        func = _stage_callable(stage, blueprint)
+        seconds = _time_call(func, min_time)
+        results[stage] = {
+            "nodes": nodes,
+            "seconds": seconds,
+            "relative": seconds / calibration,
+            "nodes_per_second": nodes / seconds if seconds else math.inf,
+            "peak_bytes": _peak_memory(func),
+        }
+        print(
+            f"{label:<40} {stage:<19} {nodes:>7} nodes "
+            f"{seconds * 1000:10.3f} ms "
+            f"{results[stage]['nodes_per_second']:>12,.0f} nodes/s "
+            f"{results[stage]['peak_bytes'] / 1024:>10,.0f} KiB"
+        )
+    return results
+
+
+def scaling_exponent(points: list[tuple[int, float]]) -> float:
+    """Least-squares slope of log(seconds) against log(nodes)."""
+    usable = [(n, s) for n, s in points if n > 0 and s > 0]
+    if len(usable) < 2:
+        return math.nan
+    xs = [math.log(n) for n, _ in usable]
+    ys = [math.log(s) for _, s in usable]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def run_suite(
+    shapes: tuple[str, ...],
+    sizes: tuple[int, ...],
+    min_time: float,
+) -> dict[str, Any]:
+    """Run every case and return a JSON-serializable report."""
+    cases: dict[str, Any] = {}
+    exponents: dict[str, float] = {}
+    calibration = calibrate(min_time)
+    print(f"calibration workload {calibration * 1000:.3f} ms")
+
+    for name, blueprint in fixture_blueprints().items():
+        cases[f"fixture:{name}"] = measure(
+            name,
+            blueprint,
+            min_time,
+            calibration,
+        )
+
+    for shape in shapes:
+        points: dict[str, list[tuple[int, float]]] = {
+            stage: [] for stage in STAGES
+        }
+        for size in sizes:
+            blueprint = synthetic_blueprint(shape, size)
+            label = f"{shape}:{size}"
+            cases[label] = measure(label, blueprint, min_time, calibration)
+            for stage in STAGES:
+                points[stage].append((size, cases[label][stage]["seconds"]))
+        # Tiny graphs are dominated by constant overhead; fit from 100 up.
+        for stage in STAGES:
+            fitted = [point for point in points[stage] if point[0] >= 100]
+            exponents[f"{shape}:{stage}"] = scaling_exponent(
+                fitted or points[stage]
+            )
+
+    print()
+    for key, value in exponents.items():
+        print(f"scaling exponent {key:<40} k={value:5.2f}")
+    return {
+        "calibration_seconds": calibration,
+        "cases": cases,
+        "exponents": exponents,
+    }
+
+
+def check_against_baseline(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+    exponent_tolerance: float,
+) -> list[str]:
+    """Return human-readable regressions relative to ``baseline``.
+
+    Case times are compared in calibration units, and reported as the
+    baseline time rescaled to this machine.
+    """
+    failures: list[str] = []
+    calibration = report["calibration_seconds"]
+    for label, stages in report["cases"].items():
+        for stage, result in stages.items():
+            reference = baseline["cases"].get(label, {}).get(stage)
+            if not reference or "relative" not in reference:
+                continue
+            if result["relative"] > reference["relative"] * (1 + tolerance):
+                expected = reference["relative"] * calibration
+                failures.append(
+                    f"{label} {stage}: {result['seconds'] * 1000:.3f} ms > "
+                    f"baseline {expected * 1000:.3f} ms on this machine "
+                    f"(+{tolerance:.0%})"
+                )
+    for key, value in report["exponents"].items():
+        reference = baseline["exponents"].get(key)
+        if reference is None or math.isnan(reference) or math.isnan(value):
+            continue
+        if value > reference + exponent_tolerance:
+            failures.append(
+                f"{key}: scaling exponent {value:.2f} > baseline "
+                f"{reference:.2f} (+{exponent_tolerance})"
+            )
+    return failures
+
+
+def remeasure(
+    report: dict[str, Any],
+    labels: set[str],
+    min_time: float,
+) -> None:
+    """Time ``labels`` again and keep each stage's best result.
+
+    The calibration is repeated too, so a burst of load on the machine
+    slows both sides of the ratio.
+    """
+    calibration = calibrate(min_time)
+    fixtures = fixture_blueprints()
+    for label in sorted(labels):
+        kind, _, name = label.partition(":")
+        if kind == "fixture":
+            blueprint = fixtures[name]
+        else:
+            blueprint = synthetic_blueprint(kind, int(name))
+        fresh = measure(label, blueprint, min_time, calibration)
+        for stage, result in fresh.items():
+            if result["relative"] < report["cases"][label][stage]["relative"]:
+                report["cases"][label][stage] = result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=None)
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help=f"only run sizes {QUICK_SIZES}",
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--exponent-tolerance", type=float, default=0.25)
+    parser.add_argument("--confirm-runs", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    sizes = tuple(args.sizes or (QUICK_SIZES if args.quick else SIZES))
+    report = run_suite(tuple(args.shapes), sizes, args.min_time)
+
+    if args.update_baseline:
+        args.baseline.write_text(
+            json.dumps(report, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}", file=sys.stderr)
+            return 2
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for confirm in range(args.confirm_runs + 1):
+            failures = check_against_baseline(
+                report,
+                baseline,
+                args.tolerance,
+                args.exponent_tolerance,
+            )
+            slow = {f.split(" ", 1)[0] for f in failures if " " in f}
+            slow &= report["cases"].keys()
+            if not slow or confirm == args.confirm_runs:
+                break
+            print(f"\nConfirming {len(slow)} slow cases")
+            remeasure(report, slow, args.min_time)
+        if failures:
+            print("\nRegressions against baseline:", file=sys.stderr)
+            for failure in failures:
+                print(f"  {failure}", file=sys.stderr)
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""Shared pytest configuration for the backend test-suite."""
+
+import os
+
+import pytest
+
+# The chat router builds its AI service at import time; give it a dummy key.
+os.environ.setdefault("DEEPSEEK_API_KEY", "test-key")
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Force anyio to run tests against asyncio only."""
+    return "asyncio"
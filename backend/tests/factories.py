@@ -0,0 +1,71 @@
+"""Builders for the blueprints the tests feed to the services."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from app.schemas.workflow import WorkflowBlueprint
+
+
+def make_step(
+    step_id: str,
+    node_type: str = "n8n-nodes-base.code",
+    **fields: Any,
+) -> dict[str, Any]:
+    """Return a step document named after its id."""
+    return {
+        "id": step_id,
+        "name": step_id.title(),
+        "type": node_type,
+        **fields,
+    }
+
+
+def make_blueprint(
+    steps: list[Any] | None = None,
+    edges: list[Any] | None = None,
+    **fields: Any,
+) -> WorkflowBlueprint:
+    """Validate a blueprint, filling in whatever the test leaves out.
+
+    ``steps`` are documents, bare ids or ``(id, type)`` pairs and default
+    to a single cron trigger. ``edges`` are documents or ``(source,
+    target[, output])`` tuples, numbered ``e0``, ``e1``, ... in order.
+    Other fields use their JSON names; ``id`` follows ``title``.
+    """
+    if steps is None:
+        steps = [make_step("cron", "n8n-nodes-base.cron")]
+    title = fields.pop("title", "Demo")
+    document = {
+        "id": title.lower(),
+        "title": title,
+        "description": "Demo workflow.",
+        "steps": [
+            step
+            if isinstance(step, dict)
+            else make_step(*((step,) if isinstance(step, str) else step))
+            for step in steps
+        ],
+        "edges": [
+            edge if isinstance(edge, dict) else _edge(index, *edge)
+            for index, edge in enumerate(edges or [])
+        ],
+        "credentials": [],
+        "estimatedTimeSavedMinutes": 1,
+        **fields,
+    }
+    return WorkflowBlueprint.model_validate(document)
+
+
+def _edge(
+    index: int,
+    source: str,
+    target: str,
+    output: int = 0,
+) -> dict[str, Any]:
+    return {
+        "id": f"e{index}",
+        "source": source,
+        "target": target,
+        "sourceOutputIndex": output,
+    }
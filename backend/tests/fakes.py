@@ -0,0 +1,379 @@
+"""In-memory Redis and database doubles shared by the service tests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.user import User
+from app.models.workflow import Workflow
+from app.services.job_queue import PROMOTE_DUE_SCRIPT
+
+
+def _b(value: Any) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeRedis:
+    """Async stand-in for the string, hash, sorted-set and stream commands.
+
+    ``now`` is a manual millisecond clock driving consumer-group idle
+    times, and a single consumer group is assumed; string and hash
+    expiries follow the real monotonic clock. ``eval`` runs the
+    queue's Lua scripts as Python equivalents. When ``log`` is given
+    each pipeline appends ``"write"`` before and ``"written"`` after it
+    runs, taking ``latency`` seconds in between.
+    """
+
+    def __init__(
+        self,
+        log: list[str] | None = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.log = log
+        self.latency = latency
+        self.now = 0
+        self.strings: dict[str, bytes] = {}
+        self.expires: dict[str, float] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.zsets: dict[str, dict[bytes, float]] = {}
+        self.streams: dict[str, list[tuple[bytes, dict[bytes, bytes]]]] = {}
+        self.delivered: dict[str, int] = {}
+        self.pending: dict[bytes, tuple[str, int]] = {}
+        self._seq = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def aclose(self) -> None:
+        return None
+
+    # Strings.
+
+    def _expire_due(self, key: str) -> None:
+        if self.expires.get(key, float("inf")) <= time.monotonic():
+            del self.expires[key]
+            self.strings.pop(key, None)
+            self.hashes.pop(key, None)
+
+    async def get(self, key: str) -> bytes | None:
+        self._expire_due(key)
+        return self.strings.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        nx: bool = False,
+        ex: float | None = None,
+        px: int | None = None,
+    ) -> bool:
+        self._expire_due(key)
+        if nx and key in self.strings:
+            return False
+        self.strings[key] = _b(value)
+        self.expires.pop(key, None)
+        if px is not None:
+            ex = px / 1000
+        if ex is not None:
+            await self.expire(key, ex)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(
+            self.strings.pop(key, None) is not None
+            or self.hashes.pop(key, None) is not None
+            or self.zsets.pop(key, None) is not None
+            for key in keys
+        )
+
+    async def expire(self, key: str, seconds: float) -> bool:
+        if key not in self.strings and key not in self.hashes:
+            return False
+        self.expires[key] = time.monotonic() + seconds
+        return True
+
+    # Hashes.
+
+    async def hset(
+        self,
+        key: str,
+        field: str | None = None,
+        value: Any = None,
+        mapping: dict[str, Any] | None = None,
+    ) -> None:
+        values = self.hashes.setdefault(key, {})
+        if field is not None:
+            values[_b(field)] = _b(value)
+        values.update({_b(k): _b(v) for k, v in (mapping or {}).items()})
+
+    async def hget(self, key: str, field: str) -> bytes | None:
+        return self.hashes.get(key, {}).get(_b(field))
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        self._expire_due(key)
+        return dict(self.hashes.get(key, {}))
+
+    async def hmget(self, key: str, fields: list[Any]) -> list[Any]:
+        values = self.hashes.get(key, {})
+        return [values.get(_b(field)) for field in fields]
+
+    async def hdel(self, key: str, *fields: str) -> None:
+        for field in fields:
+            self.hashes.get(key, {}).pop(_b(field), None)
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        values = self.hashes.setdefault(key, {})
+        current = int(values.get(_b(field), b"0")) + amount
+        values[_b(field)] = _b(current)
+        return current
+
+    # Sorted sets.
+
+    def _ordered(self, key: str) -> list[tuple[bytes, float]]:
+        return sorted(
+            self.zsets.get(key, {}).items(),
+            key=lambda item: (item[1], item[0]),
+        )
+
+    async def zadd(self, key: str, mapping: dict[Any, float]) -> int:
+        values = self.zsets.setdefault(key, {})
+        added = sum(_b(member) not in values for member in mapping)
+        values.update({_b(k): float(v) for k, v in mapping.items()})
+        return added
+
+    async def zrem(self, key: str, *members: Any) -> int:
+        values = self.zsets.get(key, {})
+        return sum(
+            values.pop(_b(member), None) is not None for member in members
+        )
+
+    async def zcard(self, key: str) -> int:
+        return len(self.zsets.get(key, {}))
+
+    async def zrange(
+        self,
+        key: str,
+        start: int,
+        end: int,
+        withscores: bool = False,
+    ) -> list[Any]:
+        items = self._ordered(key)[start:None if end == -1 else end + 1]
+        return items if withscores else [member for member, _ in items]
+
+    async def zrevrange(self, key: str, start: int, end: int) -> list[bytes]:
+        items = self._ordered(key)[::-1]
+        return [member for member, _ in items[start:end + 1]]
+
+    async def zrangebyscore(
+        self,
+        key: str,
+        low: Any,
+        high: Any,
+        start: int | None = None,
+        num: int | None = None,
+    ) -> list[bytes]:
+        members = [
+            member
+            for member, score in self._ordered(key)
+            if float(low) <= score <= float(high)
+        ]
+        if start is not None and num is not None:
+            members = members[start:start + num]
+        return members
+
+    async def zremrangebyscore(self, key: str, low: Any, high: Any) -> int:
+        doomed = await self.zrangebyscore(key, low, high)
+        return await self.zrem(key, *doomed)
+
+    async def zpopmin(self, key: str, count: int = 1) -> list[Any]:
+        popped = self._ordered(key)[:count]
+        await self.zrem(key, *(member for member, _ in popped))
+        return popped
+
+    # Scripts.
+
+    async def eval(self, script: str, numkeys: int, *args: Any) -> Any:
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == PROMOTE_DUE_SCRIPT:
+            retry_key, stream_key = keys
+            due = await self.zrangebyscore(
+                retry_key, "-inf", argv[0], start=0, num=int(argv[1])
+            )
+            for job in due:
+                await self.zrem(retry_key, job)
+                await self.xadd(stream_key, {"job": job})
+            return len(due)
+        raise NotImplementedError(script)
+
+    # Streams.
+
+    async def xgroup_create(self, key: str, group: str, **_: Any) -> None:
+        self.streams.setdefault(key, [])
+        self.delivered.setdefault(key, 0)
+
+    async def xadd(self, key: str, fields: dict, **_: Any) -> bytes:
+        self._seq += 1
+        message_id = f"{self._seq}-0".encode()
+        entry = {_b(k): _b(v) for k, v in fields.items()}
+        self.streams.setdefault(key, []).append((message_id, entry))
+        return message_id
+
+    async def xreadgroup(
+        self,
+        group: str,
+        consumer: str,
+        streams: dict[str, str],
+        count: int,
+        block: int | None,
+    ) -> list[Any]:
+        (key,) = streams
+        fresh = [
+            entry
+            for entry in self.streams[key]
+            if int(entry[0].split(b"-")[0]) > self.delivered[key]
+        ][:count]
+        if not fresh:
+            await asyncio.sleep((block or 0) / 1000)
+            return []
+        for message_id, _ in fresh:
+            self.pending[message_id] = (consumer, self.now)
+        self.delivered[key] = int(fresh[-1][0].split(b"-")[0])
+        return [[key.encode(), fresh]]
+
+    async def xautoclaim(
+        self,
+        key: str,
+        group: str,
+        consumer: str,
+        min_idle_time: int,
+        start_id: str,
+        count: int,
+    ) -> list[Any]:
+        entries = dict(self.streams[key])
+        claimed = []
+        for message_id, (_, since) in sorted(self.pending.items()):
+            if len(claimed) == count:
+                break
+            if self.now - since >= min_idle_time:
+                self.pending[message_id] = (consumer, self.now)
+                claimed.append((message_id, entries.get(message_id)))
+        return [b"0-0", claimed, []]
+
+    async def xclaim(
+        self,
+        key: str,
+        group: str,
+        consumer: str,
+        min_idle_time: int,
+        message_ids: list[str],
+        justid: bool,
+    ) -> list[bytes]:
+        for message_id in map(_b, message_ids):
+            if message_id in self.pending:
+                self.pending[message_id] = (consumer, self.now)
+        return [_b(message_id) for message_id in message_ids]
+
+    async def xack(self, key: str, group: str, message_id: str) -> None:
+        self.pending.pop(_b(message_id), None)
+
+    async def xdel(self, key: str, message_id: str) -> None:
+        self.streams[key] = [
+            entry for entry in self.streams[key] if entry[0] != _b(message_id)
+        ]
+
+
+class FakePipeline:
+    """Buffer commands and replay them against ``FakeRedis``."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def buffer(*args: Any, **kwargs: Any) -> FakePipeline:
+            self._calls.append((getattr(self._redis, name), args, kwargs))
+            return self
+
+        return buffer
+
+    async def execute(self) -> list[Any]:
+        log = self._redis.log
+        if log is not None:
+            log.append("write")
+        if self._redis.latency:
+            await asyncio.sleep(self._redis.latency)
+        results = [
+            await call(*args, **kwargs) for call, args, kwargs in self._calls
+        ]
+        if log is not None:
+            log.append("written")
+        return results
+
+
+class MemorySession:
+    """Async session double keeping users and workflows in dicts.
+
+    It answers the statements the user and workflow stores issue by
+    their bound parameters, and enforces unique emails and the
+    workflow owner's foreign key on commit.
+    """
+
+    def __init__(self) -> None:
+        self.users: dict[str, User] = {}
+        self.workflows: dict[str, Workflow] = {}
+        self._added: list[Any] = []
+
+    def add(self, row: Any) -> None:
+        self._added.append(row)
+
+    async def commit(self) -> None:
+        added, self._added = self._added, []
+        emails = {user.email for user in self.users.values()}
+        for row in added:
+            if isinstance(row, User) and row.email in emails:
+                raise IntegrityError("INSERT INTO users", {}, Exception())
+            if isinstance(row, Workflow) and row.owner_id not in self.users:
+                raise IntegrityError("INSERT INTO workflows", {}, Exception())
+            if isinstance(row, User):
+                self.users[row.id] = row
+                emails.add(row.email)
+            else:
+                self.workflows[row.id] = row
+
+    async def rollback(self) -> None:
+        self._added = []
+
+    async def scalar(self, statement: Any) -> Any:
+        params = statement.compile().params
+        if "email_1" in params:
+            return next(
+                (
+                    user
+                    for user in self.users.values()
+                    if user.email == params["email_1"]
+                ),
+                None,
+            )
+        row = self._owned(params)
+        return None if row is None else row.blueprint
+
+    async def execute(self, statement: Any) -> SimpleNamespace:
+        params = statement.compile().params
+        row = self._owned(params)
+        if row is not None and statement.is_delete:
+            del self.workflows[row.id]
+        elif row is not None:
+            for column in ("title", "description", "blueprint"):
+                setattr(row, column, params[column])
+        return SimpleNamespace(rowcount=int(row is not None))
+
+    def _owned(self, params: dict[str, Any]) -> Workflow | None:
+        row = self.workflows.get(params["id_1"])
+        if row is None or row.owner_id != params["owner_id_1"]:
+            return None
+        return row
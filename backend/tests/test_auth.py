@@ -0,0 +1,108 @@
+"""Tests for password hashing, registration and login."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_db_session
+from app.core.security import (
+    UNKNOWN_USER_HASH,
+    hash_password,
+    verify_password,
+)
+from app.main import app
+from app.services import user_store
+from tests.fakes import MemorySession
+
+ACCOUNT = {"email": "Ada@Example.com", "password": "s3cret!", "company": "X"}
+
+
+@pytest.fixture
+def session() -> Iterator[MemorySession]:
+    session = MemorySession()
+
+    async def override() -> Any:
+        yield session
+
+    app.dependency_overrides[get_db_session] = override
+    try:
+        yield session
+    finally:
+        app.dependency_overrides.pop(get_db_session, None)
+
+
+def _bearer(response: Any) -> dict[str, str]:
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_passwords_are_salted_and_verified() -> None:
+    """Two hashes of one password differ and only it verifies."""
+    first, second = hash_password("pw"), hash_password("pw")
+
+    assert first != second
+    assert verify_password("pw", first)
+    assert not verify_password("other", first)
+    assert not verify_password("pw", "not-a-hash")
+
+
+def test_login_hashes_off_the_loop_even_for_unknown_emails(
+    session: MemorySession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A missing account still costs one scrypt run, off the event loop."""
+    # (hash checked, whether it ran on the event loop)
+    checked: list[tuple[str, bool]] = []
+
+    def verify(password: str, hashed: str) -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            checked.append((hashed, False))
+        else:
+            checked.append((hashed, True))
+        return False
+
+    monkeypatch.setattr(user_store, "verify_password", verify)
+    client = TestClient(app)
+
+    response = client.post(
+        "/auth/login",
+        data={"username": "nobody@example.com", "password": "guess"},
+    )
+
+    assert response.status_code == 401
+    assert checked == [(UNKNOWN_USER_HASH, False)]
+
+
+def test_register_persists_the_user_and_login_checks_it(
+    session: MemorySession,
+) -> None:
+    """Tokens are real JWTs; duplicates and bad passwords are refused."""
+    client = TestClient(app)
+
+    registered = client.post("/auth/register", json=ACCOUNT)
+    (user,) = session.users.values()
+    assert user.email == "ada@example.com"
+    assert user.hashed_password != ACCOUNT["password"]
+    assert registered.json()["access_token"] != "mock-token"
+
+    assert client.post("/auth/register", json=ACCOUNT).status_code == 409
+    login = client.post(
+        "/auth/login",
+        data={"username": "ada@example.com", "password": "s3cret!"},
+    )
+    wrong = client.post(
+        "/auth/login",
+        data={"username": "ada@example.com", "password": "guess"},
+    )
+
+    # Authenticated: the lookup runs and misses instead of a 401.
+    missing = client.get("/workflows/none", headers=_bearer(login))
+    assert missing.status_code == 404
+    assert wrong.status_code == 401
@@ -0,0 +1,125 @@
+"""Tests for NDJSON batch conversion on the worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+from app.api import n8n
+from app.config import settings
+from app.main import app
+from app.services import batch_converter
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    """Run the app with a small pool and tiny chunks."""
+    monkeypatch.setattr(settings, "convert_batch_workers", 2)
+    monkeypatch.setattr(settings, "convert_batch_chunk_size", 2)
+    monkeypatch.setattr(settings, "convert_batch_max_in_flight", 2)
+    with TestClient(app) as test_client:
+        yield test_client
+    batch_converter.shutdown_process_pool()
+
+
+def _blueprint_line(index: int) -> str:
+    return json.dumps(
+        {
+            "id": f"bp-{index}",
+            "title": f"Workflow {index}",
+            "description": "Batch item.",
+            "steps": [
+                {"id": "cron", "name": "Cron", "type": "n8n-nodes-base.cron"}
+            ],
+            "edges": [],
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+
+def test_batch_preserves_order_and_reports_item_errors(
+    client: TestClient,
+) -> None:
+    """Invalid lines yield an error entry without failing the batch."""
+    lines = [_blueprint_line(index) for index in range(5)]
+    lines[2] = '{"id": "broken"}'
+    lines[3] = "not json"
+    body = ("\n".join(lines) + "\n\n").encode()
+
+    response = client.post(
+        "/n8n/convert/batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+    assert results[0]["workflow"]["name"] == "Workflow 0"
+    assert results[4]["workflow"]["name"] == "Workflow 4"
+    assert results[2]["error"] == "invalid blueprint"
+    assert results[2]["details"]
+    assert "error" in results[3]
+
+
+def test_overlong_lines_are_reported_in_place(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A line over the limit becomes an error; its neighbours convert."""
+    line = _blueprint_line(0)
+    monkeypatch.setattr(settings, "convert_batch_max_line_bytes", len(line))
+    padded = line[:-1] + ', "extra": "' + "x" * 100 + '"}'
+
+    response = client.post(
+        "/n8n/convert/batch",
+        content=f"{line}\n{padded}\n{line}".encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result.get("error") for result in results] == [
+        None,
+        "line too long",
+        None,
+    ]
+
+
+@pytest.mark.anyio
+async def test_stream_ends_when_the_client_leaves_after_the_body() -> None:
+    """Disconnects are still noticed once the request body is read."""
+    left = asyncio.Event()
+    body = [{"type": "http.request", "body": b"{}\n", "more_body": False}]
+
+    async def receive() -> dict[str, Any]:
+        if body:
+            return body.pop()
+        await left.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.body":
+            left.set()
+
+    async def endless(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for _ in chunks:
+            pass
+        while True:
+            yield b"{}\n"
+            await asyncio.sleep(0.01)
+
+    scope = {"type": "http", "method": "POST", "headers": []}
+    response = getattr(n8n, "_DuplexStreamingResponse")(
+        Request(scope, receive),
+        endless,
+        media_type="application/x-ndjson",
+    )
+
+    await asyncio.wait_for(response(scope, receive, send), 1)
@@ -0,0 +1,119 @@
+"""Unit tests for the blueprint cache and its single-flight behaviour."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.schemas.workflow import ChatMessage, ChatRequest, WorkflowBlueprint
+from app.services.blueprint_cache import (
+    INDEX_KEY,
+    BlueprintCache,
+    build_cache_key,
+)
+from tests.factories import make_blueprint
+from tests.fakes import FakeRedis
+
+
+def _request(*contents: str) -> ChatRequest:
+    return ChatRequest(
+        messages=[
+            ChatMessage(id=f"m{index}", role="user", content=content)
+            for index, content in enumerate(contents)
+        ]
+    )
+
+
+def test_cache_key_ignores_message_ids_and_whitespace() -> None:
+    """Retries with fresh message ids must hit the same entry."""
+    first = _request("Build a workflow ")
+    second = ChatRequest(
+        messages=[
+            ChatMessage(id="other", role="User", content="Build a workflow")
+        ]
+    )
+
+    assert build_cache_key(first, "m", "sys") == build_cache_key(
+        second, "m", "sys"
+    )
+    assert build_cache_key(first, "m", "sys") != build_cache_key(
+        first, "m", "sys v2"
+    )
+    assert build_cache_key(first, "m", "sys") != build_cache_key(
+        first, "other-model", "sys"
+    )
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_requests_share_one_generation() -> None:
+    """Only one upstream call is made for a burst of identical requests."""
+    cache = BlueprintCache(
+        client=FakeRedis(),
+        max_entries=10,
+        enabled=True,
+    )
+    calls = 0
+
+    async def factory() -> WorkflowBlueprint:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return make_blueprint(id="shared")
+
+    results = await asyncio.gather(
+        *(cache.get_or_generate("key", factory) for _ in range(5))
+    )
+    cached = await cache.get_or_generate("key", factory)
+
+    assert calls == 1
+    assert {result.id for result in results} == {"shared"}
+    assert cached.id == "shared"
+
+
+@pytest.mark.anyio
+async def test_failed_generation_is_not_cached() -> None:
+    """Errors propagate to every waiter and leave no entry behind."""
+    cache = BlueprintCache(client=FakeRedis(), enabled=True)
+
+    async def failing() -> WorkflowBlueprint:
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_generate("key", failing)
+
+    assert await cache.get("key") is None
+
+
+@pytest.mark.anyio
+async def test_salvaged_blueprints_are_returned_but_not_cached() -> None:
+    """A truncated result must not be served for the next 24 hours."""
+    cache = BlueprintCache(client=FakeRedis(), enabled=True)
+    calls = 0
+
+    async def factory() -> WorkflowBlueprint:
+        nonlocal calls
+        calls += 1
+        return make_blueprint(id=f"bp-{calls}", truncated=calls == 1)
+
+    first = await cache.get_or_generate("key", factory)
+    second = await cache.get_or_generate("key", factory)
+
+    assert (first.id, first.truncated) == ("bp-1", True)
+    assert (second.id, second.truncated) == ("bp-2", False)
+    assert (await cache.get("key")).id == "bp-2"
+
+
+@pytest.mark.anyio
+async def test_oldest_entries_are_evicted_beyond_max_entries() -> None:
+    """Keep the cache within its configured entry budget."""
+    fake = FakeRedis()
+    cache = BlueprintCache(client=fake, max_entries=2, enabled=True)
+
+    for index in range(3):
+        await cache.set(f"key-{index}", make_blueprint(id=f"bp-{index}"))
+
+    assert await cache.get("key-0") is None
+    assert (await cache.get("key-2")).id == "bp-2"
+    assert len(fake.zsets[INDEX_KEY]) == 2
@@ -0,0 +1,75 @@
+"""Unit tests for the incremental blueprint stream parser."""
+
+from __future__ import annotations
+
+from app.services.blueprint_stream import BlueprintStreamParser
+
+DOCUMENT = (
+    '{"id": "demo", "title": "Braces {in} \\"strings\\"", '
+    '"description": "x", "steps": ['
+    '{"id": "code", "type": "n8n-nodes-base.code",'
+    ' "parameters": {"jsCode": "return [{json: {a: \'}\'}}];"}},'
+    '{"id": "slack", "type": "n8n-nodes-base.slack", "parameters": {}}'
+    '], "edges": [{"source": "code", "target": "slack"}],'
+    ' "credentials": [], "estimatedTimeSavedMinutes": 3}'
+)
+
+
+def test_items_are_emitted_as_soon_as_they_close() -> None:
+    """Feed one character at a time and record when items appear."""
+    parser = BlueprintStreamParser()
+    emitted: list[tuple[int, str, int, str]] = []
+
+    for position, char in enumerate(DOCUMENT):
+        for section, index, item in parser.feed(char):
+            item_id = item.get("id") or item["source"]
+            emitted.append((position, section, index, item_id))
+
+    assert [entry[1:] for entry in emitted] == [
+        ("steps", 0, "code"),
+        ("steps", 1, "slack"),
+        ("edges", 0, "code"),
+    ]
+    first_close = DOCUMENT.index(',{"id": "slack"') - 1
+    assert emitted[0][0] == first_close
+    assert parser.complete
+
+
+def test_nested_arrays_named_steps_are_ignored() -> None:
+    """Only the top-level sections produce events."""
+    parser = BlueprintStreamParser()
+    document = '{"meta": {"steps": [{"id": "nested"}]}, "steps": []}'
+
+    assert parser.feed(document) == []
+    assert parser.complete
+
+
+def test_truncated_document_is_not_complete() -> None:
+    """Leave partially received items pending."""
+    parser = BlueprintStreamParser()
+
+    items = parser.feed('{"steps": [{"id": "a"}, {"id": "b", "name": "{')
+
+    assert [item["id"] for _, _, item in items] == ["a"]
+    assert not parser.complete
+
+
+def test_braces_inside_strings_do_not_look_truncated() -> None:
+    """Code with unbalanced braces in a string still closes the root."""
+    parser = BlueprintStreamParser()
+
+    parser.feed('{"steps": [{"id": "a", "jsCode": "if (x) { return"}]}')
+
+    assert parser.complete
+
+
+def test_salvage_closes_the_last_whole_item() -> None:
+    """The cut-off item is dropped and open containers are closed."""
+    parser = BlueprintStreamParser()
+    head = '{"id": "demo", "steps": [{"id": "a", "jsCode": "}"}'
+
+    parser.feed(head + ', {"id": "b", "name": "{')
+
+    assert parser.resume_point == len(head)
+    assert parser.salvage() == head + "]}"
+    assert BlueprintStreamParser().salvage() is None
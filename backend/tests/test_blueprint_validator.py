@@ -0,0 +1,190 @@
+"""Tests for structural blueprint validation."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from app.main import app
+from app.schemas.workflow import WorkflowBlueprint
+from app.services.batch_converter import _convert_line
+from app.services.blueprint_validator import (
+    BlueprintValidationError,
+    ensure_valid,
+    has_errors,
+    validate_blueprint,
+    validate_blueprints,
+)
+from app.services.n8n_client import N8NClient
+from tests.factories import make_blueprint, make_step
+
+
+def _step(step_id: str, node_type: str = "code") -> dict[str, Any]:
+    return make_step(step_id, f"n8n-nodes-base.{node_type}")
+
+
+def _edge(edge_id: str, source: str, target: str, **extra: Any) -> dict:
+    return {"id": edge_id, "source": source, "target": target, **extra}
+
+
+def _codes(blueprint: WorkflowBlueprint) -> list[tuple[str, Any, Any]]:
+    return [
+        (d.code, d.node_id, d.edge_id) for d in validate_blueprint(blueprint)
+    ]
+
+
+def test_clean_blueprint_has_no_diagnostics() -> None:
+    """A connected DAG starting at a trigger passes silently."""
+    blueprint = make_blueprint(
+        [_step("cron", "cron"), _step("a"), _step("b")],
+        [_edge("e1", "cron", "a"), _edge("e2", "a", "b")],
+    )
+    assert validate_blueprint(blueprint) == []
+    assert ensure_valid(blueprint) == []
+
+
+def test_structural_errors_point_at_nodes_and_edges() -> None:
+    """Duplicate ids and dangling edges are errors tied to their source."""
+    blueprint = make_blueprint(
+        [_step("cron", "cron"), _step("a"), _step("a")],
+        [_edge("e1", "cron", "a"), _edge("e2", "a", "ghost")],
+    )
+    codes = _codes(blueprint)
+    assert ("duplicate_step_id", "a", None) in codes
+    assert ("unknown_edge_target", None, "e2") in codes
+
+    with pytest.raises(BlueprintValidationError) as info:
+        ensure_valid(blueprint)
+    assert has_errors(info.value.diagnostics)
+
+
+def test_graph_warnings_cover_ports_cycles_and_reachability() -> None:
+    """Bad ports, loops and orphans are reported without blocking."""
+    blueprint = make_blueprint(
+        [
+            _step("cron", "cron"),
+            _step("check", "if"),
+            _step("a"),
+            _step("b"),
+            _step("orphan"),
+        ],
+        [
+            _edge("e1", "cron", "check"),
+            _edge("e2", "check", "a", sourceOutputIndex=3),
+            _edge("e3", "a", "b"),
+            _edge("e4", "b", "a"),
+            _edge("e5", "a", "cron"),
+        ],
+    )
+    diagnostics = validate_blueprint(blueprint)
+    codes = [(d.code, d.node_id, d.edge_id) for d in diagnostics]
+
+    assert ("output_index_out_of_range", "check", "e2") in codes
+    assert ("input_index_out_of_range", "cron", "e5") in codes
+    assert ("cycle", "a", "e4") in codes
+    assert ("unreachable_node", "orphan", None) in codes
+    assert not has_errors(diagnostics)
+
+
+def test_batch_validation_keeps_input_order() -> None:
+    """Each blueprint in a batch gets its own diagnostics list."""
+    good = make_blueprint([_step("cron", "cron")])
+    bad = make_blueprint([_step("cron", "cron")], [_edge("e1", "x", "cron")])
+
+    results = validate_blueprints([good, bad, good])
+
+    assert [has_errors(result) for result in results] == [
+        False,
+        True,
+        False,
+    ]
+    assert results[1][0].as_dict() == {
+        "code": "unknown_edge_source",
+        "severity": "error",
+        "message": "Edge source 'x' is not a step",
+        "nodeId": None,
+        "edgeId": "e1",
+    }
+
+
+def test_large_graphs_validate_in_linear_time() -> None:
+    """A long chain neither recurses nor goes quadratic."""
+    size = 20_000
+    blueprint = make_blueprint(
+        [_step("cron", "cron")] + [_step(f"n{i}") for i in range(size)],
+        [_edge("e0", "cron", "n0")]
+        + [_edge(f"e{i}", f"n{i - 1}", f"n{i}") for i in range(1, size)],
+    )
+    assert validate_blueprint(blueprint) == []
+
+
+def test_batch_converter_reports_invalid_blueprints() -> None:
+    """Batch lines that fail validation carry diagnostics, not a workflow."""
+    blueprint = make_blueprint([_step("a"), _step("a")])
+
+    line = json.loads(_convert_line(4, blueprint.model_dump_json().encode()))
+
+    assert line["index"] == 4
+    assert line["error"] == "invalid blueprint"
+    assert line["diagnostics"][0]["code"] == "duplicate_step_id"
+
+
+@pytest.mark.anyio
+async def test_deploy_rejects_invalid_blueprint_before_sending() -> None:
+    """Nothing reaches n8n when the blueprint has errors."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"id": "1"})
+
+    client = N8NClient(
+        base_url="http://n8n",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    blueprint = make_blueprint([_step("cron", "cron")], [_edge("e", "x", "y")])
+
+    with pytest.raises(BlueprintValidationError):
+        await client.deploy_workflow(blueprint)
+    assert requests == []
+
+
+@pytest.mark.anyio
+async def test_validate_and_convert_endpoints_surface_diagnostics() -> None:
+    """The API returns diagnostics per blueprint and 422 on errors."""
+    good = make_blueprint([_step("cron", "cron"), _step("orphan")])
+    bad = make_blueprint([_step("a"), _step("a")])
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        validated = await client.post(
+            "/n8n/validate",
+            json=[
+                good.model_dump(mode="json", by_alias=True),
+                bad.model_dump(mode="json", by_alias=True),
+            ],
+        )
+        converted = await client.post(
+            "/n8n/convert",
+            content=good.model_dump_json(by_alias=True),
+        )
+        rejected = await client.post(
+            "/n8n/convert",
+            content=bad.model_dump_json(by_alias=True),
+        )
+
+    results = validated.json()["results"]
+    assert [result["valid"] for result in results] == [True, False]
+    assert results[0]["diagnostics"][0]["code"] == "unreachable_node"
+
+    assert converted.status_code == 200
+    assert converted.json()["diagnostics"][0]["nodeId"] == "orphan"
+
+    assert rejected.status_code == 422
+    detail = rejected.json()["detail"]
+    assert detail["diagnostics"][0]["code"] == "duplicate_step_id"
@@ -0,0 +1,169 @@
+"""Tests for concurrent, idempotent bulk deploys to n8n."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from app.schemas.workflow import WorkflowBlueprint
+from app.services.bulk_deploy import (
+    BulkDeployer,
+    DeployLedger,
+    idempotency_key,
+)
+from app.services.n8n_client import N8NClient
+from tests.factories import make_blueprint
+from tests.fakes import FakeRedis
+
+
+class FakeN8N:
+    """Record workflow creates, failing the first ones as configured."""
+
+    def __init__(
+        self,
+        failures: dict[str, list[int | Exception]] | None = None,
+    ) -> None:
+        self.failures = failures or {}
+        self.created: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        name = json.loads(request.content)["name"]
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        pending = self.failures.get(name)
+        if pending and isinstance(pending[0], Exception):
+            # n8n stored the workflow but its response never arrived.
+            self.created.append(name)
+            raise pending.pop(0)
+        if pending:
+            return httpx.Response(
+                pending.pop(0),
+                headers={"Retry-After": "0"},
+                text="busy",
+            )
+        self.created.append(name)
+        return httpx.Response(
+            200,
+            json={"id": str(len(self.created)), "name": name},
+        )
+
+
+def _deployer(
+    n8n: FakeN8N,
+    redis: FakeRedis,
+    concurrency: int = 4,
+) -> BulkDeployer:
+    client = N8NClient(
+        base_url="http://n8n",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(n8n)),
+    )
+    return BulkDeployer(
+        client=client,
+        ledger=DeployLedger(client=redis),  # type: ignore[arg-type]
+        concurrency=concurrency,
+        max_attempts=3,
+        backoff=0,
+    )
+
+
+async def _collect(
+    deployer: BulkDeployer,
+    blueprints: list[WorkflowBlueprint],
+) -> list[dict[str, Any]]:
+    return [event async for event in deployer.deploy(blueprints)]
+
+
+def _final(events: list[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+    return {
+        event["index"]: event
+        for event in events
+        if event["status"] != "retrying"
+    }
+
+
+def test_idempotency_key_ignores_key_order() -> None:
+    """The hash follows content, not how the document was written."""
+    blueprint = make_blueprint(title="Alpha")
+    reordered = WorkflowBlueprint.model_validate(
+        dict(reversed(list(blueprint.model_dump(by_alias=True).items())))
+    )
+    assert idempotency_key(blueprint) == idempotency_key(reordered)
+    other = make_blueprint(title="Beta")
+    assert idempotency_key(blueprint) != idempotency_key(other)
+
+
+@pytest.mark.anyio
+async def test_bulk_deploy_bounds_concurrency_and_skips_replays() -> None:
+    """Twelve creates respect the limit and a replay creates nothing."""
+    n8n = FakeN8N()
+    redis = FakeRedis()
+    blueprints = [make_blueprint(title=f"Flow {i}") for i in range(12)]
+
+    first = _final(await _collect(_deployer(n8n, redis, 3), blueprints))
+    replay = _final(await _collect(_deployer(n8n, redis, 3), blueprints))
+
+    assert n8n.peak == 3
+    assert sorted(n8n.created) == sorted(b.title for b in blueprints)
+    assert {event["status"] for event in first.values()} == {"created"}
+    assert {event["status"] for event in replay.values()} == {"existing"}
+    assert replay[5]["workflow"] == first[5]["workflow"]
+
+
+@pytest.mark.anyio
+async def test_bulk_deploy_retries_throttling_and_reports_progress() -> None:
+    """429/5xx are retried with progress events; 4xx fail at once."""
+    n8n = FakeN8N({"Busy": [429, 503], "Broken": [400]})
+    redis = FakeRedis()
+    blueprints = [
+        make_blueprint(title="Busy"),
+        make_blueprint(title="Broken"),
+        make_blueprint(title="Busy"),
+        make_blueprint(
+            edges=[{"id": "e", "source": "cron", "target": "missing"}],
+            title="Dangling",
+        ),
+    ]
+
+    events = await _collect(_deployer(n8n, redis), blueprints)
+    final = _final(events)
+
+    retries = [e for e in events if e["status"] == "retrying"]
+    assert [(e["index"], e["attempt"]) for e in retries] == [
+        (0, 1),
+        (2, 1),
+        (0, 2),
+        (2, 2),
+    ]
+    assert final[0]["status"] == "created" and final[0]["attempts"] == 3
+    assert final[2]["status"] == "existing"
+    assert final[1]["status"] == "failed" and final[1]["attempts"] == 1
+    assert final[3]["status"] == "invalid"
+    assert n8n.created == ["Busy"]
+    # The failed key was released, so a later batch may try again.
+    assert b"pending" not in redis.strings.values()
+
+
+@pytest.mark.anyio
+async def test_create_with_unknown_outcome_is_not_replayed() -> None:
+    """A POST that may have landed keeps its key instead of releasing it."""
+    n8n = FakeN8N({"Lost": [httpx.ReadTimeout("read timed out")]})
+    redis = FakeRedis()
+    blueprints = [make_blueprint(title="Lost")]
+
+    first = _final(await _collect(_deployer(n8n, redis), blueprints))
+    replay = _final(await _collect(_deployer(n8n, redis), blueprints))
+
+    assert first[0]["status"] == "unknown" and first[0]["attempts"] == 1
+    assert replay[0]["status"] == "unknown"
+    assert "Unable to reach" in replay[0]["error"]
+    assert n8n.created == ["Lost"]
@@ -0,0 +1,146 @@
+"""Endpoint tests for the chat router."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+
+from app.api import chat
+from app.main import app
+from app.services.blueprint_cache import BlueprintCache
+
+BLUEPRINT_JSON = """
+{
+  "id": "demo",
+  "title": "Demo",
+  "description": "Demo workflow.",
+  "steps": [
+    {"id": "cron", "name": "Cron", "type": "n8n-nodes-base.cron"}
+  ],
+  "edges": [],
+  "credentials": [],
+  "estimatedTimeSavedMinutes": 5
+}
+"""
+
+
+@pytest.mark.anyio
+async def test_pending_generations_do_not_block_other_endpoints(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Keep the event loop free while LLM calls are outstanding."""
+    release = asyncio.Event()
+    started = 0
+
+    async def slow_invoke(messages: list[dict[str, str]]) -> str:
+        nonlocal started
+        started += 1
+        await release.wait()
+        return BLUEPRINT_JSON
+
+    monkeypatch.setattr(
+        chat.executor.ai_service.services["deepseek"],
+        "_invoke",
+        slow_invoke,
+    )
+    monkeypatch.setattr(chat.executor, "cache", BlueprintCache(enabled=False))
+
+    def request(index: int) -> dict[str, object]:
+        message = {"id": "m1", "role": "user", "content": f"Build {index}"}
+        return {"messages": [message]}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        pending = [
+            asyncio.create_task(
+                client.post("/chat/generate-workflow", json=request(index))
+            )
+            for index in range(3)
+        ]
+        while started < 3:
+            await asyncio.sleep(0)
+
+        health = await asyncio.wait_for(client.get("/health"), timeout=1)
+        converted = await asyncio.wait_for(
+            client.post("/n8n/convert", content=BLUEPRINT_JSON),
+            timeout=1,
+        )
+
+        assert health.status_code == 200
+        assert converted.status_code == 200
+        assert not any(task.done() for task in pending)
+
+        release.set()
+        responses = await asyncio.gather(*pending)
+
+    assert [response.status_code for response in responses] == [200] * 3
+    assert responses[0].json()["id"] == "demo"
+
+
+@pytest.mark.anyio
+async def test_stream_endpoint_emits_nodes_then_blueprint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Stream node and edge events before the final blueprint."""
+    document = json.loads(BLUEPRINT_JSON)
+    document["steps"].append(
+        {"id": "slack-alert", "type": "n8n-nodes-base.slack"}
+    )
+    document["edges"] = [{"source": "cron", "target": "slack-alert"}]
+    text = json.dumps(document)
+
+    async def fake_stream() -> AsyncIterator[Any]:
+        for start in range(0, len(text), 7):
+            delta = SimpleNamespace(content=text[start:start + 7])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def fake_create(**kwargs: Any) -> AsyncIterator[Any]:
+        assert kwargs["stream"] is True
+        return fake_stream()
+
+    service = chat.executor.ai_service.services["deepseek"]
+    completions = SimpleNamespace(create=fake_create)
+    monkeypatch.setattr(
+        service,
+        "client",
+        SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+    )
+    monkeypatch.setattr(chat.executor, "cache", BlueprintCache(enabled=False))
+
+    request = {"messages": [{"id": "m1", "role": "user", "content": "Go"}]}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        response = await client.post(
+            "/chat/generate-workflow/stream",
+            json=request,
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (
+            block.split("\n")[0].removeprefix("event: "),
+            json.loads(block.split("\n")[1].removeprefix("data: ")),
+        )
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert [name for name, _ in events] == [
+        "node",
+        "node",
+        "edge",
+        "blueprint",
+    ]
+    assert events[1][1]["name"] == "Slack Alert"
+    assert events[2][1]["id"] == "edge1"
+    assert events[-1][1]["id"] == "demo"
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
 
 import pytest
 
 from app.schemas.workflow import ChatMessage, ChatRequest
-from app.services.deepseek_service import JSON_ONLY_REMINDER, DeepSeekService
+from app.services.deepseek_service import (
+    CONTINUE_PROMPT,
+    JSON_ONLY_REMINDER,
+    DeepSeekService,
+)
 
-
-@pytest.fixture
-def anyio_backend() -> str:
-    """Force anyio to run tests against asyncio only."""
-    return "asyncio"
+TRUNCATED = (
+    '{"id": "demo", "title": "Demo", "description": "Demo.", "steps": ['
+    '{"id": "cron", "name": "Cron", "type": "n8n-nodes-base.cron"}, '
+    '{"id": "code", "name": "Code", "type": "n8n-nodes-base.code", '
+    '"jsCode": "if (x) { return'
+)
 
 
 def _service_stub() -> DeepSeekService:
@@ -81,11 +89,11 @@ async def test_generate_workflow_retries_until_valid() -> None:
         ]
     )
 
-    def fake_invoke(messages: list[dict[str, str]]) -> str:
+    async def fake_invoke(messages: list[dict[str, str]]) -> str:
         attempts.append(messages)
         return next(responses)
 
-    setattr(service, "_invoke_deepseek", fake_invoke)
+    setattr(service, "_invoke", fake_invoke)
 
     payload = ChatRequest(
         messages=[
@@ -101,4 +109,151 @@ async def test_generate_workflow_retries_until_valid() -> None:
 
     assert blueprint.id == "support-routing"
     assert len(attempts) == 2
-    assert attempts[1][0]["content"].endswith(JSON_ONLY_REMINDER)
+    # The reminder trails the history so the cached prefix stays intact.
+    assert attempts[1][:-1] == attempts[0]
+    assert attempts[1][-1] == {
+        "role": "system",
+        "content": JSON_ONLY_REMINDER,
+    }
+
+
+def test_braces_inside_strings_are_not_truncation() -> None:
+    """Unbalanced braces in jsCode no longer reject a complete payload."""
+    service = _service_stub()
+    payload = '{"steps": [{"id": "code", "jsCode": "if (x) { return"}]}'
+
+    assert not getattr(service, "_looks_truncated")(payload)
+    assert getattr(service, "_looks_truncated")(TRUNCATED + "}")
+
+
+@pytest.mark.anyio
+async def test_truncated_response_is_continued_not_regenerated() -> None:
+    """A cut-off reply is resumed from its last whole step."""
+    service = _service_stub()
+    calls: list[tuple[list[dict[str, str]], bool]] = []
+    responses = iter(
+        [
+            TRUNCATED,
+            ', {"id": "slack", "name": "Slack", "type": "slack"}], '
+            '"edges": [{"id": "e1", "source": "cron", "target": "slack"}], '
+            '"credentials": [], "estimatedTimeSavedMinutes": 5}',
+        ]
+    )
+
+    async def fake_invoke(
+        messages: list[dict[str, str]],
+        json_mode: bool = True,
+    ) -> str:
+        calls.append((messages, json_mode))
+        return next(responses)
+
+    setattr(service, "_invoke", fake_invoke)
+    payload = ChatRequest(
+        messages=[ChatMessage(id="m1", role="user", content="Build it.")]
+    )
+
+    blueprint = await service.generate_workflow(payload)
+
+    assert [step.id for step in blueprint.steps] == ["cron", "slack"]
+    assert not blueprint.truncated
+    assert len(calls) == 2
+    continuation, json_mode = calls[1]
+    assert not json_mode
+    assert continuation[-2]["role"] == "assistant"
+    assert continuation[-2]["content"].endswith('"n8n-nodes-base.cron"}')
+    assert continuation[-1]["content"] == CONTINUE_PROMPT
+
+
+@pytest.mark.anyio
+async def test_unfinishable_response_keeps_longest_valid_prefix() -> None:
+    """When continuing fails too, whole steps and their edges survive."""
+    service = _service_stub()
+    head = TRUNCATED.replace(
+        '{"id": "code"',
+        '{"id": "http", "name": "HTTP", "type": "n8n-nodes-base.httpRequest"}'
+        '], "edges": [{"id": "e1", "source": "cron", "target": "http"}, '
+        '{"id": "e2", "source": "http", "target": "code"}, {"id": "code"',
+    )
+
+    async def fake_invoke(
+        messages: list[dict[str, str]],
+        json_mode: bool = True,
+    ) -> str:
+        return head if json_mode else '"still cut'
+
+    setattr(service, "_invoke", fake_invoke)
+    payload = ChatRequest(
+        messages=[ChatMessage(id="m1", role="user", content="Build it.")]
+    )
+
+    blueprint = await service.generate_workflow(payload)
+
+    assert [step.id for step in blueprint.steps] == ["cron", "http"]
+    assert [edge.id for edge in blueprint.edges] == ["e1"]
+    assert blueprint.estimated_time_saved_minutes == 0
+    assert blueprint.truncated
+
+
+@pytest.mark.anyio
+async def test_stream_frees_its_slot_before_the_client_catches_up() -> None:
+    """A paused consumer must not keep the concurrency slot."""
+    service = _service_stub()
+    semaphore = asyncio.Semaphore(1)
+    setattr(service, "_semaphore", semaphore)
+    setattr(service, "_build_messages", lambda payload: [])
+    document = (
+        '{"id": "demo", "title": "Demo", "description": "Demo.", "steps": '
+        '[{"id": "cron", "name": "Cron", "type": "n8n-nodes-base.cron"}], '
+        '"edges": [], "credentials": [], "estimatedTimeSavedMinutes": 5}'
+    )
+
+    async def fake_stream(messages: list[dict[str, str]]) -> Any:
+        for start in range(0, len(document), 16):
+            yield document[start:start + 16]
+
+    setattr(service, "_stream_completion", fake_stream)
+    payload = ChatRequest(
+        messages=[ChatMessage(id="m1", role="user", content="Build it.")]
+    )
+
+    stream = service.stream_workflow(payload)
+    event, _ = await anext(stream)
+    assert event == "node"
+    await asyncio.wait_for(semaphore.acquire(), 1)
+    semaphore.release()
+
+    events = [event async for event, _ in stream]
+    assert events == ["blueprint"]
+
+
+@pytest.mark.anyio
+async def test_invoke_respects_concurrency_limit() -> None:
+    """Never exceed the configured number of in-flight completions."""
+    service = _service_stub()
+    service.model = "deepseek-chat"
+    setattr(service, "_semaphore", asyncio.Semaphore(2))
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_create(**_: Any) -> SimpleNamespace:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        message = SimpleNamespace(content='{"id": "demo"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    completions = SimpleNamespace(create=fake_create)
+    service.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+
+    invoke = getattr(service, "_invoke")
+    results = await asyncio.gather(
+        *(invoke([{"role": "user", "content": "hi"}]) for _ in range(6))
+    )
+
+    assert results == ['{"id": "demo"}'] * 6
+    assert peak == 2
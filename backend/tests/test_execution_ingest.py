@@ -0,0 +1,243 @@
+"""Tests for buffered execution ingestion."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.execution import ExecutionRecord
+from app.services import execution_ingest
+from app.services.execution_ingest import (
+    ExecutionIngestor,
+    IngestBacklogError,
+)
+
+
+CREATED_AT = datetime.now(timezone.utc).isoformat()
+AUTH = {"Authorization": f"Bearer {create_access_token('n8n')}"}
+
+
+def _records(count: int, start: int = 0) -> list[ExecutionRecord]:
+    return [
+        ExecutionRecord(
+            id=f"ex-{index}",
+            workflowId="wf",
+            status="success",
+            createdAt=CREATED_AT,
+        )
+        for index in range(start, start + count)
+    ]
+
+
+class RecordingWriter:
+    """Collect flushed batches, optionally failing or stalling first."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.batches: list[list[str]] = []
+        self.failures = failures
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, records: Sequence[ExecutionRecord]) -> None:
+        await self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append([record.id for record in records])
+
+
+def _ingestor(writer: RecordingWriter, **kwargs: object) -> ExecutionIngestor:
+    options = {
+        "batch_size": 3,
+        "flush_interval": 0.05,
+        "max_queue": 10,
+        "retry_backoff": 0.0,
+        "manage_partitions": False,
+    }
+    options.update(kwargs)
+    return ExecutionIngestor(writer=writer, **options)
+
+
+@pytest.mark.anyio
+async def test_flushes_on_size_and_on_interval() -> None:
+    """Full batches go out at once; a partial batch waits for the timer."""
+    writer = RecordingWriter()
+    ingestor = _ingestor(writer)
+    ingestor.start()
+
+    await ingestor.submit(_records(4))
+    await asyncio.sleep(0.01)
+    assert writer.batches == [["ex-0", "ex-1", "ex-2"]]
+
+    await asyncio.sleep(0.1)
+    assert writer.batches[1:] == [["ex-3"]]
+
+    await ingestor.submit(_records(2, start=4))
+    await ingestor.stop()
+    assert writer.batches[2:] == [["ex-4", "ex-5"]]
+    assert ingestor.flushed == 6
+
+
+@pytest.mark.anyio
+async def test_slow_database_applies_backpressure() -> None:
+    """Producers wait, then give up, while the writer is stalled."""
+    writer = RecordingWriter()
+    writer.gate.clear()
+    ingestor = _ingestor(writer, max_queue=4)
+    ingestor.start()
+
+    with pytest.raises(IngestBacklogError):
+        await ingestor.submit(_records(20), timeout=0.05)
+    assert ingestor.pending == 4
+
+    writer.gate.set()
+    await ingestor.stop()
+    assert ingestor.pending == 0
+    assert sum(len(batch) for batch in writer.batches) == ingestor.flushed
+
+
+@pytest.mark.anyio
+async def test_failed_flushes_are_retried_then_dropped() -> None:
+    """Transient failures retry; a batch is dropped after max attempts."""
+    writer = RecordingWriter(failures=1)
+    ingestor = _ingestor(writer, max_attempts=2)
+    ingestor.start()
+    await ingestor.submit(_records(3))
+    await asyncio.sleep(0.01)
+    assert writer.batches == [["ex-0", "ex-1", "ex-2"]]
+
+    writer.failures = 2
+    await ingestor.submit(_records(3, start=3))
+    await ingestor.stop()
+    assert ingestor.dropped == 3
+    assert ingestor.flushed == 3
+
+
+@pytest.mark.anyio
+async def test_records_past_retention_are_skipped_not_retried() -> None:
+    """Expired records never reach the writer or stall the batch."""
+    writer = RecordingWriter()
+    ingestor = _ingestor(writer, max_attempts=1)
+    ingestor.start()
+    stale = datetime.now(timezone.utc) - timedelta(
+        days=execution_ingest.settings.execution_retention_days + 1
+    )
+    records = _records(3)
+    records[1] = records[1].model_copy(update={"created_at": stale})
+
+    await ingestor.submit(records)
+    await ingestor.stop()
+
+    assert writer.batches == [["ex-0", "ex-2"]]
+    assert (ingestor.flushed, ingestor.expired, ingestor.dropped) == (2, 1, 0)
+
+
+@pytest.mark.anyio
+async def test_route_queues_records_and_reports_backlog(monkeypatch) -> None:
+    """The endpoint accepts batches and turns a full buffer into a 503."""
+    writer = RecordingWriter()
+    writer.gate.clear()
+    ingestor = _ingestor(writer, max_queue=2, batch_size=100)
+    monkeypatch.setattr(execution_ingest, "_ingestor", ingestor)
+    monkeypatch.setattr(
+        execution_ingest.settings,
+        "execution_ingest_submit_timeout_seconds",
+        0.01,
+    )
+    body = [
+        {
+            "id": f"ex-{index}",
+            "workflowId": "wf",
+            "status": status,
+            "createdAt": CREATED_AT,
+        }
+        for index, status in enumerate(("success", "error"))
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        headers=AUTH,
+    ) as client:
+        accepted = await client.post("/executions/", json=body)
+        backlogged = await client.post("/executions/", json=body)
+
+    assert accepted.status_code == 202
+    assert accepted.json() == {"accepted": 2}
+    assert backlogged.status_code == 503
+    assert backlogged.headers["retry-after"] == "1"
+
+
+@pytest.mark.anyio
+async def test_redelivered_records_keep_their_primary_key(monkeypatch) -> None:
+    """Without createdAt a record is refused, not stored under a new key."""
+    writer = RecordingWriter()
+    ingestor = _ingestor(writer)
+    monkeypatch.setattr(execution_ingest, "_ingestor", ingestor)
+    record = {"id": "ex-1", "workflowId": "wf", "status": "success"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        headers=AUTH,
+    ) as client:
+        responses = [
+            await client.post("/executions/", json=[record])
+            for _ in range(2)
+        ]
+
+    assert [response.status_code for response in responses] == [422, 422]
+    assert ingestor.pending == 0
+
+    stamped = {**record, "createdAt": CREATED_AT}
+    first = ExecutionRecord.model_validate(stamped)
+    again = ExecutionRecord.model_validate(stamped)
+    assert (first.id, first.created_at) == (again.id, again.created_at)
+
+
+@pytest.mark.anyio
+async def test_route_requires_a_token_and_a_plausible_date(
+    monkeypatch,
+) -> None:
+    """Anonymous posts get a 401; far-future createdAt values a 422."""
+    writer = RecordingWriter()
+    ingestor = _ingestor(writer)
+    monkeypatch.setattr(execution_ingest, "_ingestor", ingestor)
+    record = {"id": "ex-1", "workflowId": "wf", "status": "success"}
+    soon = datetime.now(timezone.utc) + timedelta(hours=23)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        anonymous = await client.post(
+            "/executions/",
+            json=[{**record, "createdAt": CREATED_AT}],
+        )
+        statuses = [
+            (
+                await client.post(
+                    "/executions/",
+                    json=[{**record, "createdAt": created_at}],
+                    headers=AUTH,
+                )
+            ).status_code
+            for created_at in (
+                "9999-12-31T23:59:59+00:00",
+                (soon + timedelta(hours=2)).isoformat(),
+                soon.isoformat(),
+            )
+        ]
+
+    assert anonymous.status_code == 401
+    assert statuses == [422, 422, 202]
+    assert ingestor.pending == 1
@@ -0,0 +1,131 @@
+"""Tests for hedged upstream requests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.schemas.workflow import ChatMessage, ChatRequest
+from app.services.deepseek_service import DeepSeekService
+from app.services.hedging import HedgeBudget, Hedger, LatencyTracker
+
+BLUEPRINT = json.dumps(
+    {
+        "id": "demo",
+        "title": "Demo",
+        "description": "Demo workflow.",
+        "steps": [{"id": "cron", "type": "n8n-nodes-base.cron"}],
+        "edges": [],
+        "credentials": [],
+        "estimatedTimeSavedMinutes": 1,
+    }
+)
+
+
+def _hedger(budget_percent: float = 100.0) -> Hedger:
+    return Hedger(
+        min_delay=0.0,
+        initial_delay=0.02,
+        budget=HedgeBudget(budget_percent, burst=1.0),
+    )
+
+
+def test_tracker_percentile_uses_a_sliding_window() -> None:
+    """Old samples age out and percentiles wait for enough data."""
+    tracker = LatencyTracker(window=4, min_samples=3)
+    tracker.observe(10.0)
+    tracker.observe(1.0)
+    assert tracker.percentile(0.5) is None
+
+    for value in (2.0, 3.0, 4.0):
+        tracker.observe(value)
+
+    assert len(tracker) == 4
+    assert tracker.percentile(0.0) == 1.0
+    assert tracker.percentile(0.99) == 4.0
+
+
+def test_budget_caps_hedges_to_a_share_of_traffic() -> None:
+    """At 10% every tenth request earns one hedge."""
+    budget = HedgeBudget(10.0)
+    granted = 0
+    for _ in range(100):
+        budget.record_request()
+        granted += budget.try_spend()
+
+    assert granted == 10
+
+
+@pytest.mark.anyio
+async def test_slow_primary_loses_to_hedge_and_is_cancelled() -> None:
+    """The backup wins when the primary stalls past the delay."""
+    calls = 0
+    cancelled = asyncio.Event()
+
+    async def factory() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return "hedge"
+
+    hedger = _hedger()
+    hedger.tracker = LatencyTracker(min_samples=1)
+    assert await hedger.run(factory) == "hedge"
+    assert calls == 2
+    assert cancelled.is_set()
+    # Timed as the primary's wait until cancelled, not the hedge's win.
+    assert len(hedger.tracker) == 1
+    assert hedger.tracker.percentile(0.0) >= 0.02
+
+
+@pytest.mark.anyio
+async def test_failed_leg_drops_out_and_budget_limits_hedging() -> None:
+    """An invalid hedge does not win, and no budget means no hedge."""
+    calls = 0
+
+    async def factory() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        raise RuntimeError("unparseable")
+
+    assert await _hedger().run(factory) == "primary"
+    assert calls == 2
+
+    calls = 0
+    assert await _hedger(budget_percent=0.0).run(factory) == "primary"
+    assert calls == 1
+
+
+@pytest.mark.anyio
+async def test_generate_workflow_takes_first_valid_blueprint() -> None:
+    """With hedging on, a stalled completion is raced by a second one."""
+    service = DeepSeekService.__new__(DeepSeekService)
+    service._hedger = _hedger()
+    calls = 0
+
+    async def fake_invoke(messages: list[dict[str, str]]) -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return BLUEPRINT
+
+    setattr(service, "_invoke", fake_invoke)
+    payload = ChatRequest(
+        messages=[ChatMessage(id="m1", role="user", content="Build it.")]
+    )
+
+    blueprint = await asyncio.wait_for(service.generate_workflow(payload), 2)
+
+    assert blueprint.id == "demo"
+    assert calls == 2
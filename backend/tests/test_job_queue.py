@@ -0,0 +1,337 @@
+"""Tests for the Redis-backed generation job queue and its workers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.job import GenerationJobRequest
+from app.schemas.workflow import ChatMessage, ChatRequest, WorkflowBlueprint
+from app.services import generation_worker
+from app.services.generation_worker import GenerationWorker
+from app.services.job_queue import (
+    DEAD_LETTER_KEY,
+    JOB_KEY_PREFIX,
+    RETRY_KEY,
+    STREAM_KEY,
+    GenerationJobQueue,
+)
+from tests.fakes import FakeRedis
+
+BLUEPRINT = WorkflowBlueprint.model_validate(
+    {
+        "id": "demo",
+        "title": "Demo",
+        "description": "Demo workflow.",
+        "steps": [{"id": "cron", "name": "Cron", "type": "cron"}],
+        "edges": [],
+        "credentials": [],
+        "estimatedTimeSavedMinutes": 5,
+    }
+)
+REQUEST = ChatRequest(
+    messages=[ChatMessage(id="m1", role="user", content="Build it.")]
+)
+
+
+class FakeService:
+    """Generation service double that always returns ``BLUEPRINT``."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> WorkflowBlueprint:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return BLUEPRINT
+
+
+def _queue(redis: FakeRedis, max_attempts: int = 3) -> GenerationJobQueue:
+    return GenerationJobQueue(
+        client=redis,  # type: ignore[arg-type]
+        visibility_timeout=30.0,
+        max_attempts=max_attempts,
+        retry_backoff=10.0,
+        clock=lambda: redis.now / 1000,
+    )
+
+
+@pytest.mark.anyio
+async def test_submitted_job_is_claimed_once_and_completed() -> None:
+    """A job goes to one consumer and its result becomes pollable."""
+    redis = FakeRedis()
+    queue = _queue(redis)
+
+    submitted = await queue.submit(REQUEST)
+    (job,) = await queue.claim("a", count=5, block_ms=0)
+    assert await queue.claim("b", count=5, block_ms=0) == []
+
+    await queue.complete(job, BLUEPRINT)
+
+    state = await queue.get(submitted.job_id)
+    assert state is not None
+    assert state.status == "succeeded"
+    assert state.attempts == 1
+    assert state.result == BLUEPRINT
+    assert redis.streams[STREAM_KEY] == []
+    assert redis.pending == {}
+
+
+@pytest.mark.anyio
+async def test_unclaimed_jobs_expire_with_their_hash() -> None:
+    """Job hashes get their TTL on submit, not only when finished."""
+    redis = FakeRedis()
+    queue = _queue(redis)
+
+    submitted = await queue.submit(REQUEST)
+    key = JOB_KEY_PREFIX + submitted.job_id
+    assert key in redis.expires
+
+    redis.expires[key] = 0
+    assert await queue.get(submitted.job_id) is None
+    assert await queue.claim("a", count=5, block_ms=0) == []
+
+
+@pytest.mark.anyio
+async def test_lapsed_lease_is_redelivered_unless_renewed() -> None:
+    """Another worker takes over a job whose lease was not renewed."""
+    redis = FakeRedis()
+    queue = _queue(redis)
+    await queue.submit(REQUEST)
+    (job,) = await queue.claim("a", count=1, block_ms=0)
+
+    redis.now += 20_000
+    await queue.extend("a", [job.message_id])
+    redis.now += 20_000
+    assert await queue.claim("b", count=1, block_ms=0) == []
+
+    redis.now += 30_000
+    (retaken,) = await queue.claim("b", count=1, block_ms=0)
+    assert retaken.job_id == job.job_id
+    assert retaken.attempts == 2
+
+
+@pytest.mark.anyio
+async def test_failed_job_is_retried_then_dead_lettered() -> None:
+    """Retries requeue the job until attempts run out."""
+    redis = FakeRedis()
+    queue = _queue(redis, max_attempts=2)
+    submitted = await queue.submit(REQUEST)
+
+    (job,) = await queue.claim("a", count=1, block_ms=0)
+    await queue.fail(job, "invalid JSON", retry=True)
+    queued = await queue.get(submitted.job_id)
+    assert queued is not None and queued.status == "queued"
+
+    redis.now += 10_000
+    (job,) = await queue.claim("a", count=1, block_ms=0)
+    await queue.fail(job, "invalid JSON", retry=True)
+
+    dead = await queue.get(submitted.job_id)
+    assert dead is not None
+    assert dead.status == "dead"
+    assert dead.error == "invalid JSON"
+    assert len(redis.streams[DEAD_LETTER_KEY]) == 1
+    assert await queue.claim("a", count=1, block_ms=0) == []
+
+
+@pytest.mark.anyio
+async def test_failed_job_waits_out_exponential_backoff() -> None:
+    """A retry is not claimable before its jittered delay has passed."""
+    redis = FakeRedis()
+    queue = _queue(redis, max_attempts=3)
+    await queue.submit(REQUEST)
+
+    for attempt, ceiling in ((1, 10_000), (2, 20_000)):
+        (job,) = await queue.claim("a", count=1, block_ms=0)
+        assert job.attempts == attempt
+        await queue.fail(job, "upstream 503", retry=True)
+
+        # Equal jitter: the delay is between half and all of the ceiling.
+        redis.now += ceiling // 2 - 1
+        assert await queue.claim("b", count=1, block_ms=0) == []
+        redis.now += ceiling // 2 + 1
+
+    (job,) = await queue.claim("b", count=1, block_ms=0)
+    assert job.attempts == 3
+    assert redis.zsets[RETRY_KEY] == {}
+
+
+@pytest.mark.anyio
+async def test_workers_share_the_queue_and_deliver_callbacks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Two workers drain the queue together and POST finished jobs."""
+    redis = FakeRedis()
+    callbacks: list[dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        callbacks.append(json.loads(request.content))
+        return httpx.Response(204)
+
+    monkeypatch.setattr(
+        generation_worker,
+        "_callback_transport",
+        lambda: httpx.MockTransport(handler),
+    )
+    monkeypatch.setattr(
+        generation_worker.settings,
+        "job_callback_allowed_hosts",
+        ["hook"],
+    )
+
+    services = [FakeService(), FakeService()]
+    queues = [_queue(redis), _queue(redis)]
+    jobs = [
+        await queues[0].submit(REQUEST, callback_url="http://hook/done")
+        for _ in range(6)
+    ]
+    stop = asyncio.Event()
+    workers = [
+        GenerationWorker(queue, service, concurrency=2, consumer=name)
+        for queue, service, name in zip(queues, services, "ab")
+    ]
+    runs = [
+        asyncio.create_task(worker.run(stop, block_ms=5))
+        for worker in workers
+    ]
+
+    async def finished() -> None:
+        while len(callbacks) < len(jobs):
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(finished(), 2)
+    stop.set()
+    await asyncio.gather(*runs)
+
+    assert sum(service.calls for service in services) == len(jobs)
+    assert all(service.calls for service in services)
+    assert {callback["jobId"] for callback in callbacks} == {
+        job.job_id for job in jobs
+    }
+    assert all(callback["status"] == "succeeded" for callback in callbacks)
+
+
+@pytest.mark.anyio
+async def test_callbacks_to_internal_addresses_are_never_requested(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Loopback, private and link-local targets are refused unsent."""
+    redis = FakeRedis()
+    requested: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request)
+        return httpx.Response(204)
+
+    monkeypatch.setattr(
+        generation_worker,
+        "_callback_transport",
+        lambda: httpx.MockTransport(handler),
+    )
+
+    queue = _queue(redis)
+    urls = [
+        "http://127.0.0.1:8000/hook",
+        "http://localhost/hook",
+        "http://10.0.0.7/hook",
+        "http://169.254.169.254/latest/meta-data",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.0.1]/hook",
+    ]
+    jobs = [await queue.submit(REQUEST, callback_url=url) for url in urls]
+    worker = GenerationWorker(queue, FakeService(), concurrency=2)
+    stop = asyncio.Event()
+    run = asyncio.create_task(worker.run(stop, block_ms=5))
+
+    async def finished() -> None:
+        for job in jobs:
+            while (state := await queue.get(job.job_id)) is None or (
+                state.status != "succeeded"
+            ):
+                await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(finished(), 2)
+    stop.set()
+    await run
+
+    assert requested == []
+    refused = [r for r in caplog.records if "Refusing" in r.getMessage()]
+    assert len(refused) == len(urls)
+
+
+@pytest.mark.anyio
+async def test_callbacks_connect_to_the_checked_address(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Each hop goes to the address that passed; redirects are rechecked."""
+    addresses = {
+        "hook.example": "93.184.216.34",
+        "next.example": "2606:2800:220:1::1",
+        "127.0.0.1": "127.0.0.1",
+    }
+
+    def getaddrinfo(host: str, port: int, *args: Any, **kwargs: Any) -> Any:
+        return [(None, None, None, "", (addresses[host], port))]
+
+    requested: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request)
+        location = {
+            "hook.example": "http://next.example/again",
+            "next.example": "http://127.0.0.1/steal",
+        }[request.headers["host"]]
+        return httpx.Response(307, headers={"Location": location})
+
+    monkeypatch.setattr(generation_worker.socket, "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(
+        generation_worker,
+        "_callback_transport",
+        lambda: httpx.MockTransport(handler),
+    )
+
+    queue = _queue(FakeRedis())
+    job = await queue.submit(REQUEST, callback_url="http://hook.example/done")
+    worker = GenerationWorker(queue, FakeService(), concurrency=1)
+    stop = asyncio.Event()
+    run = asyncio.create_task(worker.run(stop, block_ms=5))
+
+    async def refused() -> None:
+        while not any(
+            "Refusing" in record.getMessage() for record in caplog.records
+        ):
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(refused(), 2)
+    stop.set()
+    await run
+
+    assert (await queue.get(job.job_id)).status == "succeeded"
+    assert [str(request.url) for request in requested] == [
+        "http://93.184.216.34/done",
+        "http://[2606:2800:220:1::1]/again",
+    ]
+    assert [request.extensions["sni_hostname"] for request in requested] == [
+        "hook.example",
+        "next.example",
+    ]
+    assert all(request.content for request in requested)
+
+
+def test_callback_urls_must_be_http() -> None:
+    """Other schemes are rejected when the job is submitted."""
+    GenerationJobRequest(messages=[], callbackUrl="https://example.com/h")
+    for url in ("file:///etc/passwd", "gopher://example.com/", "hook"):
+        with pytest.raises(ValidationError):
+            GenerationJobRequest(messages=[], callbackUrl=url)
@@ -0,0 +1,273 @@
+"""Tests for routing generations across LLM providers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.schemas.workflow import ChatMessage, ChatRequest
+from app.services.deepseek_service import ProviderAPIError
+from app.services.gemini_service import to_gemini_request
+from app.services.llm_router import (
+    LLMRouter,
+    LLMUnavailableError,
+    ProviderHealth,
+    is_provider_fault,
+)
+from tests.factories import make_blueprint
+
+PAYLOAD = ChatRequest(
+    messages=[ChatMessage(id="m1", role="user", content="Build it")]
+)
+
+
+class StatusError(Exception):
+    """SDK-style error carrying the HTTP status of the response."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"{status_code} from upstream")
+        self.status_code = status_code
+
+
+def _api_error(cause: Exception) -> ProviderAPIError:
+    error = ProviderAPIError(f"API call failed: {cause}")
+    error.__cause__ = cause
+    return error
+
+
+class FakeService:
+    """Provider double that fails, stalls or answers as told."""
+
+    def __init__(
+        self,
+        name: str,
+        error: Exception | None = None,
+        delay: float = 0.0,
+        fail_after_events: int | None = None,
+    ) -> None:
+        self.model = f"{name}-model"
+        self.name = name
+        self.error = error
+        self.delay = delay
+        self.fail_after_events = fail_after_events
+        self.calls = 0
+
+    async def generate_workflow(self, payload: ChatRequest) -> Any:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return make_blueprint(title=self.name)
+
+    async def stream_workflow(
+        self,
+        payload: ChatRequest,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        self.calls += 1
+        blueprint = make_blueprint(title=self.name)
+        if self.fail_after_events == 0:
+            raise RuntimeError(f"{self.name} stream broke")
+        yield "node", blueprint.steps[0]
+        if self.fail_after_events is not None:
+            raise RuntimeError(f"{self.name} stream broke")
+        yield "blueprint", blueprint
+
+
+def test_circuit_opens_on_failures_and_probes_after_cooldown() -> None:
+    """Consecutive failures trip it; one probe decides after cooldown."""
+    now = [0.0]
+    health = ProviderHealth(
+        max_failures=3,
+        cooldown=30.0,
+        clock=lambda: now[0],
+    )
+
+    assert not health.record_failure(1.0)
+    assert not health.record_failure(1.0)
+    assert health.record_failure(1.0)
+    assert health.state == "open"
+    assert health.acquire() is None
+
+    now[0] = 31.0
+    assert health.acquire() is True
+    assert health.acquire() is None
+    assert not health.record_failure(1.0)
+    health.release()
+    assert health.state == "open"
+
+    now[0] = 62.0
+    assert health.acquire() is True
+    assert health.record_success(1.0)
+    health.release()
+    assert health.state == "closed"
+
+
+def test_ranking_prefers_fast_healthy_providers() -> None:
+    """Unmeasured providers go first, then the lowest expected latency."""
+    router = LLMRouter({"a": FakeService("a"), "b": FakeService("b")})
+    assert router.ranked() == ["a", "b"]
+
+    router.health["a"].record_success(4.0)
+    assert router.ranked() == ["b", "a"]
+
+    router.health["b"].record_success(1.0)
+    assert router.ranked() == ["b", "a"]
+
+    # Slow failures raise both its latency and its error rate.
+    router.health["b"].record_failure(6.0)
+    router.health["b"].record_failure(6.0)
+    assert router.health["b"].state == "closed"
+    assert router.ranked() == ["a", "b"]
+
+
+@pytest.mark.anyio
+async def test_failures_fail_over_and_open_the_circuit() -> None:
+    """Callers get the backup's answer; a broken provider is skipped."""
+    broken = FakeService("broken", error=_api_error(StatusError(503)))
+    backup = FakeService("backup")
+    router = LLMRouter({"broken": broken, "backup": backup})
+    router.health["backup"].record_success(10.0)
+
+    for _ in range(3):
+        blueprint = await router.generate_workflow(PAYLOAD)
+        assert blueprint.title == "backup"
+
+    assert router.health["broken"].state == "open"
+    await router.generate_workflow(PAYLOAD)
+    assert broken.calls == 3
+    assert backup.calls == 4
+
+
+@pytest.mark.anyio
+async def test_rejected_requests_do_not_open_the_circuit() -> None:
+    """A 400 or unparseable output says nothing about provider health."""
+    rejecting = FakeService("rejecting", error=_api_error(StatusError(400)))
+    router = LLMRouter(
+        {"rejecting": rejecting, "backup": FakeService("backup")}
+    )
+
+    for _ in range(5):
+        blueprint = await router.generate_workflow(PAYLOAD)
+        assert blueprint.title == "backup"
+
+    assert router.health["rejecting"].state == "closed"
+    assert router.health["rejecting"].samples == 0
+    assert rejecting.calls == 5
+
+
+def test_only_timeouts_lost_connections_and_5xx_are_provider_faults() -> None:
+    """The SDK error is found behind the provider-neutral wrapper."""
+    request = httpx.Request("POST", "https://api.example.com")
+    faults = [
+        TimeoutError(),
+        _api_error(StatusError(502)),
+        _api_error(httpx.ConnectError("refused", request=request)),
+        _api_error(httpx.ReadTimeout("slow", request=request)),
+    ]
+    not_faults = [
+        _api_error(StatusError(400)),
+        _api_error(StatusError(429)),
+        _api_error(RuntimeError("empty response")),
+        ValueError("bad output"),
+    ]
+
+    assert [is_provider_fault(exc) for exc in faults] == [True] * 4
+    assert [is_provider_fault(exc) for exc in not_faults] == [False] * 4
+
+
+@pytest.mark.anyio
+async def test_stalled_provider_is_abandoned_after_failover_timeout() -> None:
+    """A hung call is cut off and counted against its provider."""
+    stalled = FakeService("stalled", delay=10.0)
+    router = LLMRouter(
+        {"stalled": stalled, "backup": FakeService("backup")},
+        failover_timeout=0.05,
+    )
+
+    blueprint = await asyncio.wait_for(router.generate_workflow(PAYLOAD), 2)
+
+    assert blueprint.title == "backup"
+    assert router.health["stalled"].consecutive_failures == 1
+
+
+@pytest.mark.anyio
+async def test_last_provider_failing_raises_unavailable() -> None:
+    """With every provider down the error is a RuntimeError (503)."""
+    router = LLMRouter(
+        {"only": FakeService("only", error=ValueError("bad output"))}
+    )
+
+    with pytest.raises(LLMUnavailableError, match="bad output"):
+        await router.generate_workflow(PAYLOAD)
+
+
+@pytest.mark.anyio
+async def test_streams_fail_over_only_before_the_first_event() -> None:
+    """Nothing emitted yet means a silent switch; afterwards it raises."""
+    router = LLMRouter(
+        {
+            "silent": FakeService("silent", fail_after_events=0),
+            "backup": FakeService("backup"),
+        }
+    )
+    events = [event async for event, _ in router.stream_workflow(PAYLOAD)]
+    assert events == ["node", "blueprint"]
+
+    router = LLMRouter(
+        {
+            "midway": FakeService("midway", fail_after_events=1),
+            "backup": FakeService("backup"),
+        }
+    )
+    with pytest.raises(RuntimeError, match="midway stream broke"):
+        async for _ in router.stream_workflow(PAYLOAD):
+            pass
+
+
+def test_from_settings_keeps_configured_providers_preferred_first() -> None:
+    """Providers without credentials are skipped, not fatal."""
+    def missing() -> Any:
+        raise RuntimeError("Gemini API key is not configured.")
+
+    settings = Settings(ai_provider="gemini")
+    both = LLMRouter.from_settings(
+        settings,
+        {
+            "deepseek": lambda: FakeService("d"),
+            "gemini": lambda: FakeService("g"),
+        },
+    )
+    assert list(both.services) == ["gemini", "deepseek"]
+    assert both.model == "g-model+d-model"
+
+    one = LLMRouter.from_settings(
+        settings,
+        {"deepseek": lambda: FakeService("d"), "gemini": missing},
+    )
+    assert list(one.services) == ["deepseek"]
+
+    with pytest.raises(RuntimeError, match="Gemini API key"):
+        LLMRouter.from_settings(settings, {"gemini": missing})
+
+
+def test_gemini_request_moves_system_prompts_out_of_contents() -> None:
+    """System messages become the instruction; assistant turns "model"."""
+    system, contents = to_gemini_request(
+        [
+            {"role": "system", "content": "Rules"},
+            {"role": "system", "content": "Memory"},
+            {"role": "user", "content": "Build"},
+            {"role": "assistant", "content": "{"},
+        ]
+    )
+
+    assert system == "Rules\n\nMemory"
+    assert contents == [
+        {"role": "user", "parts": ["Build"]},
+        {"role": "model", "parts": ["{"]},
+    ]
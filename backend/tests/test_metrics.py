@@ -0,0 +1,88 @@
+"""Tests for stage instrumentation and the metrics endpoint."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core import metrics
+from app.main import app
+from app.services.deepseek_service import DeepSeekService
+
+VALID_BLUEPRINT = json.dumps(
+    {
+        "id": "demo",
+        "title": "Demo",
+        "description": "Demo workflow.",
+        "steps": [
+            {"id": "cron", "name": "Cron", "type": "n8n-nodes-base.cron"}
+        ],
+        "edges": [],
+        "credentials": [],
+        "estimatedTimeSavedMinutes": 1,
+    }
+)
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_parse_stages_and_failures_are_recorded() -> None:
+    """Each parsing stage is timed and failures are counted by reason."""
+    service = DeepSeekService.__new__(DeepSeekService)
+    validated = _sample(
+        "flowforge_stage_duration_seconds_count",
+        stage="validate",
+    )
+    malformed = _sample(
+        "flowforge_blueprint_parse_failures_total",
+        reason="malformed",
+    )
+
+    service._parse_blueprint(VALID_BLUEPRINT)
+    with pytest.raises(RuntimeError):
+        service._parse_blueprint("no json here")
+
+    assert _sample(
+        "flowforge_stage_duration_seconds_count",
+        stage="validate",
+    ) == validated + 1
+    assert _sample(
+        "flowforge_blueprint_parse_failures_total",
+        reason="malformed",
+    ) == malformed + 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text() -> None:
+    """/metrics serves the exposition format with our metric families."""
+    response = TestClient(app).post(
+        "/n8n/convert",
+        content=VALID_BLUEPRINT,
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 200
+
+    scraped = TestClient(app).get("/metrics")
+
+    assert scraped.status_code == 200
+    assert scraped.headers["content-type"].startswith("text/plain")
+    body = scraped.text
+    assert 'flowforge_stage_duration_seconds_count{stage="convert"}' in body
+    assert "flowforge_generations_in_flight" in body
+
+
+def test_stage_timer_overhead_is_negligible() -> None:
+    """Timing a stage costs microseconds, not milliseconds."""
+    runs = 10_000
+    start = time.perf_counter()
+    for _ in range(runs):
+        with metrics.CLEAN_JSON.time():
+            pass
+    per_call = (time.perf_counter() - start) / runs
+
+    assert per_call < 50e-6
@@ -0,0 +1,88 @@
+"""Tests for the n8n REST client."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from app.services import n8n_client
+from app.services.n8n_client import N8NClient
+from app.services.n8n_converter import to_n8n_payload
+from tests.factories import make_blueprint
+
+
+@pytest.mark.anyio
+async def test_clients_share_one_connection_pool() -> None:
+    """Every N8NClient reuses the process-wide HTTP client."""
+    await n8n_client.close_http_client()
+    try:
+        first = N8NClient().client
+        second = N8NClient().client
+
+        assert first is second
+        assert not first.is_closed
+    finally:
+        await n8n_client.close_http_client()
+
+    assert first.is_closed
+    assert N8NClient().client is not first
+    await n8n_client.close_http_client()
+
+
+@pytest.mark.anyio
+async def test_deploy_workflow_posts_converted_payload() -> None:
+    """Deploy converts the blueprint and returns the editor URL."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"id": "wf-1"})
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    ) as http_client:
+        client = N8NClient(base_url="http://n8n.test", client=http_client)
+        result = await client.deploy_workflow(make_blueprint())
+
+    assert result["url"] == "http://n8n.test/workflow/wf-1"
+    assert seen[0].url == "http://n8n.test/api/v1/workflows"
+    assert json.loads(seen[0].content)["name"] == "Demo"
+
+
+@pytest.mark.anyio
+async def test_update_workflow_puts_in_place_and_skips_no_ops() -> None:
+    """Updates replace the workflow in place; no-op pushes are skipped."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"id": "wf-1"})
+
+    blueprint = make_blueprint()
+    previous_payload = to_n8n_payload(blueprint)
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    ) as http_client:
+        client = N8NClient(base_url="http://n8n.test", client=http_client)
+        skipped = await client.update_workflow(
+            "wf-1",
+            blueprint,
+            previous_blueprint=blueprint,
+            previous_payload=previous_payload,
+        )
+        edited = blueprint.model_copy(update={"title": "Renamed"})
+        result = await client.update_workflow(
+            "wf-1",
+            edited,
+            previous_blueprint=blueprint,
+            previous_payload=previous_payload,
+        )
+
+    assert skipped["unchanged"] is True
+    assert result["url"] == "http://n8n.test/workflow/wf-1"
+    assert len(seen) == 1
+    assert seen[0].method == "PUT"
+    assert seen[0].url == "http://n8n.test/api/v1/workflows/wf-1"
+    assert json.loads(seen[0].content)["name"] == "Renamed"
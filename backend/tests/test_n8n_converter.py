@@ -0,0 +1,267 @@
+"""Unit tests for the blueprint to n8n converter."""
+
+from __future__ import annotations
+
+import copy
+import sys
+
+from app.schemas.workflow import WorkflowBlueprint
+from app.services.n8n_converter import (
+    _sanitize_parameters,
+    to_n8n_payload,
+    to_n8n_payload_incremental,
+)
+from tests.factories import make_blueprint, make_step
+
+
+def test_sanitize_applies_alias_collection_and_property_rules() -> None:
+    """Rewrite LLM-shaped parameters into the n8n structure."""
+    raw = {
+        "url": "https://example.com",
+        "option": {"timeout": 30, "proxy": None},
+        "headerParametersUi": {"values": [{"name": "a", "value": "b"}]},
+        "queryParametersUi": [{"name": "q", "value": "1"}],
+        "bodyParametersUi": {},
+        "nested": {"propertyValues": {"key": "k"}, "items": [1, None, 2]},
+        "fields": {"propertyValues": ["drop-me", {"key": "keep"}]},
+        "empty": None,
+    }
+    snapshot = copy.deepcopy(raw)
+
+    cleaned = _sanitize_parameters(raw)
+
+    assert cleaned == {
+        "url": "https://example.com",
+        "options": {"timeout": 30},
+        "headerParametersUi": {
+            "parameters": [{"name": "a", "value": "b"}],
+        },
+        "queryParametersUi": {"parameters": [{"name": "q", "value": "1"}]},
+        "nested": {"propertyValues": [{"key": "k"}], "items": [1, 2]},
+        "fields": {"propertyValues": [{"key": "keep"}]},
+    }
+    assert raw == snapshot
+
+
+def test_sanitize_keeps_existing_options_key() -> None:
+    """Only rename ``option`` when no ``options`` value exists."""
+    cleaned = _sanitize_parameters({"option": 1, "options": {"a": 1}})
+
+    assert cleaned == {"option": 1, "options": {"a": 1}}
+
+
+def test_sanitize_returns_clean_subtrees_without_copying() -> None:
+    """Untouched containers are shared with the input."""
+    body = {"json": {"deep": [{"a": 1}, {"b": [1, 2]}]}}
+    clean = {"url": "https://example.com", "body": body}
+    dirty = {"url": "https://example.com", "body": body, "extra": None}
+
+    assert _sanitize_parameters(clean) is clean
+    cleaned = _sanitize_parameters(dirty)
+    assert cleaned is not dirty
+    assert cleaned["body"] is body
+
+
+def test_sanitize_handles_nesting_beyond_recursion_limit() -> None:
+    """Deep bodies no longer raise RecursionError."""
+    depth = sys.getrecursionlimit() * 3
+    node: dict[str, object] = {"leaf": True, "drop": None}
+    for _ in range(depth):
+        node = {"child": node}
+
+    cleaned = _sanitize_parameters(node)
+
+    for _ in range(depth):
+        cleaned = cleaned["child"]
+    assert cleaned == {"leaf": True}
+
+
+def test_payload_does_not_mutate_blueprint_parameters() -> None:
+    """Converter-added keys never leak back into the blueprint."""
+    blueprint = WorkflowBlueprint.model_validate(
+        {
+            "id": "demo",
+            "title": "Demo",
+            "description": "Demo workflow.",
+            "steps": [
+                {
+                    "id": "code",
+                    "name": "Code",
+                    "type": "n8n-nodes-base.code",
+                    "parameters": {"mode": "runOnceForAllItems"},
+                    "jsCode": "return items;",
+                }
+            ],
+            "edges": [],
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+    payload = to_n8n_payload(blueprint)
+
+    assert payload["nodes"][0]["parameters"]["jsCode"] == "return items;"
+    assert blueprint.steps[0].parameters == {"mode": "runOnceForAllItems"}
+
+
+def test_payload_leaves_nested_blueprint_parameters_untouched() -> None:
+    """Wait, HTTP and If rewrites never write into shared containers."""
+    blueprint = make_blueprint(
+        [
+            make_step(
+                "wait",
+                "n8n-nodes-base.wait",
+                parameters={
+                    "unit": "days",
+                    "waitFor": {"unit": "days", "value": "3"},
+                },
+            ),
+            make_step(
+                "fetch",
+                "n8n-nodes-base.httpRequest",
+                parameters={
+                    "url": "https://example.com",
+                    "sendHeaders": "true",
+                    "headerParametersUi": {
+                        "values": [{"name": "a", "value": "b"}],
+                    },
+                    "option": {"timeout": 30, "proxy": None},
+                    "jsonBody": {"deep": {"keep": [1, 2]}},
+                },
+            ),
+            make_step(
+                "check",
+                "n8n-nodes-base.if",
+                parameters={
+                    "conditions": {
+                        "combinator": "or",
+                        "options": {"caseSensitive": True},
+                        "conditions": [
+                            {
+                                "leftValue": "{{ $json.a }}",
+                                "rightValue": "1",
+                                "operator": {
+                                    "type": "number",
+                                    "operation": "gt",
+                                },
+                            }
+                        ],
+                    },
+                },
+            ),
+        ]
+    )
+    snapshot = copy.deepcopy(blueprint.model_dump())
+
+    wait, fetch, check = to_n8n_payload(blueprint)["nodes"]
+
+    assert wait["parameters"]["amount"] == 3
+    assert fetch["parameters"]["sendHeaders"] is True
+    assert fetch["parameters"]["options"] == {"timeout": 30}
+    assert check["parameters"]["combineOperation"] == "any"
+    assert blueprint.model_dump() == snapshot
+
+
+def test_wait_node_accepts_nested_wait_for_amount() -> None:
+    """A nested ``waitFor`` object no longer crashes the conversion."""
+    blueprint = WorkflowBlueprint.model_validate(
+        {
+            "id": "demo",
+            "title": "Demo",
+            "description": "Demo workflow.",
+            "steps": [
+                {
+                    "id": "wait",
+                    "name": "Wait",
+                    "type": "n8n-nodes-base.wait",
+                    "parameters": {
+                        "unit": "days",
+                        "waitFor": {"unit": "days", "value": 3},
+                    },
+                }
+            ],
+            "edges": [],
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+    parameters = to_n8n_payload(blueprint)["nodes"][0]["parameters"]
+
+    assert parameters["amount"] == 3
+    assert parameters["waitTill"] == "timeInterval"
+
+
+def _chain_blueprint(size: int) -> WorkflowBlueprint:
+    return WorkflowBlueprint.model_validate(
+        {
+            "id": "chain",
+            "title": "Chain",
+            "description": "Chain workflow.",
+            "steps": [
+                {
+                    "id": f"s{index}",
+                    "name": f"Step {index}",
+                    "type": "n8n-nodes-base.code",
+                    "parameters": {"mode": "runOnceForAllItems"},
+                }
+                for index in range(size)
+            ],
+            "edges": [
+                {
+                    "id": f"e{index}",
+                    "source": f"s{index}",
+                    "target": f"s{index + 1}",
+                }
+                for index in range(size - 1)
+            ],
+            "credentials": [],
+            "estimatedTimeSavedMinutes": 1,
+        }
+    )
+
+
+def test_incremental_conversion_reuses_unchanged_nodes() -> None:
+    """Only edited steps are rebuilt and they keep their position."""
+    previous = _chain_blueprint(4)
+    previous_payload = to_n8n_payload(previous)
+    edited = previous.model_copy(deep=True)
+    edited.steps[1].parameters = {"mode": "runOnceForEachItem"}
+    edited.steps[3].name = "Renamed"
+
+    payload = to_n8n_payload_incremental(edited, previous, previous_payload)
+
+    old_nodes = previous_payload["nodes"]
+    assert payload["nodes"][0] is old_nodes[0]
+    assert payload["nodes"][2] is old_nodes[2]
+    assert payload["nodes"][1] is not old_nodes[1]
+    assert payload["nodes"][1]["position"] == old_nodes[1]["position"]
+    assert (
+        payload["connections"]["Step 0"]
+        is previous_payload["connections"]["Step 0"]
+    )
+    assert payload["connections"]["Step 2"]["main"][0][0]["node"] == (
+        "Renamed"
+    )
+    expected = to_n8n_payload(edited)
+    assert payload["connections"] == expected["connections"]
+    assert [node["parameters"] for node in payload["nodes"]] == [
+        node["parameters"] for node in expected["nodes"]
+    ]
+
+
+def test_incremental_conversion_places_new_and_drops_removed_steps() -> None:
+    """Removed steps vanish with their edges and new steps get a slot."""
+    previous = _chain_blueprint(3)
+    previous_payload = to_n8n_payload(previous)
+    edited = _chain_blueprint(4)
+    edited.steps.pop(1)
+    edited.edges = [
+        edge for edge in edited.edges if "s1" not in (edge.source, edge.target)
+    ]
+
+    payload = to_n8n_payload_incremental(edited, previous, previous_payload)
+
+    assert [node["id"] for node in payload["nodes"]] == ["s0", "s2", "s3"]
+    assert payload["nodes"][2]["position"]
+    assert set(payload["connections"]) == {"Step 2"}
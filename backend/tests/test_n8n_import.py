@@ -0,0 +1,110 @@
+"""Tests for converting n8n documents and exports back into blueprints."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.n8n_converter import to_n8n_payload
+from app.services.n8n_import import (
+    WorkflowExportReader,
+    from_n8n_payload,
+    iter_export,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SAVED_WORKFLOW = REPO_ROOT / "n8n_saved_workflow.json"
+
+
+def _saved_workflow() -> dict:
+    # Saved from PowerShell, so the fixture is UTF-16 with a BOM.
+    return json.loads(SAVED_WORKFLOW.read_bytes().decode("utf-16"))
+
+
+def test_connections_become_indexed_edges() -> None:
+    """Every connection slot keeps its output and input index."""
+    blueprint = from_n8n_payload(_saved_workflow())
+
+    routing = [
+        edge for edge in blueprint.edges if edge.source == "risk-routing"
+    ]
+    assert sorted(edge.source_output_index for edge in routing) == [0, 1, 2]
+    merges = [
+        edge.target_input_index
+        for edge in blueprint.edges
+        if edge.target == "merge-customer-data"
+    ]
+    assert sorted(merges) == [0, 1, 2]
+    assert len({edge.id for edge in blueprint.edges}) == len(blueprint.edges)
+
+
+def test_round_trip_reproduces_the_n8n_document() -> None:
+    """convert -> reverse -> convert yields the same n8n payload."""
+    original = from_n8n_payload(_saved_workflow())
+    first = to_n8n_payload(original)
+
+    second = to_n8n_payload(from_n8n_payload(first))
+
+    assert second == first
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 16])
+def test_export_reader_splits_documents_across_chunks(
+    chunk_size: int,
+) -> None:
+    """Workflows come out whole no matter where chunks are cut."""
+    tricky = {
+        "name": 'Braces } ] in "strings" \\ and {escapes}',
+        "nodes": [],
+        "connections": {},
+    }
+    export = json.dumps([_saved_workflow(), tricky, 7, tricky]).encode()
+
+    blueprints = list(iter_export(io.BytesIO(export), chunk_size))
+
+    assert [blueprint.title for blueprint in blueprints] == [
+        _saved_workflow()["name"],
+        tricky["name"],
+        tricky["name"],
+    ]
+
+
+def test_export_reader_accepts_ndjson_and_drops_consumed_bytes() -> None:
+    """Concatenated documents work and the buffer does not grow."""
+    reader = WorkflowExportReader()
+    line = json.dumps({"name": "x" * 1000, "nodes": []}).encode() + b"\n"
+
+    for _ in range(200):
+        assert len(reader.feed(line)) == 1
+    reader.close()
+
+    assert len(reader._buffer) <= len(line)
+
+    reader.feed(b'[{"name": "cut')
+    with pytest.raises(ValueError):
+        reader.close()
+
+
+@pytest.mark.anyio
+async def test_import_endpoint_streams_blueprints_and_errors() -> None:
+    """Each workflow becomes a line; a bad one does not stop the rest."""
+    export = json.dumps(
+        [_saved_workflow(), {"nodes": [{"type": "x"}]}, _saved_workflow()]
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        response = await client.post("/n8n/import", content=export)
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["blueprint"]["steps"][0]["id"] == "trigger"
+    assert "error" in lines[1]
+    assert lines[2]["blueprint"] == lines[0]["blueprint"]
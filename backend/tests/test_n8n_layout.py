@@ -0,0 +1,92 @@
+"""Tests for the layered auto-layout engine."""
+
+from __future__ import annotations
+
+import time
+
+from app.services.n8n_converter import to_n8n_payload
+from app.services.n8n_layout import layered_layout
+from tests.factories import make_blueprint
+
+
+def test_layers_follow_longest_path() -> None:
+    """A shortcut edge must not pull its target into an earlier layer."""
+    slots = layered_layout(4, [(0, 1), (1, 2), (0, 2), (2, 3)])
+
+    assert [layer for layer, _ in slots] == [0, 1, 2, 3]
+
+
+def test_cycles_and_disconnected_components_are_placed() -> None:
+    """Back edges are ignored and every component gets its own rows."""
+    edges = [(0, 1), (1, 2), (2, 0), (3, 4)]
+    triggers = [True, False, False, False, False]
+
+    slots = layered_layout(5, edges, triggers=triggers)
+
+    assert [layer for layer, _ in slots] == [0, 1, 2, 0, 1]
+    assert len(set(slots)) == 5
+
+
+def test_sweeps_remove_avoidable_crossings() -> None:
+    """A shared child moves between its parents' other children."""
+    # Discovery order gives layer 1 as [2, 4, 3], where 0->4 crosses 1->2.
+    edges = [(0, 2), (1, 2), (1, 3), (0, 4)]
+
+    unswept = layered_layout(5, edges, sweeps=0)
+    swept = layered_layout(5, edges)
+
+    assert unswept[2][1] < unswept[4][1]
+    assert swept[4][1] < swept[2][1] < swept[3][1]
+
+
+def test_payload_positions_are_stable_and_respect_explicit_ones() -> None:
+    """Repeated conversions agree and model-provided positions win."""
+    blueprint = make_blueprint(
+        [
+            ("start", "n8n-nodes-base.webhook"),
+            ("a", "n8n-nodes-base.code"),
+            ("b", "n8n-nodes-base.code"),
+        ],
+        [("start", "a"), ("start", "b"), ("b", "start")],
+    )
+    blueprint.steps[2].position = [10, 20]
+
+    first = to_n8n_payload(blueprint)
+    second = to_n8n_payload(blueprint)
+
+    positions = {node["id"]: node["position"] for node in first["nodes"]}
+    assert positions == {
+        node["id"]: node["position"] for node in second["nodes"]
+    }
+    assert positions["start"][0] < positions["a"][0]
+    assert positions["b"] == [10, 20]
+
+
+def test_edgeless_blueprint_uses_grid() -> None:
+    """Without edges the nodes fall back to the three column grid."""
+    blueprint = make_blueprint(
+        [(f"s{index}", "n8n-nodes-base.code") for index in range(4)], []
+    )
+
+    payload = to_n8n_payload(blueprint)
+
+    assert [node["position"] for node in payload["nodes"]] == [
+        [200, 240],
+        [520, 240],
+        [840, 240],
+        [200, 440],
+    ]
+
+
+def test_wide_workflow_layout_is_fast() -> None:
+    """A 10k node fan-out lays out well under a second."""
+    size = 10_000
+    edges = [(0, index) for index in range(1, size)]
+    edges += [(index, index + 1) for index in range(1, size - 1, 2)]
+
+    start = time.perf_counter()
+    slots = layered_layout(size, edges)
+    elapsed = time.perf_counter() - start
+
+    assert len(set(slots)) == size
+    assert elapsed < 1.0
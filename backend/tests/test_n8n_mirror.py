@@ -0,0 +1,137 @@
+"""Tests for the Redis mirror of n8n workflows."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.n8n_client import N8NClient
+from app.services.n8n_mirror import N8NMirror
+from tests.fakes import FakeRedis
+
+
+class FakeN8N:
+    """Serve ``workflows`` in cursor-linked pages of ``page_size``."""
+
+    def __init__(self, log: list[str], count: int, page_size: int) -> None:
+        self.log = log
+        self.page_size = page_size
+        self.workflows = [
+            {
+                "id": str(index),
+                "name": f"Flow {index}",
+                "active": False,
+                "updatedAt": f"2025-01-01T00:00:{index:02d}.000Z",
+                "nodes": [{"name": "Start"}],
+                "tags": [{"id": "t", "name": "ops"}],
+            }
+            for index in range(count)
+        ]
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        cursor = request.url.params.get("cursor")
+        start = int(cursor or 0)
+        self.log.append(f"fetch {start}")
+        await asyncio.sleep(0.005)
+        end = start + self.page_size
+        return httpx.Response(
+            200,
+            json={
+                "data": self.workflows[start:end],
+                "nextCursor": (
+                    str(end) if end < len(self.workflows) else None
+                ),
+            },
+        )
+
+
+def _mirror(n8n: FakeN8N, redis: FakeRedis) -> N8NMirror:
+    client = N8NClient(
+        base_url="http://n8n",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(n8n)),
+    )
+    return N8NMirror(
+        client=redis,  # type: ignore[arg-type]
+        n8n=client,
+        max_staleness=60,
+        page_size=n8n.page_size,
+    )
+
+
+@pytest.mark.anyio
+async def test_sync_mirrors_every_page_and_serves_reads_locally() -> None:
+    """Reads after a sync come from Redis, newest update first."""
+    log: list[str] = []
+    n8n = FakeN8N(log, count=7, page_size=3)
+    mirror = _mirror(n8n, FakeRedis(log, latency=0.01))
+
+    assert (await mirror.status())["stale"] is True
+    log.clear()
+    result = await mirror.sync()
+
+    assert (result.pages, result.seen, result.written) == (3, 7, 7)
+    # The next page is requested before the current one is stored.
+    assert log.index("fetch 3") < log.index("written")
+
+    listed = await mirror.list(limit=2)
+    assert [item["id"] for item in listed] == ["6", "5"]
+    assert listed[0]["tags"] == ["ops"] and listed[0]["nodeCount"] == 1
+    document = await mirror.get("4")
+    assert document is not None and document["name"] == "Flow 4"
+    status = await mirror.status()
+    assert status["workflows"] == 7 and status["stale"] is False
+
+
+@pytest.mark.anyio
+async def test_resync_writes_only_changes_and_drops_deleted() -> None:
+    """Unchanged workflows are skipped; vanished ones are removed."""
+    log: list[str] = []
+    n8n = FakeN8N(log, count=5, page_size=2)
+    mirror = _mirror(n8n, FakeRedis(log, latency=0.01))
+    await mirror.sync()
+
+    n8n.workflows[1]["updatedAt"] = "2025-02-01T00:00:00.000Z"
+    n8n.workflows[1]["name"] = "Renamed"
+    del n8n.workflows[3]
+    result = await mirror.sync()
+
+    assert (result.seen, result.written, result.removed) == (4, 1, 1)
+    assert [item["id"] for item in await mirror.list()] == [
+        "1",
+        "4",
+        "2",
+        "0",
+    ]
+    assert await mirror.get("3") is None
+    renamed = await mirror.get("1")
+    assert renamed is not None and renamed["name"] == "Renamed"
+
+
+@pytest.mark.anyio
+async def test_concurrent_syncs_share_one_pass() -> None:
+    """Overlapping sync calls do not page through n8n twice."""
+    log: list[str] = []
+    n8n = FakeN8N(log, count=4, page_size=2)
+    mirror = _mirror(n8n, FakeRedis(log, latency=0.01))
+
+    first, second = await asyncio.gather(mirror.sync(), mirror.sync())
+
+    assert first is second
+    assert log.count("fetch 0") == 1
+
+
+@pytest.mark.anyio
+async def test_refresher_keeps_the_mirror_within_its_staleness_bound() -> None:
+    """The background task syncs on start and again each half bound."""
+    log: list[str] = []
+    n8n = FakeN8N(log, count=2, page_size=2)
+    mirror = _mirror(n8n, FakeRedis(log, latency=0.01))
+    mirror.max_staleness = 0.1
+
+    mirror.start()
+    await asyncio.sleep(0.18)
+    await mirror.stop()
+
+    assert log.count("fetch 0") >= 2
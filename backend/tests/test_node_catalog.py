@@ -0,0 +1,120 @@
+"""Tests for the versioned n8n node catalog."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.deepseek_service import SYSTEM_INSTRUCTION
+from app.services.node_catalog import (
+    NodeCatalog,
+    NodeCatalogError,
+    catalog_entry_from_n8n,
+    get_node_catalog,
+)
+
+
+def test_catalog_resolves_aliases_and_versions() -> None:
+    """Aliases map to their replacement and bad versions fall back."""
+    catalog = get_node_catalog()
+    assert catalog is get_node_catalog()
+
+    spec = catalog.get("n8n-nodes-base.switch")
+    assert spec is not None and spec.type == "n8n-nodes-base.if"
+    assert spec.max_outputs == 2
+
+    http = catalog.get("n8n-nodes-base.httpRequest")
+    assert http is not None
+    assert http.coerce_version("3") == 3
+    assert http.coerce_version(9) == http.default_version == 4
+    assert catalog.get("n8n-nodes-base.unknown") is None
+
+
+def test_catalog_is_read_only() -> None:
+    """Shared specs cannot be mutated by one caller for everyone."""
+    spec = get_node_catalog().get("n8n-nodes-base.slack")
+    assert spec is not None
+    with pytest.raises(TypeError):
+        spec.parameters["text"] = spec.parameters["channel"]  # type: ignore
+    with pytest.raises(AttributeError):
+        spec.default_version = 1  # type: ignore[misc]
+
+
+def test_compiled_parameter_schema_checks_and_coerces() -> None:
+    """Known parameters are typed; expressions and unknown keys pass."""
+    spec = get_node_catalog().get("n8n-nodes-base.wait")
+    assert spec is not None
+
+    issues = spec.check_parameters(
+        {"amount": "soon", "unit": "weeks", "resume": "={{ $json.mode }}"}
+    )
+    assert [(i.parameter, i.code) for i in issues] == [
+        ("amount", "parameter_type"),
+        ("unit", "parameter_option"),
+    ]
+    assert spec.coerce_parameters({"amount": "3", "extra": "x"}) == {
+        "amount": 3,
+        "extra": "x",
+    }
+
+    http = get_node_catalog().get("n8n-nodes-base.httpRequest")
+    assert http is not None
+    missing = http.check_parameters({"sendBody": True})
+    assert [(i.parameter, i.code) for i in missing] == [
+        ("url", "parameter_missing"),
+    ]
+
+
+def test_prompt_lists_exactly_the_promptable_types() -> None:
+    """The system prompt and the catalog agree on supported nodes."""
+    listed = [
+        line.strip()
+        for line in SYSTEM_INSTRUCTION.splitlines()
+        if line.startswith("    n8n-nodes-base.")
+    ]
+
+    assert sorted(listed) == sorted(get_node_catalog().promptable_types())
+
+
+def test_unsupported_catalog_version_is_rejected() -> None:
+    """A data file from a newer exporter fails loudly."""
+    with pytest.raises(NodeCatalogError):
+        NodeCatalog.from_document({"catalogVersion": 99, "nodes": {}})
+
+
+def test_n8n_description_is_exported_as_catalog_entry() -> None:
+    """Repeated displayOptions properties merge into one schema."""
+    entry = catalog_entry_from_n8n(
+        {
+            "name": "n8n-nodes-base.demo",
+            "displayName": "Demo",
+            "version": [1, 2],
+            "group": ["trigger"],
+            "inputs": [],
+            "outputs": ["main", "main"],
+            "credentials": [{"name": "demoApi", "required": True}],
+            "properties": [
+                {
+                    "name": "mode",
+                    "type": "options",
+                    "options": [{"value": "a"}],
+                    "displayOptions": {"show": {"version": [1]}},
+                },
+                {
+                    "name": "mode",
+                    "type": "options",
+                    "options": [{"value": "b"}],
+                },
+                {"name": "url", "type": "string", "required": True},
+                {"name": "notice", "type": "notice"},
+            ],
+        }
+    )
+
+    assert entry["defaultVersion"] == 2
+    assert entry["trigger"] and entry["outputs"] == 2
+    assert entry["credentials"] == ["demoApi"]
+    assert entry["credentialsRequired"]
+    assert entry["parameters"] == {
+        "mode": {"type": "options", "options": ["a", "b"]},
+        "url": {"type": "string", "required": True},
+    }
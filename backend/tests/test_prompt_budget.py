@@ -0,0 +1,108 @@
+"""Tests for prompt token budgeting and history compaction."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from app.schemas.workflow import ChatMessage, ChatRequest
+from app.services.deepseek_service import (
+    MEMORY_PRESET,
+    SYSTEM_INSTRUCTION,
+    DeepSeekService,
+)
+from app.services.prompt_budget import (
+    PromptBudget,
+    estimate_tokens,
+    track_prompt_usage,
+)
+
+PREFIX = (
+    {"role": "system", "content": "You build workflows."},
+    {"role": "system", "content": "Memory."},
+)
+
+
+def _history(turns: int, words: int = 50) -> list[ChatMessage]:
+    return [
+        ChatMessage(
+            id=f"m{index}",
+            role="user" if index % 2 == 0 else "assistant",
+            content=f"turn {index} " + "lorem " * words,
+        )
+        for index in range(turns)
+    ]
+
+
+def test_estimate_tokens_counts_words_and_punctuation() -> None:
+    """Long runs split into several tokens, punctuation counts alone."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hello world") == 4
+    assert estimate_tokens('{"id": 1}') == 7
+
+
+def test_history_under_budget_is_sent_verbatim() -> None:
+    """Nothing is compacted while the prompt fits."""
+    history = _history(4)
+
+    plan = PromptBudget(max_tokens=10_000).plan(PREFIX, history)
+
+    assert plan.compacted_turns == 0
+    assert plan.messages[:2] == list(PREFIX)
+    assert [m["content"] for m in plan.messages[2:]] == [
+        m.content for m in history
+    ]
+
+
+def test_compaction_keeps_prefix_and_recent_turns() -> None:
+    """Old turns fold into chunk summaries; recent turns stay intact."""
+    history = _history(20)
+    budget = PromptBudget(max_tokens=500, keep_recent_turns=4, chunk_turns=4)
+
+    plan = budget.plan(PREFIX, history)
+
+    assert plan.messages[:2] == list(PREFIX)
+    assert plan.compacted_turns == 16
+    summaries = plan.messages[2:6]
+    assert summaries[0]["content"].startswith(
+        "Summary of earlier conversation (turns 1-4):"
+    )
+    assert [m["content"] for m in plan.messages[6:]] == [
+        m.content for m in history[16:]
+    ]
+    assert plan.estimated_tokens < sum(
+        estimate_tokens(m.content) for m in history
+    )
+
+
+def test_chunk_summaries_are_stable_as_history_grows() -> None:
+    """A longer conversation repeats the earlier prompt's summaries."""
+    budget = PromptBudget(max_tokens=300, keep_recent_turns=2, chunk_turns=4)
+
+    shorter = budget.plan(PREFIX, _history(10))
+    longer = budget.plan(PREFIX, _history(14))
+
+    summaries = 2 + shorter.compacted_turns // 4
+    assert longer.messages[:summaries] == shorter.messages[:summaries]
+
+
+def test_service_records_prompt_usage_for_the_request() -> None:
+    """Estimates and provider cache counts land on the request's usage."""
+    service = DeepSeekService.__new__(DeepSeekService)
+    payload = ChatRequest(messages=_history(2))
+
+    with track_prompt_usage() as usage:
+        messages = getattr(service, "_build_messages")(payload)
+        getattr(service, "_record_usage")(
+            SimpleNamespace(
+                prompt_tokens=900,
+                prompt_cache_hit_tokens=640,
+                prompt_cache_miss_tokens=260,
+            )
+        )
+
+    assert messages[0]["content"] == SYSTEM_INSTRUCTION
+    assert messages[1]["content"] == MEMORY_PRESET
+    assert usage.estimated_tokens > 0
+    headers = usage.as_headers()
+    assert headers["X-Prompt-Tokens"] == "900"
+    assert headers["X-Prompt-Cache-Hit-Tokens"] == "640"
@@ -0,0 +1,80 @@
+"""Tests for the fast JSON helpers."""
+
+from __future__ import annotations
+
+import json
+import math
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import serialization
+from app.core.serialization import (
+    FastJSONResponse,
+    FastJSONRoute,
+    dumps,
+    loads,
+)
+
+
+def test_dumps_matches_stdlib_and_falls_back_for_huge_ints() -> None:
+    """Output decodes like stdlib JSON; orjson gaps use the stdlib."""
+    document = {"name": "Café ✓", "nested": [1, 2.5, None, True], 3: "x"}
+
+    assert json.loads(dumps(document)) == json.loads(json.dumps(document))
+    big = 2**70 + 1
+    assert loads(dumps({"big": big})) == {"big": big}
+    assert loads(b"[-9223372036854775809]") == [-(2**63) - 1]
+
+
+def test_non_finite_floats_round_trip_like_stdlib() -> None:
+    """NaN and infinities are written and read as the stdlib does."""
+    document = {"nan": float("nan"), "values": [float("-inf"), None]}
+
+    encoded = dumps(document)
+    decoded = loads(encoded)
+
+    assert encoded == json.dumps(document, separators=(",", ":")).encode()
+    assert math.isnan(decoded["nan"])
+    assert decoded["values"] == [float("-inf"), None]
+    assert dumps({"empty": None}) == b'{"empty":null}'
+
+
+def test_loads_raises_stdlib_decode_error() -> None:
+    """Callers catching json.JSONDecodeError keep working."""
+    with pytest.raises(json.JSONDecodeError):
+        loads('{"unterminated": ')
+
+
+def test_stdlib_fallback_without_orjson(monkeypatch) -> None:
+    """Everything still works when orjson is not installed."""
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    body = FastJSONResponse({"workflow": {"nodes": []}}).body
+
+    assert body == b'{"workflow":{"nodes":[]}}'
+    assert loads(body) == {"workflow": {"nodes": []}}
+
+
+def test_fast_json_route_keeps_fastapi_body_errors() -> None:
+    """Bodies decode through orjson; bad JSON is still a FastAPI 422."""
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.post("/echo")
+    async def echo(payload: dict[str, int]) -> dict[str, int]:
+        return payload
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.post("/echo", json={"a": 1}).json() == {"a": 1}
+    invalid = client.post(
+        "/echo",
+        content=b'{"a": ',
+        headers={"content-type": "application/json"},
+    )
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["type"] == "json_invalid"
+    assert client.post("/echo", json={"a": "x"}).status_code == 422
@@ -0,0 +1,89 @@
+"""Tests for the index-based graph shared by the converter passes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from app.schemas.workflow import WorkflowEdge
+from app.services.n8n_converter import to_n8n_payload
+from app.services.workflow_graph import MISSING, WorkflowGraph
+from tests.factories import make_blueprint
+
+
+def test_adjacency_groups_edges_by_source_in_order() -> None:
+    """CSR rows keep each source's edges in blueprint order."""
+    graph = WorkflowGraph.from_blueprint(
+        make_blueprint(
+            ["a", "b", "c"],
+            [("b", "c", 0), ("a", "c", 1), ("a", "b", 0), ("c", "a", 0)],
+        )
+    )
+
+    assert list(graph.offsets) == [0, 2, 3, 4]
+    assert list(graph.edges_from(0)) == [1, 2]
+    assert list(graph.successors(0)) == [2, 1]
+    assert list(graph.pairs()) == [(1, 2), (0, 2), (0, 1), (2, 0)]
+
+
+def test_unknown_ends_and_duplicate_ids_stay_out_of_the_adjacency() -> None:
+    """Dangling edges are marked and later duplicates get no edges."""
+    graph = WorkflowGraph.from_blueprint(
+        make_blueprint(
+            ["a", "b", "a"],
+            [("a", "b", 0), ("a", "ghost", 0), ("nobody", "b", 0)],
+        )
+    )
+
+    assert graph.duplicates == [2]
+    assert list(graph.targets) == [1, MISSING, 1]
+    assert list(graph.sources) == [0, 0, MISSING]
+    assert list(graph.out_edges) == [0]
+    assert not graph.edges_from(2)
+
+
+def test_one_pass_flags_duplicate_ids_and_ported_edges() -> None:
+    """Edges needing a second look are noted while resolving them."""
+    blueprint = make_blueprint(
+        ["a", "b"],
+        [
+            ("a", "b", 0),
+            {"id": "e0", "source": "a", "target": "b"},
+            ("a", "b", 1),
+            {
+                "id": "ai",
+                "source": "a",
+                "target": "b",
+                "connectionType": "ai_tool",
+            },
+        ],
+    )
+    reads = []
+
+    class Edges(list):
+        def __iter__(self) -> Iterator[WorkflowEdge]:
+            reads.append("scan")
+            return super().__iter__()
+
+    graph = WorkflowGraph(blueprint.steps, Edges(blueprint.edges))
+
+    assert reads == ["scan"]
+    assert graph.duplicate_edges == [1]
+    assert list(graph.ported) == [0, 0, 1, 1]
+
+
+def test_converter_accepts_a_prebuilt_graph() -> None:
+    """Passing the graph in gives the same document as building it."""
+    blueprint = make_blueprint(["a", "b", "c"], [("a", "b", 0), ("a", "c", 1)])
+    graph = WorkflowGraph.from_blueprint(blueprint)
+
+    payload = to_n8n_payload(blueprint, graph)
+
+    assert payload == to_n8n_payload(blueprint)
+    assert payload["connections"] == {
+        "A": {
+            "main": [
+                [{"node": "B", "type": "main", "index": 0}],
+                [{"node": "C", "type": "main", "index": 0}],
+            ]
+        }
+    }
@@ -0,0 +1,33 @@
+"""Tests for blueprint schema validation shortcuts."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.workflow import LARGE_PARAMETERS, WorkflowNode
+
+
+def _node(parameters: dict) -> WorkflowNode:
+    return WorkflowNode.model_validate(
+        {"id": "a", "name": "A", "type": "x", "parameters": parameters}
+    )
+
+
+def test_large_parameters_are_adopted_small_ones_copied() -> None:
+    """Only objects past the threshold skip pydantic's copy."""
+    large = {f"key{index}": [index] for index in range(LARGE_PARAMETERS + 1)}
+    small = {"url": "https://example.com"}
+
+    assert _node(large).parameters is large
+    assert _node(small).parameters == small
+    assert _node(small).parameters is not small
+
+
+def test_large_parameters_with_bad_keys_are_still_rejected() -> None:
+    """A non-string key sends the object through full validation."""
+    large = {f"key{index}": index for index in range(LARGE_PARAMETERS)}
+    large[1] = "one"
+
+    with pytest.raises(ValidationError):
+        _node(large)
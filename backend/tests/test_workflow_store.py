@@ -0,0 +1,155 @@
+"""Tests for workflow persistence helpers and CRUD routes."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import get_db_session
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User
+from app.services import workflow_store
+from tests.factories import make_blueprint
+from tests.fakes import MemorySession
+
+_START = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    """Minimal stand-in for a SQLAlchemy result."""
+
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class FakeSession:
+    """Record executed statements and answer with canned rows."""
+
+    def __init__(self, rows: list[Any]) -> None:
+        self.rows = rows
+        self.statements: list[Any] = []
+
+    async def execute(self, statement: Any) -> FakeResult:
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+def _rows(count: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=f"wf-{index}",
+            title=f"Workflow {index}",
+            description=None,
+            created_at=_START - timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def test_cursor_round_trips_and_rejects_garbage() -> None:
+    """Cursors decode back to their key; junk raises a clear error."""
+    cursor = workflow_store.encode_cursor(_START, "wf|odd")
+
+    assert workflow_store.decode_cursor(cursor) == (_START, "wf|odd")
+    with pytest.raises(workflow_store.InvalidCursorError):
+        workflow_store.decode_cursor("not-a-cursor")
+
+
+def test_list_query_seeks_by_key_without_loading_blueprints() -> None:
+    """The page query is a bounded row-comparison seek on summary columns."""
+    query = workflow_store.build_list_query("user-1", 50, (_START, "wf-9"))
+
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "blueprint" not in sql
+    assert "(workflows.created_at, workflows.id) <" in sql
+    assert "ORDER BY workflows.created_at DESC, workflows.id DESC" in sql
+    assert "OFFSET" not in sql
+    assert query._limit == 51
+
+
+def test_list_route_pages_with_next_cursor() -> None:
+    """A full page returns a cursor pointing at its last row."""
+    session = FakeSession(_rows(3))
+
+    async def override() -> Any:
+        yield session
+
+    app.dependency_overrides[get_db_session] = override
+    try:
+        client = TestClient(app)
+        unauthorized = client.get("/workflows/")
+        response = client.get(
+            "/workflows/?limit=2",
+            headers={
+                "Authorization": f"Bearer {create_access_token('user-1')}"
+            },
+        )
+    finally:
+        app.dependency_overrides.pop(get_db_session, None)
+
+    assert unauthorized.status_code == 401
+    assert response.status_code == 200
+    page = response.json()
+    assert [item["id"] for item in page["items"]] == ["wf-0", "wf-1"]
+    assert workflow_store.decode_cursor(page["nextCursor"]) == (
+        _START - timedelta(minutes=1),
+        "wf-1",
+    )
+    params = session.statements[0].compile().params
+    assert "user-1" in params.values()
+
+
+def test_workflow_crud_is_scoped_to_its_owner() -> None:
+    """Create, read, replace and delete work; other users see nothing."""
+    session = MemorySession()
+    for user_id in ("owner", "other"):
+        session.users[user_id] = User(
+            id=user_id,
+            email=f"{user_id}@example.com",
+            hashed_password="-",
+        )
+
+    async def override() -> Any:
+        yield session
+
+    def bearer(user_id: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    owner, other = bearer("owner"), bearer("other")
+    body = make_blueprint(title="Nightly").model_dump(by_alias=True)
+    app.dependency_overrides[get_db_session] = override
+    try:
+        client = TestClient(app)
+        created = client.post("/workflows/", json=body, headers=owner)
+        assert created.status_code == 201
+        workflow_id = created.json()["id"]
+        (row,) = session.workflows.values()
+        assert row.owner_id == "owner"
+
+        url = f"/workflows/{workflow_id}"
+        assert client.get(url, headers=owner).json()["title"] == "Nightly"
+        assert client.get(url, headers=other).status_code == 404
+
+        renamed = {**body, "title": "Hourly"}
+        updated = client.put(url, json=renamed, headers=owner)
+        assert updated.status_code == 200
+        assert updated.json() == {**renamed, "id": workflow_id}
+        assert client.put(url, json=renamed, headers=other).status_code == 404
+        assert client.get(url, headers=owner).json()["title"] == "Hourly"
+
+        assert client.delete(url, headers=other).status_code == 404
+        assert client.delete(url, headers=owner).status_code == 204
+        assert client.get(url, headers=owner).status_code == 404
+        assert client.delete(url, headers=owner).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db_session, None)
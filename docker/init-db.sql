@@ -1 +1,38 @@
 CREATE DATABASE n8n_db;
+
+-- Application schema (mirrors backend/app/models).
+CREATE TABLE IF NOT EXISTS users (
+    id VARCHAR PRIMARY KEY,
+    email VARCHAR NOT NULL UNIQUE,
+    hashed_password VARCHAR NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS workflows (
+    id VARCHAR PRIMARY KEY,
+    owner_id VARCHAR NOT NULL REFERENCES users (id),
+    title VARCHAR NOT NULL,
+    description TEXT,
+    blueprint JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Keyset pagination: WHERE owner_id = $1 AND (created_at, id) < ($2, $3)
+-- ORDER BY created_at DESC, id DESC is a bounded backward index scan.
+CREATE INDEX IF NOT EXISTS ix_workflows_owner_created_id
+    ON workflows (owner_id, created_at, id);
+
+-- Executions are range-partitioned by day; the ingestor creates daily
+-- partitions on demand and drops whole partitions past the retention
+-- window instead of deleting rows.
+CREATE TABLE IF NOT EXISTS executions (
+    id VARCHAR NOT NULL,
+    workflow_id VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    metrics JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX IF NOT EXISTS ix_executions_workflow_id
+    ON executions (workflow_id);
@@ -47,6 +47,7 @@ export interface WorkflowBlueprint {
   edges: WorkflowEdge[];
   credentials: string[];
   estimatedTimeSavedMinutes: number;
+  truncated?: boolean;
 }
 
 export interface WorkflowState {